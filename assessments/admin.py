@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Question, QuestionOption, Assessment, ContactMessage
+from .models import Question, QuestionOption, Assessment, ContactMessage, UserAssessmentStats, DailyAssessmentAggregate
+from .search import search_messages
 
 
 @admin.register(Question)
@@ -28,6 +29,23 @@ class AssessmentAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at']
 
 
+@admin.register(UserAssessmentStats)
+class UserAssessmentStatsAdmin(admin.ModelAdmin):
+    list_display = ['user', 'assessment_count', 'total_score_sum', 'updated_at']
+    search_fields = ['user__username']
+    readonly_fields = ['latest_assessment', 'updated_at']
+
+
+@admin.register(DailyAssessmentAggregate)
+class DailyAssessmentAggregateAdmin(admin.ModelAdmin):
+    list_display = ['day', 'overall_category', 'assessment_count', 'total_score_sum']
+    list_filter = ['overall_category']
+    date_hierarchy = 'day'
+
+    def has_change_permission(self, request, obj=None):
+        return False  # Maintained by refresh_daily_aggregates
+
+
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ['name', 'email', 'created_at']
@@ -35,5 +53,9 @@ class ContactMessageAdmin(admin.ModelAdmin):
     search_fields = ['name', 'email', 'message']
     readonly_fields = ['created_at']
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of icontains scans over every field
+        return search_messages(queryset, search_term), False
+
 
 
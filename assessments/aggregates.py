@@ -0,0 +1,152 @@
+"""
+Materialized daily assessment aggregates
+
+DailyAssessmentAggregate holds one row per day and result category with the
+assessment count and summed scores, so time-series questions read a few
+hundred rows instead of scanning Assessment. A watermark records the highest
+assessment id already folded in: a refresh looks only at newer rows, finds
+the days they fall on and recomputes just those days. Assessments are
+inserted but never edited; deletions of already folded rows are subtracted
+by a post_delete signal (see signals.py), and --full rebuilds everything.
+"""
+import time as timer
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AggregateWatermark, Assessment, DailyAssessmentAggregate, UserAssessmentStats
+
+
+WATERMARK = 'daily_assessments'
+SUM_FIELDS = ['total_score', *UserAssessmentStats.SUBSCALE_FIELDS]
+DAYS_PER_QUERY = 100
+
+
+def _day_range(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return Q(created_at__gte=start, created_at__lt=start + timedelta(days=1))
+
+
+def _grouped(queryset):
+    return (queryset
+            .annotate(day=TruncDate('created_at'))
+            .order_by()
+            .values('day', 'overall_category')
+            .annotate(assessment_count=Count('id'), **{f'{field}_sum': Sum(field) for field in SUM_FIELDS}))
+
+
+def _aggregate_days(days):
+    """Aggregate rows for the given days, one indexed range query per batch of days"""
+    days = sorted(days)
+    for position in range(0, len(days), DAYS_PER_QUERY):
+        ranges = Q()
+        for day in days[position:position + DAYS_PER_QUERY]:
+            ranges |= _day_range(day)
+        yield from _grouped(Assessment.objects.filter(ranges))
+
+
+def aggregates_watermark():
+    """The daily aggregates' watermark, or None until they have been built"""
+    return AggregateWatermark.objects.filter(name=WATERMARK).first()
+
+
+def refresh_daily_aggregates(full=False):
+    """
+    Fold assessments added since the watermark into the daily aggregates.
+
+    Returns a summary with the number of days recomputed, aggregate rows
+    written and the new watermark. When no assessments were added since the
+    last refresh nothing is locked or written.
+    """
+    start = timer.perf_counter()
+    # Check for new rows before taking the lock, so an up to date refresh writes nothing
+    watermark = aggregates_watermark()
+    if not full and watermark and watermark.last_assessment_id and not Assessment.objects.filter(
+            id__gt=watermark.last_assessment_id).exists():
+        return {
+            'full': False,
+            'days': 0,
+            'rows': 0,
+            'watermark': watermark.last_assessment_id,
+            'seconds': timer.perf_counter() - start,
+        }
+
+    with transaction.atomic():
+        watermark, _ = AggregateWatermark.objects.select_for_update().get_or_create(name=WATERMARK)
+        high = Assessment.objects.aggregate(high=Max('id'))['high'] or 0
+
+        # Nothing folded in yet: one grouped scan beats a range query per day
+        if full or not watermark.last_assessment_id:
+            full = True
+            DailyAssessmentAggregate.objects.all().delete()
+            rows = list(_grouped(Assessment.objects.all()))
+            days = {row['day'] for row in rows}
+        else:
+            days = set(Assessment.objects
+                       .filter(id__gt=watermark.last_assessment_id, id__lte=high)
+                       .annotate(day=TruncDate('created_at'))
+                       .order_by()
+                       .values_list('day', flat=True)
+                       .distinct())
+            rows = list(_aggregate_days(days))
+            DailyAssessmentAggregate.objects.filter(day__in=days).delete()
+
+        DailyAssessmentAggregate.objects.bulk_create(DailyAssessmentAggregate(**row) for row in rows)
+        watermark.last_assessment_id = high
+        watermark.save()
+
+    return {
+        'full': full,
+        'days': len(days),
+        'rows': len(rows),
+        'watermark': high,
+        'seconds': timer.perf_counter() - start,
+    }
+
+
+def subtract_assessment(assessment):
+    """Remove a deleted assessment from its day's aggregate if it was already folded in"""
+    folded = AggregateWatermark.objects.filter(
+        name=WATERMARK, last_assessment_id__gte=assessment.id,
+    ).exists()
+    if not folded:
+        return
+    updates = {'assessment_count': F('assessment_count') - 1}
+    for field in SUM_FIELDS:
+        updates[f'{field}_sum'] = F(f'{field}_sum') - getattr(assessment, field)
+    DailyAssessmentAggregate.objects.filter(
+        day=timezone.localdate(assessment.created_at),
+        overall_category=assessment.overall_category,
+    ).update(**updates)
+
+
+def daily_aggregates(since=None, until=None, category=None):
+    """
+    Aggregate rows between two dates (inclusive), optionally for one category.
+
+    Raises ValueError for an unknown category.
+    """
+    queryset = DailyAssessmentAggregate.objects.filter(assessment_count__gt=0)
+    if since:
+        queryset = queryset.filter(day__gte=since)
+    if until:
+        queryset = queryset.filter(day__lte=until)
+    if category:
+        if category not in dict(Assessment.RESULT_CATEGORIES):
+            raise ValueError(f'Unknown category "{category}"')
+        queryset = queryset.filter(overall_category=category)
+    return queryset
+
+
+def average_rows(aggregates):
+    """Column names and (day, category, count, average scores...) rows for display or export"""
+    names = ['day', 'category', 'count', *(field.replace('_score', '_avg') for field in SUM_FIELDS)]
+    rows = [
+        [aggregate.day.isoformat(), aggregate.overall_category, aggregate.assessment_count,
+         *(round(getattr(aggregate, f'{field}_sum') / aggregate.assessment_count, 2) for field in SUM_FIELDS)]
+        for aggregate in aggregates
+    ]
+    return names, rows
@@ -0,0 +1,323 @@
+"""
+Columnar cohort analytics over assessment scores
+
+The Assessment table is copied into NumPy arrays (one per column) that are
+kept per process and extended with only the rows added since the last load,
+so a refresh after the first one reads a handful of rows. Distributions,
+percentiles, signup-month cohorts and category transitions between a user's
+consecutive assessments are then computed with vectorized array operations
+instead of per-group queries or Python loops.
+
+Assessments are never edited in place, so new rows are found by id. After
+each extend the rows up to the last loaded id are counted and their highest
+id compared: a mismatch means rows were deleted (even if as many were added)
+and the columns are reloaded.
+
+NumPy is optional; without it available() is False and the staff analytics
+page explains how to enable it.
+"""
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Case, Count, F, Func, IntegerField, Max, Value, When
+from django.utils import timezone
+
+from .content import SUBSCALE_LABELS
+from .models import Assessment
+from .scoring import SUBSCALE_FIELDS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+SCORE_FIELDS = ('total_score', *SUBSCALE_FIELDS.values())
+SCORE_LABELS = {'total_score': 'Total', **{field: SUBSCALE_LABELS[name] for name, field in SUBSCALE_FIELDS.items()}}
+CATEGORIES = [key for key, _ in Assessment.RESULT_CATEGORIES]
+CATEGORY_CODES = {key: code for code, key in enumerate(CATEGORIES)}
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+LOAD_CHUNK = 50000
+
+
+class EpochSeconds(Func):
+    """Seconds since 1970-01-01 UTC, computed by the database instead of parsed in Python"""
+    template = 'EXTRACT(EPOCH FROM %(expressions)s)'
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection,
+                           template='CAST((julianday(%(expressions)s) - 2440587.5) * 86400 AS INTEGER)',
+                           **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='UNIX_TIMESTAMP(%(expressions)s)', **extra_context)
+
+
+class AnalyticsUnavailable(RuntimeError):
+    """Raised when NumPy is not installed"""
+
+
+def available():
+    return np is not None
+
+
+def refresh_interval():
+    return getattr(settings, 'ANALYTICS_REFRESH_SECONDS', 60)
+
+
+def _load(queryset, *columns):
+    """
+    Integer columns of queryset rows with an id above its filter, as one
+    (rows, columns) int64 array. The first column must be the id; rows are
+    fetched in keyset-ordered chunks so memory stays bounded.
+    """
+    chunks = [np.empty((0, len(columns)), np.int64)]
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).order_by('id').values_list(*columns)[:LOAD_CHUNK])
+        if not rows:
+            return np.concatenate(chunks)
+        chunks.append(np.array(rows, np.int64))
+        last_id = rows[-1][0]
+
+
+def _local_months(epochs):
+    """
+    Months since 1970-01 of epoch seconds in TIME_ZONE, found by locating
+    each timestamp among the UTC instants at which the local months start,
+    so daylight saving changes are accounted for
+    """
+    if not len(epochs):
+        return epochs
+    tz = timezone.get_default_timezone()
+    first = datetime.fromtimestamp(int(epochs.min()), tz)
+    last = datetime.fromtimestamp(int(epochs.max()), tz)
+    first_month = (first.year - 1970) * 12 + first.month - 1
+    last_month = (last.year - 1970) * 12 + last.month - 1
+    starts = np.array([
+        int(datetime(1970 + month // 12, month % 12 + 1, 1, tzinfo=tz).timestamp())
+        for month in range(first_month, last_month + 1)
+    ], np.int64)
+    return first_month + np.searchsorted(starts, epochs, side='right') - 1
+
+
+class ScoreColumns:
+    """Per-column NumPy copy of the Assessment table, ordered by id"""
+
+    def __init__(self):
+        self.ids = np.empty(0, np.int64)
+        self.user_ids = np.empty(0, np.int64)
+        self.created = np.empty(0, np.int64)  # seconds since the epoch, UTC
+        self.categories = np.empty(0, np.int8)
+        self.scores = {field: np.empty(0, np.int32) for field in SCORE_FIELDS}
+        # Signup month in TIME_ZONE (months since 1970-01) indexed by user id; -1 for ids that are not users
+        self.joined = np.empty(0, np.int64)
+        self.loaded_at = 0.0
+        self._user_order = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def extend(self):
+        """Append the assessments and users added since the last load"""
+        last_id = int(self.ids[-1]) if len(self) else 0
+        category_code = Case(
+            *(When(overall_category=key, then=Value(code)) for key, code in CATEGORY_CODES.items()),
+            output_field=IntegerField(),
+        )
+        rows = _load(Assessment.objects.filter(id__gt=last_id)
+                     .annotate(created_epoch=EpochSeconds(F('created_at')), category_code=category_code),
+                     'id', 'user_id', 'created_epoch', 'category_code', *SCORE_FIELDS)
+        if len(rows):
+            self.ids = np.concatenate([self.ids, rows[:, 0]])
+            self.user_ids = np.concatenate([self.user_ids, rows[:, 1]])
+            self.created = np.concatenate([self.created, rows[:, 2]])
+            self.categories = np.concatenate([self.categories, rows[:, 3].astype(np.int8)])
+            for position, field in enumerate(SCORE_FIELDS, start=4):
+                self.scores[field] = np.concatenate([self.scores[field], rows[:, position].astype(np.int32)])
+
+        known_users = len(self.joined)
+        users = _load(User.objects.filter(id__gte=known_users).annotate(joined_epoch=EpochSeconds(F('date_joined'))),
+                      'id', 'joined_epoch')
+        if len(users):
+            joined = np.full(users[-1, 0] + 1, -1, np.int64)
+            joined[:known_users] = self.joined
+            joined[users[:, 0]] = _local_months(users[:, 1])
+            self.joined = joined
+
+        self._user_order = None
+        self.loaded_at = time.monotonic()
+        return self
+
+    def matches_database(self):
+        """Whether no loaded row has been deleted since; rows added after the last load are ignored"""
+        last_id = int(self.ids[-1])
+        loaded = Assessment.objects.filter(id__lte=last_id).aggregate(count=Count('id'), high=Max('id'))
+        return loaded['count'] == len(self) and loaded['high'] == last_id
+
+    @property
+    def user_order(self):
+        """Row positions ordered by (user, created, id), sorted once per load"""
+        if self._user_order is None:
+            # One int64 key orders by (user, created); the stable sort keeps id order for ties
+            offset = self.created.min() if len(self) else 0
+            self._user_order = np.argsort((self.user_ids << 32) | (self.created - offset), kind='stable')
+        return self._user_order
+
+
+_columns = None
+_columns_lock = threading.Lock()
+
+
+def get_columns():
+    """The cached columns of this process, extended if older than ANALYTICS_REFRESH_SECONDS"""
+    global _columns
+    if np is None:
+        raise AnalyticsUnavailable('Analytics require NumPy (pip install numpy).')
+    with _columns_lock:
+        columns = _columns
+        if columns is not None and time.monotonic() - columns.loaded_at < refresh_interval():
+            return columns
+        columns = (columns or ScoreColumns()).extend()
+        if len(columns) and not columns.matches_database():
+            columns = ScoreColumns().extend()
+        _columns = columns
+        return columns
+
+
+def reset_columns():
+    """Drop the cached columns; the next get_columns() reloads them"""
+    global _columns
+    with _columns_lock:
+        _columns = None
+
+
+def _mean(values):
+    return round(float(values.mean()), 2) if len(values) else 0.0
+
+
+def _percentiles(histogram):
+    """
+    Linearly interpolated percentiles (as np.percentile computes them) of
+    small non-negative integers, read off their histogram instead of sorting
+    """
+    if not histogram.sum():
+        return np.zeros(len(PERCENTILES))
+    cumulative = np.cumsum(histogram)
+    ranks = np.array(PERCENTILES) / 100 * (cumulative[-1] - 1)
+    below = np.searchsorted(cumulative, np.floor(ranks), side='right')
+    above = np.searchsorted(cumulative, np.ceil(ranks), side='right')
+    return below + (above - below) * (ranks - np.floor(ranks))
+
+
+def distributions(columns, mask):
+    """Mean, spread, percentiles and a per-score histogram for every score column"""
+    result = []
+    for field in SCORE_FIELDS:
+        values = columns.scores[field][mask]
+        histogram = np.bincount(values)
+        percentiles = _percentiles(histogram)
+        result.append({
+            'field': field,
+            'label': SCORE_LABELS[field],
+            'mean': _mean(values),
+            'std': round(float(values.std()), 2) if len(values) else 0.0,
+            'percentiles': [round(float(value), 1) for value in percentiles],
+            'histogram': histogram.tolist(),
+        })
+    return result
+
+
+def category_counts(columns, mask):
+    counts = np.bincount(columns.categories[mask], minlength=len(CATEGORIES))
+    total = int(counts.sum())
+    return [
+        {'category': key, 'label': label, 'count': int(count),
+         'share': round(100 * int(count) / total, 1) if total else 0.0}
+        for (key, label), count in zip(Assessment.RESULT_CATEGORIES, counts)
+    ]
+
+
+def cohorts(columns, mask):
+    """Assessments, users and mean scores grouped by the users' signup month"""
+    user_ids = columns.user_ids[mask]
+    months = columns.joined[user_ids]
+    known = months >= 0
+    user_ids, months = user_ids[known], months[known]
+    if not len(months):
+        return []
+
+    # Cohorts are indexed by month offset from the earliest one, so grouping is a bincount
+    first = months.min()
+    cohort = months - first
+    assessments = np.bincount(cohort)
+    present = np.zeros(len(columns.joined), bool)
+    present[user_ids] = True
+    users = np.bincount(columns.joined[present] - first, minlength=len(assessments))
+    severe = np.bincount(cohort, weights=columns.categories[mask][known] == CATEGORY_CODES['severe'],
+                         minlength=len(assessments))
+    means = {
+        field: np.bincount(cohort, weights=columns.scores[field][mask][known], minlength=len(assessments))
+        for field in SCORE_FIELDS
+    }
+    return [
+        {
+            'month': str(np.datetime64(int(first + index), 'M')),
+            'users': int(users[index]),
+            'assessments': int(count),
+            'means': [round(float(means[field][index]) / count, 2) for field in SCORE_FIELDS],
+            'severe_share': round(100 * float(severe[index]) / count, 1),
+        }
+        for index, count in enumerate(assessments.tolist())
+        if count
+    ]
+
+
+def transitions(columns, mask):
+    """Category transition counts and row percentages between consecutive assessments of a user"""
+    order = columns.user_order
+    order = order[mask[order]]
+    user_ids = columns.user_ids[order]
+    categories = columns.categories[order].astype(np.int64)
+    same_user = user_ids[1:] == user_ids[:-1]
+    pairs = categories[:-1][same_user] * len(CATEGORIES) + categories[1:][same_user]
+    counts = np.bincount(pairs, minlength=len(CATEGORIES) ** 2).reshape(len(CATEGORIES), len(CATEGORIES))
+    totals = counts.sum(axis=1, keepdims=True)
+    rates = np.divide(100 * counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+    return {
+        'pairs': int(counts.sum()),
+        'rows': [
+            {'label': label, 'counts': counts[index].tolist(),
+             'rates': [round(float(rate), 1) for rate in rates[index]]}
+            for index, (_, label) in enumerate(Assessment.RESULT_CATEGORIES)
+        ],
+    }
+
+
+def cohort_report(since=None, until=None):
+    """All analytics for assessments created between since and until (aware datetimes)"""
+    columns = get_columns()
+    start = time.perf_counter()
+    mask = np.ones(len(columns), bool)
+    if since is not None:
+        mask &= columns.created >= int(since.timestamp())
+    if until is not None:
+        mask &= columns.created <= int(until.timestamp())
+
+    report = {
+        'assessments': int(mask.sum()),
+        'users': int(np.count_nonzero(np.bincount(columns.user_ids[mask]))),
+        'loaded_rows': len(columns),
+        'percentile_labels': list(PERCENTILES),
+        'score_labels': [SCORE_LABELS[field] for field in SCORE_FIELDS],
+        'distributions': distributions(columns, mask),
+        'categories': category_counts(columns, mask),
+        'cohorts': cohorts(columns, mask),
+        'transitions': transitions(columns, mask),
+    }
+    report['compute_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return report
@@ -5,5 +5,5 @@ class AssessmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assessments'
 
-
-
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,107 @@
+"""
+Async variants of the read-heavy views, used when serving over ASGI
+
+They share their validation and context building with views.py and query
+through the async ORM, so under an ASGI server a request does not need a
+thread from the sync_to_async pool for every query. urls.py selects them
+when settings.ASYNC_VIEWS is on (mindcare/asgi.py turns it on by default).
+
+Django 4.2 has no async session or authentication API, so resolving the
+user is still one sync_to_async call per request.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth import get_user
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.shortcuts import redirect, render
+
+from .cache import cache_anonymous_page
+from .catalog import aget_catalog
+from .models import Assessment, UserAssessmentStats
+from .pagination import apaginate
+from .trend import abuild_trend
+from .views import (
+    GUIDANCE_CONTEXT, chatbot_response, dashboard_context, history_limit,
+    history_payload, result_context, trend_query,
+)
+
+
+async def resolve_user(request):
+    """Load request.user once, off the event loop, so templates never trigger a sync query"""
+    request.user = await sync_to_async(get_user)(request)
+    return request.user
+
+
+def async_login_required(view):
+    """login_required for async views; Django 4.2's decorator only wraps sync views"""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await resolve_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@async_login_required
+async def dashboard(request):
+    """User dashboard with assessment history"""
+    history = await apaginate(Assessment.objects.filter(user=request.user), page_size=10)
+    stats = await (UserAssessmentStats.objects
+                   .select_related('latest_assessment')
+                   .filter(user=request.user)
+                   .afirst())
+    return render(request, 'assessments/dashboard.html', dashboard_context(request.user, history, stats))
+
+
+@async_login_required
+async def result_view(request, assessment_id):
+    """Display assessment result"""
+    try:
+        assessment = await Assessment.objects.aget(id=assessment_id, user=request.user)
+    except Assessment.DoesNotExist:
+        messages.error(request, 'Assessment not found.')
+        return redirect('dashboard')
+    return render(request, 'assessments/result.html', result_context(assessment, await aget_catalog()))
+
+
+@cache_anonymous_page
+async def guidance_view(request):
+    """Guidance and support resources page"""
+    await resolve_user(request)
+    return render(request, 'assessments/guidance.html', GUIDANCE_CONTEXT)
+
+
+@async_login_required
+async def api_history(request):
+    """JSON assessment history, paginated by keyset cursor"""
+    try:
+        page = await apaginate(Assessment.objects.filter(user=request.user),
+                               request.GET.get('cursor'), page_size=history_limit(request))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor or limit.'}, status=400)
+    return JsonResponse(history_payload(page))
+
+
+@async_login_required
+async def api_trend(request):
+    """JSON per-subscale score trend for the dashboard chart"""
+    try:
+        user_assessments, bucket, points = trend_query(request)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse(await abuild_trend(user_assessments, bucket, points))
+
+
+async def api_chatbot(request):
+    """Answer a free-text chatbot message"""
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    return chatbot_response(request)
+
+
+# Django 4.2's csrf_exempt decorator returns a sync wrapper, so mark the view directly
+api_chatbot.csrf_exempt = True
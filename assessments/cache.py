@@ -0,0 +1,220 @@
+"""
+Small namespaced cache API on top of Django's cache framework
+
+Every namespace has a version token stored in the cache; bumping it
+invalidates all keys of the namespace at once, in every process sharing the
+cache. Hits and misses are counted per namespace in each process.
+"""
+import asyncio
+import functools
+import hashlib
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, urlencode
+
+
+_MISSING = object()
+_registry = {}
+
+
+class NamespacedCache:
+    """Versioned, namespaced view of a Django cache with hit/miss counters"""
+
+    def __init__(self, namespace, timeout=DEFAULT_TIMEOUT, alias='default'):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        _registry[namespace] = self
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @property
+    def _version_key(self):
+        return f'{self.namespace}:version'
+
+    def version(self):
+        """Return the namespace's current version token, creating one if it is missing"""
+        token = self.backend.get(self._version_key)
+        if token is None:
+            token = uuid.uuid4().hex
+            if not self.backend.add(self._version_key, token, None):
+                token = self.backend.get(self._version_key, token)
+        return token
+
+    async def aversion(self):
+        token = await self.backend.aget(self._version_key)
+        if token is None:
+            token = uuid.uuid4().hex
+            if not await self.backend.aadd(self._version_key, token, None):
+                token = await self.backend.aget(self._version_key, token)
+        return token
+
+    def bump(self):
+        """Invalidate every key in the namespace"""
+        self.backend.set(self._version_key, uuid.uuid4().hex, None)
+
+    def make_key(self, key, version=None):
+        return f'{self.namespace}:{version or self.version()}:{key}'
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, default=None, version=None):
+        value = self.backend.get(self.make_key(key, version), _MISSING)
+        self._count(value is not _MISSING)
+        return default if value is _MISSING else value
+
+    async def aget(self, key, default=None, version=None):
+        value = await self.backend.aget(self.make_key(key, version or await self.aversion()), _MISSING)
+        self._count(value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        version = version or self.version()
+        found = self.backend.get_many([self.make_key(key, version) for key in keys])
+        prefix = len(self.make_key('', version))
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return {key[prefix:]: value for key, value in found.items()}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+        self.backend.set(self.make_key(key, version), value, timeout)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+        await self.backend.aset(self.make_key(key, version or await self.aversion()), value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """Set a key only if it is missing; returns True if it was set"""
+        timeout = self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+        return self.backend.add(self.make_key(key, version), value, timeout)
+
+    def set_many(self, mapping, timeout=DEFAULT_TIMEOUT, version=None):
+        version = version or self.version()
+        timeout = self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+        self.backend.set_many({self.make_key(key, version): value for key, value in mapping.items()}, timeout)
+
+    def delete(self, key, version=None):
+        self.backend.delete(self.make_key(key, version))
+
+    def incr(self, key, delta=1, version=None):
+        """Increment a counter; raises ValueError if it does not exist"""
+        return self.backend.incr(self.make_key(key, version), delta)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+def cache_stats():
+    """Hit/miss counters of every namespace in this process"""
+    return {namespace: cache.stats() for namespace, cache in _registry.items()}
+
+
+page_cache = NamespacedCache('pages')
+
+
+def _finalize(request, response, etag, last_modified):
+    """Attach validators and answer a matching conditional request with a 304"""
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ('Cookie',))
+    patch_cache_control(response, max_age=0, must_revalidate=True)
+    return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+
+def _bypasses_page_cache(request):
+    return (request.method not in ('GET', 'HEAD')
+            or settings.SESSION_COOKIE_NAME in request.COOKIES
+            or 'messages' in request.COOKIES)
+
+
+def _cached_response(request, cached):
+    content, content_type, etag, last_modified = cached
+    response = HttpResponse(content, content_type=content_type)
+    return _finalize(request, response, etag, last_modified)
+
+
+def _cache_entry(response):
+    """The cache entry for a freshly rendered response, or None if it must not be cached"""
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return None
+    etag = '"%s"' % hashlib.sha256(response.content).hexdigest()[:32]
+    return response.content, response['Content-Type'], etag, int(time.time())
+
+
+def _page_key(request, query_params):
+    """The request path plus the values of the query parameters the page reads"""
+    values = [(name, value) for name in query_params for value in request.GET.getlist(name)]
+    return f'{request.path}?{urlencode(values)}' if values else request.path
+
+
+def cache_anonymous_page(view=None, *, query_params=()):
+    """
+    Serve a view from the page cache for anonymous GET/HEAD requests.
+
+    Pages are keyed by path and the query parameters listed in query_params,
+    so arbitrary query strings (tracking parameters, cache busters) share
+    one entry instead of filling the cache:
+
+        @cache_anonymous_page(query_params=('page',))
+
+    Cached pages carry a strong ETag (a hash of the body) and the time they
+    were rendered as Last-Modified, so revalidating clients get a 304.
+    Requests carrying a session or messages cookie bypass the cache, since
+    the page may then contain per-user navigation or flash messages.
+    Works for both sync and async views.
+    """
+    if view is None:
+        return functools.partial(cache_anonymous_page, query_params=query_params)
+
+    if asyncio.iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if _bypasses_page_cache(request):
+                return await view(request, *args, **kwargs)
+            key = _page_key(request, query_params)
+            cached = await page_cache.aget(key)
+            if cached is not None:
+                return _cached_response(request, cached)
+            response = await view(request, *args, **kwargs)
+            entry = _cache_entry(response)
+            if entry is None:
+                return response
+            await page_cache.aset(key, entry, settings.PAGE_CACHE_TIMEOUT)
+            return _finalize(request, response, *entry[2:])
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if _bypasses_page_cache(request):
+            return view(request, *args, **kwargs)
+        key = _page_key(request, query_params)
+        cached = page_cache.get(key)
+        if cached is not None:
+            return _cached_response(request, cached)
+        response = view(request, *args, **kwargs)
+        entry = _cache_entry(response)
+        if entry is None:
+            return response
+        page_cache.set(key, entry, settings.PAGE_CACHE_TIMEOUT)
+        return _finalize(request, response, *entry[2:])
+    return wrapper
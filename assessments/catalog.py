@@ -0,0 +1,105 @@
+"""
+Versioned, process-wide cache of the question catalog
+
+The catalog is stored in the 'catalog' cache namespace, whose version token
+doubles as the catalog version, and mirrored in a local-memory tier, so quiz
+rendering and scoring never touch the database while the version is
+unchanged. Any change to Question or QuestionOption bumps the version (see
+signals.py).
+"""
+import threading
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .cache import NamespacedCache
+from .models import Question
+from .scoring import ScoringEngine
+
+
+QUIZ_FRAGMENT_TEMPLATE = 'assessments/quiz_questions.html'
+
+# Snapshots of superseded versions are never read again, so let them expire
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+catalog_cache = NamespacedCache('catalog', timeout=CATALOG_TIMEOUT)
+
+
+class Catalog:
+    """An immutable snapshot of the questions and their compiled scoring engine"""
+
+    def __init__(self, version, questions):
+        self.version = version
+        self.questions = questions
+        self.engine = ScoringEngine(questions)
+        self._questions_html = None
+
+    @property
+    def questions_html(self):
+        """The quiz question block, rendered once per catalog version"""
+        if self._questions_html is None:
+            html = catalog_cache.get('quiz_html', version=self.version)
+            if html is None:
+                html = render_to_string(QUIZ_FRAGMENT_TEMPLATE, {'questions': self.questions})
+                catalog_cache.set('quiz_html', str(html), version=self.version)
+            self._questions_html = mark_safe(html)
+        return self._questions_html
+
+
+_local = None
+_local_lock = threading.Lock()
+
+
+def current_version():
+    """Return the shared catalog version stamp"""
+    return catalog_cache.version()
+
+
+def load_questions():
+    """Read the catalog from the database with all options prefetched"""
+    return list(Question.objects.prefetch_related('options').all())
+
+
+def get_catalog():
+    """Return the catalog for the current version, from memory, the cache or the database"""
+    global _local
+    version = current_version()
+    catalog = _local
+    if catalog is not None and catalog.version == version:
+        return catalog
+
+    with _local_lock:
+        catalog = _local
+        if catalog is not None and catalog.version == version:
+            return catalog
+
+        questions = catalog_cache.get('questions', version=version)
+        if questions is None:
+            questions = load_questions()
+            catalog_cache.set('questions', questions, version=version)
+
+        catalog = Catalog(version, questions)
+        _local = catalog
+    return catalog
+
+
+async def aget_catalog():
+    """Async get_catalog; only a version change leaves the event loop"""
+    version = await catalog_cache.aversion()
+    catalog = _local
+    if catalog is not None and catalog.version == version:
+        return catalog
+    return await sync_to_async(get_catalog)()
+
+
+def _bump():
+    global _local
+    catalog_cache.bump()
+    _local = None
+
+
+def bump_version():
+    """Invalidate the catalog in every process once the current transaction commits"""
+    transaction.on_commit(_bump)
@@ -0,0 +1,242 @@
+"""
+File-based import and export of the question catalog
+
+A catalog is a list of entries shaped like
+
+    {'text': 'How often ...?', 'category': 'anxiety',
+     'options': [('Not at all', 0), ('Several days', 1), ...]}
+
+and can be stored as JSON, YAML or CSV (one row per option). Questions are
+identified by their text. Imports are diffed against the database and
+applied with bulk_create/bulk_update inside a single transaction.
+"""
+import csv
+import json
+import os
+
+from django.db import transaction
+
+from .catalog import bump_version, load_questions
+from .metrics import adjust_counter
+from .models import Question, QuestionOption
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional
+    yaml = None
+
+
+FORMATS = ('json', 'yaml', 'csv')
+CSV_FIELDS = ['question', 'category', 'option', 'weight']
+CSV_REQUIRED_FIELDS = ['question', 'option', 'weight']
+CATEGORIES = {key for key, _ in Question.CATEGORY_CHOICES}
+
+
+class CatalogError(ValueError):
+    """Raised for unreadable or invalid catalog files"""
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension == 'yml':
+        extension = 'yaml'
+    if extension not in FORMATS:
+        raise CatalogError(f'Cannot infer catalog format from "{path}"; use one of {", ".join(FORMATS)}.')
+    return extension
+
+
+def _require_yaml():
+    if yaml is None:
+        raise CatalogError('YAML catalogs require PyYAML (pip install pyyaml).')
+
+
+def _parse_errors():
+    errors = (json.JSONDecodeError, csv.Error, UnicodeDecodeError)
+    return errors + (yaml.YAMLError,) if yaml is not None else errors
+
+
+def read_catalog(fh, fmt):
+    """Parse and validate catalog entries from an open text file"""
+    try:
+        if fmt == 'json':
+            entries = json.load(fh)
+        elif fmt == 'yaml':
+            _require_yaml()
+            entries = yaml.safe_load(fh)
+        elif fmt == 'csv':
+            entries = _read_csv(fh)
+        else:
+            raise CatalogError(f'Unknown catalog format "{fmt}".')
+    except _parse_errors() as exc:
+        raise CatalogError(f'Cannot parse {fmt.upper()} catalog: {exc}') from exc
+    return validate_entries(entries)
+
+
+def _read_csv(fh):
+    reader = csv.DictReader(fh)
+    missing = [field for field in CSV_REQUIRED_FIELDS if field not in (reader.fieldnames or ())]
+    if missing:
+        raise CatalogError(f'CSV catalog is missing the {", ".join(missing)} column(s).')
+    entries = {}
+    for row in reader:
+        entry = entries.setdefault(row['question'], {
+            'text': row['question'],
+            'category': row.get('category') or 'general',
+            'options': [],
+        })
+        entry['options'].append((row['option'], row['weight']))
+    return list(entries.values())
+
+
+def validate_entries(entries):
+    """Normalize entries, raising CatalogError on the first invalid one"""
+    if not isinstance(entries, list):
+        raise CatalogError('A catalog must be a list of questions.')
+
+    normalized = []
+    seen = set()
+    for position, entry in enumerate(entries, start=1):
+        try:
+            text = str(entry['text']).strip()
+            category = entry.get('category', 'general')
+            options = [
+                (str(option['text']).strip(), int(option['weight'])) if isinstance(option, dict)
+                else (str(option[0]).strip(), int(option[1]))
+                for option in entry['options']
+            ]
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError) as exc:
+            raise CatalogError(f'Question {position} is malformed: {exc!r}') from exc
+
+        if not text:
+            raise CatalogError(f'Question {position} has no text.')
+        if text in seen:
+            raise CatalogError(f'Question {position} is a duplicate: "{text[:50]}"')
+        if category not in CATEGORIES:
+            raise CatalogError(f'Question {position} has unknown category "{category}".')
+        if len(options) < 2:
+            raise CatalogError(f'Question {position} needs at least 2 options.')
+        if any(not 0 <= weight <= 4 for _, weight in options):
+            raise CatalogError(f'Question {position} has an option weight outside 0-4.')
+
+        seen.add(text)
+        normalized.append({'text': text, 'category': category, 'options': options})
+    return normalized
+
+
+def export_entries():
+    """Return the current catalog as entries"""
+    return [
+        {
+            'text': question.text,
+            'category': question.category,
+            'options': [(option.text, option.weight) for option in _ordered_options(question)],
+        }
+        for question in load_questions()
+    ]
+
+
+def write_catalog(entries, fh, fmt):
+    """Serialize catalog entries to an open text file"""
+    if fmt == 'csv':
+        writer = csv.writer(fh)
+        writer.writerow(CSV_FIELDS)
+        for entry in entries:
+            for option_text, weight in entry['options']:
+                writer.writerow([entry['text'], entry['category'], option_text, weight])
+        return
+
+    data = [
+        {
+            'text': entry['text'],
+            'category': entry['category'],
+            'options': [{'text': text, 'weight': weight} for text, weight in entry['options']],
+        }
+        for entry in entries
+    ]
+    if fmt == 'json':
+        json.dump(data, fh, indent=2)
+        fh.write('\n')
+    elif fmt == 'yaml':
+        _require_yaml()
+        yaml.safe_dump(data, fh, sort_keys=False, allow_unicode=True)
+    else:
+        raise CatalogError(f'Unknown catalog format "{fmt}".')
+
+
+def _ordered_options(question):
+    return sorted(question.options.all(), key=lambda option: option.id)
+
+
+def apply_catalog(entries, update_existing=True, prune=False):
+    """
+    Bring the database in line with the given entries in one transaction.
+
+    Returns a dict with created, updated, unchanged and deleted question counts.
+    """
+    counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+    new_questions, new_options = [], []
+    changed_questions, changed_options, stale_option_ids = [], [], []
+
+    with transaction.atomic():
+        existing = {question.text: question for question in load_questions()}
+
+        for entry in entries:
+            question = existing.pop(entry['text'], None)
+            if question is None:
+                question = Question(text=entry['text'], category=entry['category'])
+                new_questions.append((question, entry['options']))
+                continue
+            if not update_existing:
+                counts['unchanged'] += 1
+                continue
+
+            changed = False
+            if question.category != entry['category']:
+                question.category = entry['category']
+                changed_questions.append(question)
+                changed = True
+
+            # Match options by position, keeping ids stable where possible
+            current = _ordered_options(question)
+            for option, (text, weight) in zip(current, entry['options']):
+                if (option.text, option.weight) != (text, weight):
+                    option.text, option.weight = text, weight
+                    changed_options.append(option)
+                    changed = True
+            for text, weight in entry['options'][len(current):]:
+                new_options.append(QuestionOption(question=question, text=text, weight=weight))
+                changed = True
+            for option in current[len(entry['options']):]:
+                stale_option_ids.append(option.id)
+                changed = True
+
+            counts['updated' if changed else 'unchanged'] += 1
+
+        if new_questions:
+            Question.objects.bulk_create([question for question, _ in new_questions])
+            for question, options in new_questions:
+                new_options.extend(
+                    QuestionOption(question=question, text=text, weight=weight)
+                    for text, weight in options
+                )
+            counts['created'] = len(new_questions)
+            # bulk_create skips post_save, which normally keeps this current
+            adjust_counter('questions', counts['created'])
+
+        if changed_questions:
+            Question.objects.bulk_update(changed_questions, ['category'])
+        if changed_options:
+            QuestionOption.objects.bulk_update(changed_options, ['text', 'weight'])
+        if stale_option_ids:
+            QuestionOption.objects.filter(id__in=stale_option_ids).delete()
+        if new_options:
+            QuestionOption.objects.bulk_create(new_options)
+        if prune and existing:
+            Question.objects.filter(id__in=[question.id for question in existing.values()]).delete()
+            counts['deleted'] = len(existing)
+
+        # Bulk operations bypass the model signals that normally do this
+        if counts['created'] or counts['updated'] or counts['deleted']:
+            bump_version()
+
+    return counts
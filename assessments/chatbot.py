@@ -0,0 +1,126 @@
+"""
+Server-side support chatbot
+
+Free-text messages are first checked against the crisis phrases, which
+always win, and otherwise matched to a curated intent with BM25 over the
+intents' example phrasings. The index is built once per process from the
+frozen content registry (content only changes on deploy); each example is
+its own document and the per-term BM25 weights are precomputed, so a query
+is a handful of dict look-ups and additions.
+"""
+import math
+import re
+import threading
+from collections import Counter, defaultdict, namedtuple
+
+from .content import CHATBOT_DEFAULT_RESPONSE, CHATBOT_INTENTS, CRISIS_PHRASES, CRISIS_RESPONSE
+
+
+MAX_MESSAGE_LENGTH = 1000
+
+# Below this BM25 score a match is too weak to trust and the default reply is used;
+# it sits above what a lone common term such as "feel" scores against the examples
+MIN_SCORE = 2.5
+
+STOPWORDS = frozenset(
+    'a about am an and are as at be been but by can do for from have how i i\'m im is '
+    'it its me my of on or so that the this to too very was what where with you your'.split()
+)
+SUFFIXES = ('ing', 'ed', 'ly', 'es', 's')
+
+Reply = namedtuple('Reply', 'intent response crisis score')
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_NON_WORD_RE = re.compile(r"[^a-z0-9']+")
+
+
+def _stem(word):
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Lowercase, drop stopwords and strip common suffixes"""
+    return [_stem(word) for word in _WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+
+
+def _normalize(text):
+    # Phones and word processors type a curly apostrophe ("don’t")
+    return ' ' + _NON_WORD_RE.sub(' ', text.lower().replace('\u2019', "'")).strip() + ' '
+
+
+class IntentIndex:
+    """BM25 index over intent example phrasings"""
+
+    def __init__(self, intents, k1=1.2, b=0.75):
+        self.intents = intents
+        documents = [
+            (position, tokenize(example))
+            for position, intent in enumerate(intents)
+            for example in intent.examples
+        ]
+        self.document_intents = [position for position, _ in documents]
+        average_length = sum(len(tokens) for _, tokens in documents) / max(len(documents), 1)
+
+        frequencies = defaultdict(dict)
+        for document, (_, tokens) in enumerate(documents):
+            for term, count in Counter(tokens).items():
+                frequencies[term][document] = count
+
+        self.postings = {}
+        total = len(documents)
+        for term, by_document in frequencies.items():
+            idf = math.log(1 + (total - len(by_document) + 0.5) / (len(by_document) + 0.5))
+            self.postings[term] = tuple(
+                (document, idf * count * (k1 + 1) / (
+                    count + k1 * (1 - b + b * len(documents[document][1]) / average_length)))
+                for document, count in by_document.items()
+            )
+
+    def match(self, text):
+        """Return (intent, score) of the best-scoring example, or (None, 0.0)"""
+        scores = defaultdict(float)
+        for term in set(tokenize(text)):
+            for document, weight in self.postings.get(term, ()):
+                scores[document] += weight
+        if not scores:
+            return None, 0.0
+        document = max(scores, key=scores.__getitem__)
+        return self.intents[self.document_intents[document]], scores[document]
+
+
+class Chatbot:
+    """Crisis fast path in front of an intent index"""
+
+    def __init__(self, intents=CHATBOT_INTENTS, crisis_phrases=CRISIS_PHRASES):
+        self.index = IntentIndex(intents)
+        phrases = sorted({_normalize(phrase).strip() for phrase in crisis_phrases}, key=len, reverse=True)
+        self.crisis_re = re.compile(r' (?:%s) ' % '|'.join(re.escape(phrase) for phrase in phrases))
+
+    def is_crisis(self, message):
+        return self.crisis_re.search(_normalize(message)) is not None
+
+    def reply(self, message):
+        message = message[:MAX_MESSAGE_LENGTH]
+        if self.is_crisis(message):
+            return Reply('crisis', CRISIS_RESPONSE, True, None)
+        intent, score = self.index.match(message)
+        if intent is None or score < MIN_SCORE:
+            return Reply(None, CHATBOT_DEFAULT_RESPONSE, False, score)
+        return Reply(intent.name, intent.response, False, score)
+
+
+_chatbot = None
+_chatbot_lock = threading.Lock()
+
+
+def get_chatbot():
+    """Return the process-wide chatbot, building its index on first use"""
+    global _chatbot
+    if _chatbot is None:
+        with _chatbot_lock:
+            if _chatbot is None:
+                _chatbot = Chatbot()
+    return _chatbot
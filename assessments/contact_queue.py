@@ -0,0 +1,265 @@
+"""
+Optional write-behind queue for contact form submissions
+
+With CONTACT_WRITE_BEHIND enabled, contact_view appends validated
+submissions to a durable local queue (a separate SQLite file in WAL mode)
+and responds immediately. A background worker thread in each web process,
+or the flush_contact_queue command, batch-inserts them into ContactMessage.
+
+Delivery is at-least-once. A flush claims a batch in a short queue
+transaction and commits it before inserting into the main database, so
+enqueue() never waits on that insert; the batch is only removed from the
+queue after the insert commits. A claim that is never released (the process
+died mid-flush) expires after CONTACT_QUEUE_CLAIM_TIMEOUT seconds.
+
+If a batch fails on bad data, its entries are inserted one at a time so a bad
+entry cannot hold back the rest; an entry that fails
+CONTACT_QUEUE_MAX_ATTEMPTS flushes is marked dead and skipped from then on
+(see dead_entries() and flush_contact_queue --retry-dead). Other errors, such
+as a locked main database, release the batch without counting an attempt.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, models, transaction
+
+from .metrics import adjust_counter
+from .models import ContactMessage
+
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {
+    'enqueued_total': 0,
+    'flushed_total': 0,
+    'last_flush_at': None,
+    'last_flush_seconds': 0.0,
+    'last_flush_lag_seconds': 0.0,
+}
+_worker = None
+_worker_lock = threading.Lock()
+
+# Failures that are the entry's fault and count towards dead-lettering
+DATA_ERRORS = (IntegrityError, DataError, ValueError, TypeError)
+
+
+def is_enabled():
+    return getattr(settings, 'CONTACT_WRITE_BEHIND', False)
+
+
+def _connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(str(settings.CONTACT_QUEUE_PATH), timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS contact_queue ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, enqueued_at REAL NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, dead INTEGER NOT NULL DEFAULT 0, last_error TEXT, '
+            'claimed_until REAL)'
+        )
+        # Queue files created before dead-lettering and claims lack these columns
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(contact_queue)')}
+        for column, definition in (('attempts', 'INTEGER NOT NULL DEFAULT 0'),
+                                   ('dead', 'INTEGER NOT NULL DEFAULT 0'),
+                                   ('last_error', 'TEXT'),
+                                   ('claimed_until', 'REAL')):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE contact_queue ADD COLUMN {column} {definition}')
+        _local.conn = conn
+    return conn
+
+
+def close_connection():
+    """Close this thread's queue connection; the next call reopens CONTACT_QUEUE_PATH"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+def _record(**updates):
+    with _stats_lock:
+        for key, value in updates.items():
+            if key.endswith('_total'):
+                _stats[key] += value
+            else:
+                _stats[key] = value
+
+
+def enqueue(cleaned_data):
+    """Durably queue a validated contact form submission"""
+    payload = json.dumps({field: cleaned_data[field] for field in ('name', 'email', 'message')})
+    _connection().execute(
+        'INSERT INTO contact_queue (payload, enqueued_at) VALUES (?, ?)', (payload, time.time())
+    )
+    _record(enqueued_total=1)
+    ensure_worker()
+
+
+def _insert(rows):
+    messages = [ContactMessage(**json.loads(payload)) for _, payload, _ in rows]
+    with transaction.atomic():
+        ContactMessage.objects.bulk_create(messages)
+        # created_at is auto_now_add, so bulk_create stamped the flush time;
+        # restore when each submission was actually made
+        ContactMessage.objects.filter(pk__in=[message.pk for message in messages]).update(created_at=models.Case(
+            *(models.When(pk=message.pk, then=models.Value(datetime.fromtimestamp(enqueued_at, timezone.utc)))
+              for message, (_, _, enqueued_at) in zip(messages, rows)),
+            output_field=models.DateTimeField(),
+        ))
+        # bulk_create skips post_save, which normally keeps this current
+        adjust_counter('messages', len(rows))
+
+
+def _insert_each(conn, rows, saved):
+    """Insert rows one at a time after a failed batch, appending saved ids to saved"""
+    max_attempts = settings.CONTACT_QUEUE_MAX_ATTEMPTS
+    for row in rows:
+        try:
+            _insert([row])
+        except DATA_ERRORS as exc:
+            conn.execute(
+                'UPDATE contact_queue SET attempts = attempts + 1, last_error = ?, dead = attempts + 1 >= ? '
+                'WHERE id = ?', (repr(exc), max_attempts, row[0])
+            )
+            attempts, = conn.execute('SELECT attempts FROM contact_queue WHERE id = ?', (row[0],)).fetchone()
+            logger.exception('Could not flush queued contact submission %s (attempt %s of %s)',
+                             row[0], attempts, max_attempts)
+        else:
+            saved.append(row[0])
+
+
+def _claim(conn, last_id, batch_size):
+    """Claim the next batch of unclaimed live entries after last_id for this flush"""
+    now = time.time()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        rows = conn.execute(
+            'SELECT id, payload, enqueued_at FROM contact_queue '
+            'WHERE dead = 0 AND id > ? AND (claimed_until IS NULL OR claimed_until < ?) ORDER BY id LIMIT ?',
+            (last_id, now, batch_size),
+        ).fetchall()
+        conn.executemany(
+            'UPDATE contact_queue SET claimed_until = ? WHERE id = ?',
+            [(now + settings.CONTACT_QUEUE_CLAIM_TIMEOUT, row[0]) for row in rows],
+        )
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return rows
+
+
+def _settle(conn, ids, saved):
+    """Remove saved entries from the queue and release the claim on the rest"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.executemany('DELETE FROM contact_queue WHERE id = ?', [(id_,) for id_ in saved])
+        conn.executemany('UPDATE contact_queue SET claimed_until = NULL WHERE id = ?', [(id_,) for id_ in ids])
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def flush(batch_size=None):
+    """Move queued submissions into ContactMessage in batches; return how many were saved"""
+    batch_size = batch_size or settings.CONTACT_QUEUE_BATCH_SIZE
+    conn = _connection()
+    saved = 0
+    last_id = 0
+    while True:
+        start = time.perf_counter()
+        rows = _claim(conn, last_id, batch_size)
+        if not rows:
+            return saved
+        ids = [row[0] for row in rows]
+        batch_saved = []
+        try:
+            try:
+                _insert(rows)
+                batch_saved = ids
+            except DATA_ERRORS:
+                logger.exception('Contact queue batch of %s failed; retrying entries one at a time', len(rows))
+                _insert_each(conn, rows, batch_saved)
+        finally:
+            # Runs on errors such as a locked database too, so nothing stays claimed
+            _settle(conn, ids, batch_saved)
+
+        # Entries that failed stay queued for the next flush, not this one
+        last_id = rows[-1][0]
+        saved += len(batch_saved)
+        _record(
+            flushed_total=len(batch_saved),
+            last_flush_at=time.time(),
+            last_flush_seconds=time.perf_counter() - start,
+            last_flush_lag_seconds=time.time() - rows[0][2],
+        )
+        if len(rows) < batch_size:
+            return saved
+
+
+def dead_entries():
+    """Entries that exceeded CONTACT_QUEUE_MAX_ATTEMPTS, as (id, payload, attempts, last_error)"""
+    return _connection().execute(
+        'SELECT id, payload, attempts, last_error FROM contact_queue WHERE dead = 1 ORDER BY id'
+    ).fetchall()
+
+
+def retry_dead():
+    """Put dead entries back in the queue with a fresh retry budget; return how many"""
+    return _connection().execute('UPDATE contact_queue SET dead = 0, attempts = 0 WHERE dead = 1').rowcount
+
+
+def queue_stats():
+    """Queue depth and flush metrics for this process"""
+    depth, oldest, dead = _connection().execute(
+        'SELECT COUNT(*) - COALESCE(SUM(dead), 0), MIN(CASE WHEN dead = 0 THEN enqueued_at END), '
+        'COALESCE(SUM(dead), 0) FROM contact_queue'
+    ).fetchone()
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['depth'] = depth
+    stats['dead'] = dead
+    stats['oldest_age_seconds'] = time.time() - oldest if oldest else 0.0
+    stats['worker_alive'] = _worker is not None and _worker.is_alive()
+    return stats
+
+
+def _run_worker(interval):
+    from django.db import close_old_connections
+
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        except Exception:
+            # Submissions stay queued; the next round retries them
+            logger.exception('Contact queue flush failed')
+        finally:
+            close_old_connections()
+
+
+def ensure_worker():
+    """Start this process's background flush thread if it is not running"""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(
+                target=_run_worker,
+                args=(settings.CONTACT_QUEUE_FLUSH_INTERVAL,),
+                name='contact-queue-flush',
+                daemon=True,
+            )
+            _worker.start()
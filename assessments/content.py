@@ -0,0 +1,377 @@
+"""
+Static recommendation and guidance content
+
+Everything here is built once at import into tuples, namedtuples and
+read-only mappings, so views can hand it to templates without copying it
+and look-ups are plain dict accesses.
+"""
+from collections import namedtuple
+from types import MappingProxyType
+
+from .scoring import ANSWERED_FIELDS, SUBSCALE_FIELDS, overall_category
+
+
+Helpline = namedtuple('Helpline', 'name number description')
+Resource = namedtuple('Resource', 'title description link type')
+SubscaleAdvice = namedtuple('SubscaleAdvice', 'subscale label severity tips')
+Intent = namedtuple('Intent', 'name examples response')
+
+
+HELPLINES = (
+    Helpline(
+        '988 Suicide & Crisis Lifeline',
+        '988',
+        'Free, confidential support 24/7 for people in distress',
+    ),
+    Helpline(
+        'Crisis Text Line',
+        'Text HOME to 741741',
+        'Free, 24/7 crisis support via text message',
+    ),
+    Helpline(
+        'National Alliance on Mental Illness (NAMI)',
+        '1-800-950-NAMI',
+        'Information, referrals, and support for mental health conditions',
+    ),
+    Helpline(
+        'SAMHSA National Helpline',
+        '1-800-662-4357',
+        'Free, confidential treatment referral and information service',
+    ),
+)
+
+RESOURCES = (
+    Resource(
+        'BetterHelp',
+        'Online counseling platform with licensed therapists',
+        'https://www.betterhelp.com/',
+        'Online Counseling',
+    ),
+    Resource(
+        'Talkspace',
+        'Therapy via text, audio, and video messaging',
+        'https://www.talkspace.com/',
+        'Online Counseling',
+    ),
+    Resource(
+        'Mindfulness Apps',
+        'Headspace, Calm, or Insight Timer for meditation',
+        'https://www.headspace.com/',
+        'Self-Help',
+    ),
+    Resource(
+        'Psychology Today',
+        'Find local therapists and mental health professionals',
+        'https://www.psychologytoday.com/',
+        'Therapist Directory',
+    ),
+)
+
+WELLNESS_TIPS = (
+    "Practice deep breathing exercises for 5-10 minutes daily",
+    "Maintain a regular sleep schedule (7-9 hours per night)",
+    "Stay physically active - even a 15-minute walk helps",
+    "Connect with others - social support is crucial",
+    "Limit alcohol and avoid recreational drugs",
+    "Eat a balanced diet rich in fruits and vegetables",
+    "Take breaks from screens and social media",
+    "Practice gratitude by writing down 3 things you're thankful for each day",
+    "Set realistic goals and celebrate small achievements",
+    "Don't hesitate to seek professional help when needed",
+)
+
+
+# Overall recommendations, keyed by Assessment.overall_category
+RECOMMENDATIONS = MappingProxyType({
+    'low': (
+        "You're doing great! Continue maintaining healthy habits.",
+        "Regular exercise and good sleep are helping you stay balanced.",
+        "Keep engaging in activities you enjoy.",
+        "Consider helping others - it can boost your own well-being.",
+    ),
+    'mild': (
+        "Take some time for self-care activities.",
+        "Practice mindfulness or meditation for 10 minutes daily.",
+        "Maintain a regular sleep schedule.",
+        "Stay connected with friends and family.",
+        "Consider talking to a counselor or therapist.",
+    ),
+    'moderate': (
+        "It's important to prioritize your mental health.",
+        "Seek support from a mental health professional.",
+        "Practice stress-reduction techniques like deep breathing.",
+        "Engage in regular physical activity.",
+        "Consider joining a support group.",
+        "Remember: seeking help is a sign of strength, not weakness.",
+    ),
+    'severe': (
+        "Your well-being is our priority. Please seek professional help immediately.",
+        "Contact a mental health professional or crisis helpline.",
+        "Speak with your doctor about your concerns.",
+        "Reach out to trusted friends or family members.",
+        "Remember: you are not alone, and help is available.",
+        "In crisis? Call 988 (Suicide & Crisis Lifeline) or your local emergency services.",
+    ),
+})
+
+SUBSCALE_LABELS = MappingProxyType({
+    'anxiety': 'Anxiety',
+    'depression': 'Depression',
+    'stress': 'Stress',
+    'general': 'General Well-being',
+})
+
+# Focused advice keyed by (subscale, severity); a low subscale needs none
+SUBSCALE_RECOMMENDATIONS = MappingProxyType({
+    ('anxiety', 'mild'): (
+        "Try slow breathing (4 seconds in, 6 seconds out) when you notice worry building.",
+        "Cut back on caffeine, especially later in the day.",
+    ),
+    ('anxiety', 'moderate'): (
+        "Set aside a short daily \"worry time\" so worries don't fill the whole day.",
+        "Grounding exercises, like naming 5 things you can see, can ease anxious moments.",
+        "A therapist can teach techniques such as CBT that work well for anxiety.",
+    ),
+    ('anxiety', 'severe'): (
+        "Anxiety at this level deserves professional attention - please contact a counselor or doctor.",
+        "If you feel panicked or unsafe, call or text 988 at any time.",
+    ),
+    ('depression', 'mild'): (
+        "Plan one small enjoyable or meaningful activity each day.",
+        "Daylight and gentle movement can lift low mood.",
+    ),
+    ('depression', 'moderate'): (
+        "Keep a regular routine for waking, meals and sleep, even when motivation is low.",
+        "Tell someone you trust how you have been feeling.",
+        "Talk with a mental health professional about what you are experiencing.",
+    ),
+    ('depression', 'severe'): (
+        "Please reach out to a mental health professional or your doctor soon.",
+        "If you have thoughts of harming yourself, call or text 988 right away.",
+    ),
+    ('stress', 'mild'): (
+        "Break large tasks into smaller steps and take short breaks between them.",
+        "Protect some time each week for rest and hobbies.",
+    ),
+    ('stress', 'moderate'): (
+        "Look at what is driving your stress and what could be delegated or dropped.",
+        "Regular exercise is one of the most effective ways to reduce stress.",
+        "Relaxation techniques such as progressive muscle relaxation can help you unwind.",
+    ),
+    ('stress', 'severe'): (
+        "Stress at this level can affect your health - consider speaking with a professional.",
+        "Let people close to you know you are struggling so they can support you.",
+    ),
+    ('general', 'mild'): (
+        "Check in with yourself each day about sleep, food and energy.",
+    ),
+    ('general', 'moderate'): (
+        "Consider a check-up with your doctor to rule out physical causes.",
+        "Small, consistent changes to sleep and activity add up.",
+    ),
+    ('general', 'severe'): (
+        "Please talk to a healthcare professional about how you have been feeling.",
+    ),
+})
+
+
+def get_recommendations(category):
+    """Overall recommendations for a result category, defaulting to 'mild'"""
+    return RECOMMENDATIONS.get(category, RECOMMENDATIONS['mild'])
+
+
+def subscale_advice(assessment, questions_per_subscale):
+    """
+    Focused advice for every subscale of an assessment scoring above 'low'.
+
+    Each subscale score is bounded by the questions answered for it, the
+    same way the answered questions bound the total score. Assessments saved
+    before those counts were stored fall back to questions_per_subscale, the
+    subscale's question count in the current catalog. Results are ordered
+    worst first.
+    """
+    advice = []
+    for subscale, field in SUBSCALE_FIELDS.items():
+        questions = getattr(assessment, ANSWERED_FIELDS[subscale])
+        if questions is None:
+            questions = questions_per_subscale.get(subscale)
+        if not questions:
+            continue
+        severity = overall_category(getattr(assessment, field), questions)
+        tips = SUBSCALE_RECOMMENDATIONS.get((subscale, severity))
+        if tips:
+            advice.append(SubscaleAdvice(subscale, SUBSCALE_LABELS[subscale], severity, tips))
+    order = ('severe', 'moderate', 'mild')
+    advice.sort(key=lambda item: order.index(item.severity))
+    return advice
+
+
+# Chatbot intents: example phrasings are indexed for retrieval (see chatbot.py)
+CHATBOT_INTENTS = (
+    Intent(
+        'anxiety',
+        (
+            "I feel anxious",
+            "I am nervous and worried all the time",
+            "my heart races and I can't calm down",
+            "I keep panicking",
+            "panic attack",
+            "I'm on edge and restless",
+            "I have anxiety",
+            "my anxiety is getting worse",
+        ),
+        "It's completely normal to feel anxious. Try taking deep breaths (inhale for 4 counts, "
+        "hold for 4, exhale for 4). Consider speaking with a mental health professional if "
+        "anxiety persists.",
+    ),
+    Intent(
+        'sadness',
+        (
+            "I feel sad",
+            "I feel down and empty",
+            "I feel depressed",
+            "nothing makes me happy anymore",
+            "I keep crying",
+            "I feel hopeless and unmotivated",
+            "I have depression",
+            "I think I'm depressed",
+        ),
+        "I'm sorry you're feeling this way. Remember, sadness is a valid emotion. Reach out to "
+        "friends, family, or a counselor. You don't have to go through this alone.",
+    ),
+    Intent(
+        'stress',
+        (
+            "I am stressed",
+            "I'm overwhelmed with work",
+            "too much pressure at school and exams",
+            "I'm burned out",
+            "I can't cope with everything I have to do",
+            "so much stress",
+            "stress at work",
+        ),
+        "Feeling overwhelmed is hard. Try breaking things into small steps, take short breaks, "
+        "and make time for rest and movement. If stress keeps building, talking to a counselor "
+        "can help.",
+    ),
+    Intent(
+        'sleep',
+        (
+            "I can't sleep",
+            "I have insomnia",
+            "insomnia is keeping me up",
+            "I wake up at night and can't fall asleep",
+            "I'm tired all the time",
+            "my sleep is bad",
+        ),
+        "Sleep and mood are closely linked. Keep a regular bedtime, avoid screens and caffeine "
+        "before bed, and try a short breathing or relaxation exercise. If sleep problems last "
+        "more than a few weeks, mention them to your doctor.",
+    ),
+    Intent(
+        'loneliness',
+        (
+            "I feel lonely",
+            "I have no one to talk to",
+            "I feel isolated",
+            "nobody understands me",
+        ),
+        "Feeling lonely is painful, and reaching out here is a good step. Consider contacting "
+        "someone you trust, joining a support group, or talking with a counselor through our "
+        "contact form.",
+    ),
+    Intent(
+        'help',
+        (
+            "I need help",
+            "I want to talk to someone",
+            "how do I contact a counselor",
+            "can I speak to a therapist",
+            "find a therapist",
+        ),
+        "Help is available. Please consider calling 988 (Suicide & Crisis Lifeline) or reach out "
+        "to a mental health professional. You can also use our contact form to get in touch "
+        "with a counselor.",
+    ),
+    Intent(
+        'resources',
+        (
+            "Resources",
+            "show resources",
+            "hotline numbers",
+            "helpline phone number",
+            "where can I find support",
+            "apps for meditation",
+        ),
+        "Here are immediate resources: 988 Crisis Line, Crisis Text Line (text HOME to 741741), "
+        "and SAMHSA Helpline (1-800-662-4357). You can also find more resources above on this "
+        "page.",
+    ),
+    Intent(
+        'greeting',
+        (
+            "hello",
+            "hi there",
+            "hey",
+            "good morning",
+        ),
+        "Hello! I'm here to help. How are you feeling today?",
+    ),
+    Intent(
+        'thanks',
+        (
+            "thank you",
+            "thanks",
+            "that helps",
+        ),
+        "You're welcome. Take care of yourself, and come back any time you need support.",
+    ),
+)
+
+CHATBOT_DEFAULT_RESPONSE = (
+    "I understand you're going through a difficult time. Please consider reaching out to a "
+    "mental health professional or using the crisis helplines listed above. Your well-being "
+    "matters."
+)
+
+# Any of these phrases short-circuits intent matching
+CRISIS_PHRASES = (
+    "suicide",
+    "suicidal",
+    "kill myself",
+    "killing myself",
+    "end my life",
+    "ending my life",
+    "take my own life",
+    "want to die",
+    "better off dead",
+    "hurt myself",
+    "harm myself",
+    "self harm",
+    "self-harm",
+    "cut myself",
+    "overdose",
+    "no reason to live",
+    "don't want to live",
+    "dont want to live",
+    "do not want to live",
+    "don't want to be alive",
+    "dont want to be alive",
+    "not want to be here",
+    "don't want to be here",
+    "dont want to be here",
+    "end it all",
+    "ending it all",
+    "take pills",
+    "taking pills",
+    "take all my pills",
+    "wish i was dead",
+    "wish i were dead",
+    "not worth living",
+)
+
+CRISIS_RESPONSE = (
+    "It sounds like you may be in crisis, and your safety matters most. Please call or text "
+    "988 (Suicide & Crisis Lifeline) now, text HOME to 741741, or call your local emergency "
+    "number. If you are in immediate danger, go to the nearest emergency room."
+)
@@ -0,0 +1,124 @@
+"""
+Streaming CSV/NDJSON export of assessments
+
+Rows are read with server-side chunked iteration and written out in small
+batches, so exports of any size run in constant memory. Under ASGI the
+chunks are handed over through an async iterator (see aiter_chunks), since
+Django 4.2 buffers a sync streaming iterator in full before sending it.
+"""
+import csv
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+
+from .models import Assessment
+from .trend import parse_date
+
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_FIELDS = [
+    ('id', 'id'),
+    ('user_id', 'user_id'),
+    ('username', 'user__username'),
+    ('created_at', 'created_at'),
+    ('total_score', 'total_score'),
+    ('anxiety_score', 'anxiety_score'),
+    ('depression_score', 'depression_score'),
+    ('stress_score', 'stress_score'),
+    ('general_score', 'general_score'),
+    ('overall_category', 'overall_category'),
+]
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+DEFAULT_CHUNK_SIZE = 2000
+LINES_PER_WRITE = 500
+
+
+def export_queryset(since=None, until=None, category=None):
+    """
+    Assessments matching the export filters, as value tuples in EXPORT_FIELDS order.
+
+    `since` and `until` are YYYY-MM-DD strings (inclusive); raises ValueError
+    for malformed dates or unknown categories.
+    """
+    queryset = Assessment.objects.all()
+    if since:
+        queryset = queryset.filter(created_at__gte=parse_date(since))
+    if until:
+        queryset = queryset.filter(created_at__lte=parse_date(until, end_of_day=True))
+    if category:
+        if category not in dict(Assessment.RESULT_CATEGORIES):
+            raise ValueError(f'Unknown category "{category}"')
+        queryset = queryset.filter(overall_category=category)
+    return queryset.order_by('id').values_list(*(lookup for _, lookup in EXPORT_FIELDS))
+
+
+class _Echo:
+    """File-like object whose write() just returns the line for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in EXPORT_FIELDS])
+    for row in rows:
+        yield writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value for value in row])
+
+
+def _ndjson_lines(rows):
+    names = [name for name, _ in EXPORT_FIELDS]
+    for row in rows:
+        record = dict(zip(names, row))
+        record['created_at'] = record['created_at'].isoformat()
+        yield json.dumps(record) + '\n'
+
+
+def _batched(lines):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= LINES_PER_WRITE:
+            yield ''.join(batch).encode()
+            batch = []
+    if batch:
+        yield ''.join(batch).encode()
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(queryset, fmt='csv', gzip=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the encoded export of `queryset` as a sequence of byte chunks"""
+    rows = queryset.iterator(chunk_size=chunk_size)
+    lines = _csv_lines(rows) if fmt == 'csv' else _ndjson_lines(rows)
+    chunks = _batched(lines)
+    return _gzipped(chunks) if gzip else chunks
+
+
+async def aiter_chunks(chunks):
+    """Pull chunks from a sync export generator one at a time, off the event loop"""
+    # thread_sensitive keeps every step of the database iterator on one thread
+    step = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await step(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def export_filename(fmt, gzip=False):
+    return f'assessments.{fmt}' + ('.gz' if gzip else '')
@@ -0,0 +1,106 @@
+"""
+Password hashers with settings-driven cost and bounded concurrency
+
+Each hasher keeps the algorithm name of the Django hasher it extends, so
+existing hashes keep verifying. Its cost parameters come from settings, so
+changing them makes must_update() true and Django re-hashes the password on
+the user's next successful login. Hashing is CPU-bound; at most
+PASSWORD_HASHING_CONCURRENCY hashes run at once per process, and a request
+that waits longer than PASSWORD_HASHING_TIMEOUT for a slot gets HashingBusy
+instead of piling onto a saturated CPU.
+"""
+import contextlib
+import threading
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher,
+)
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class HashingBusy(Exception):
+    """Raised when no hashing slot frees up within PASSWORD_HASHING_TIMEOUT"""
+
+
+_slots = None
+_slots_lock = threading.Lock()
+_held = threading.local()
+
+
+def _semaphore():
+    global _slots
+    if _slots is None:
+        with _slots_lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_CONCURRENCY)
+    return _slots
+
+
+@receiver(setting_changed)
+def _reset_slots(setting, **kwargs):
+    global _slots
+    if setting == 'PASSWORD_HASHING_CONCURRENCY':
+        _slots = None
+
+
+@contextlib.contextmanager
+def hashing_slot():
+    """Hold one of the process's hashing slots; re-entrant within a thread"""
+    if getattr(_held, 'depth', 0):
+        _held.depth += 1
+        try:
+            yield
+        finally:
+            _held.depth -= 1
+        return
+
+    slots = _semaphore()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_TIMEOUT):
+        raise HashingBusy('Timed out waiting for a password hashing slot.')
+    _held.depth = 1
+    try:
+        yield
+    finally:
+        _held.depth = 0
+        slots.release()
+
+
+class BoundedHasherMixin:
+    def encode(self, *args, **kwargs):
+        with hashing_slot():
+            return super().encode(*args, **kwargs)
+
+    def verify(self, password, encoded):
+        with hashing_slot():
+            return super().verify(password, encoded)
+
+
+class BoundedPBKDF2PasswordHasher(BoundedHasherMixin, PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PASSWORD_PBKDF2_ITERATIONS"""
+
+    def __init__(self):
+        self.iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class BoundedScryptPasswordHasher(BoundedHasherMixin, ScryptPasswordHasher):
+    """scrypt with the PASSWORD_SCRYPT work factor, block size and parallelism"""
+
+    def __init__(self):
+        params = settings.PASSWORD_SCRYPT
+        self.work_factor = params['work_factor']
+        self.block_size = params['block_size']
+        self.parallelism = params['parallelism']
+        # OpenSSL refuses more than 32 MiB unless maxmem allows it; scrypt needs 128 * N * r bytes
+        self.maxmem = 2 * 128 * self.work_factor * self.block_size
+
+
+class BoundedArgon2PasswordHasher(BoundedHasherMixin, Argon2PasswordHasher):
+    """Argon2id with the PASSWORD_ARGON2 time cost, memory cost (KiB) and parallelism"""
+
+    def __init__(self):
+        params = settings.PASSWORD_ARGON2
+        self.time_cost = params['time_cost']
+        self.memory_cost = params['memory_cost']
+        self.parallelism = params['parallelism']
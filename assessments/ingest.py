@@ -0,0 +1,158 @@
+"""
+Batched assessment ingestion for offline and kiosk clients
+
+A batch is a list of answer sets shaped like
+
+    {'idempotency_key': 'kiosk-3:000123', 'answers': {'12': 47, '13': 51, ...}}
+
+where answers map question ids to option ids. Every set is scored by the
+same ScoringEngine as quiz_view; the new assessments of a batch are inserted
+with one bulk_create and folded into the per-user rollups with one update per
+user. A set whose idempotency key was already stored for the same user is
+reported as a duplicate instead of being inserted again, so a client can
+resend a whole batch after a timeout.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from .metrics import adjust_counter
+from .models import Assessment, UserAssessmentStats
+
+
+MAX_KEY_LENGTH = Assessment._meta.get_field('idempotency_key').max_length
+
+
+class IngestError(ValueError):
+    """Raised for a batch that cannot be processed at all"""
+
+
+def max_batch_size():
+    return getattr(settings, 'ASSESSMENT_INGEST_MAX_BATCH', 500)
+
+
+def _answer_data(answers):
+    """Turn {question id: option id} into the form data ScoringEngine.score expects"""
+    if not isinstance(answers, dict):
+        raise ValueError('answers must map question ids to option ids.')
+    return {f'question_{question_id}': option_id for question_id, option_id in answers.items()}
+
+
+def _resolve_owners(user, entries):
+    """Map the usernames a staff client submits for to users, in one query"""
+    usernames = {
+        entry['username'] for entry in entries
+        if isinstance(entry, dict) and isinstance(entry.get('username'), str)
+    }
+    if not usernames or not user.is_staff:
+        return {}
+    return {owner.username: owner for owner in User.objects.filter(username__in=usernames)}
+
+
+def _prepare(user, entry, engine, owners):
+    """Validate and score one entry, returning (owner id, key, scores)"""
+    if not isinstance(entry, dict):
+        raise ValueError('Each assessment must be an object.')
+
+    key = entry.get('idempotency_key')
+    if key is not None and (not isinstance(key, str) or not 0 < len(key) <= MAX_KEY_LENGTH):
+        raise ValueError(f'idempotency_key must be a string of 1-{MAX_KEY_LENGTH} characters.')
+
+    owner = user
+    username = entry.get('username')
+    if username is not None and username != user.username:
+        if not user.is_staff:
+            raise ValueError('Only staff may submit assessments for other users.')
+        owner = owners.get(username)
+        if owner is None:
+            raise ValueError(f'Unknown user "{username}".')
+
+    scores = engine.score(_answer_data(entry.get('answers')))
+    if scores is None:
+        raise ValueError('No valid answers.')
+    return owner.id, key, scores
+
+
+def _existing(pending):
+    """Already stored assessments for the (user id, key) pairs of pending"""
+    keyed = {(owner_id, key) for owner_id, key, _ in pending.values() if key is not None}
+    if not keyed:
+        return {}
+    rows = (Assessment.objects
+            .filter(user_id__in={owner_id for owner_id, _ in keyed},
+                    idempotency_key__in={key for _, key in keyed})
+            .values_list('user_id', 'idempotency_key', 'id', 'overall_category', 'total_score'))
+    return {(owner_id, key): rest for owner_id, key, *rest in rows if (owner_id, key) in keyed}
+
+
+def _result(key, status, assessment_id, category, total_score):
+    return {
+        'idempotency_key': key,
+        'status': status,
+        'id': assessment_id,
+        'overall_category': category,
+        'total_score': total_score,
+    }
+
+
+def ingest_batch(user, entries, engine):
+    """
+    Score and store a batch of answer sets on behalf of user.
+
+    Returns one result per entry, in order, with a status of 'created',
+    'duplicate' or 'invalid'. Staff may attribute an entry to another account
+    with a 'username' field.
+    """
+    if not isinstance(entries, list):
+        raise IngestError('assessments must be a list.')
+    if len(entries) > max_batch_size():
+        raise IngestError(f'A batch may contain at most {max_batch_size()} assessments.')
+
+    owners = _resolve_owners(user, entries)
+    results = [None] * len(entries)
+    pending = {}   # position -> (owner id, key, scores)
+    repeats = {}   # position -> position of the first entry with the same key
+    first_seen = {}
+    for position, entry in enumerate(entries):
+        try:
+            owner_id, key, scores = _prepare(user, entry, engine, owners)
+        except ValueError as exc:
+            results[position] = {'idempotency_key': entry.get('idempotency_key') if isinstance(entry, dict) else None,
+                                 'status': 'invalid', 'error': str(exc)}
+            continue
+        if key is not None and (owner_id, key) in first_seen:
+            repeats[position] = first_seen[owner_id, key]
+            continue
+        if key is not None:
+            first_seen[owner_id, key] = position
+        pending[position] = (owner_id, key, scores)
+
+    # A concurrent retry of the same batch can insert a key between the
+    # lookup and the insert; the second attempt then sees it as a duplicate
+    for attempt in range(2):
+        existing = _existing(pending)
+        new = {position: item for position, item in pending.items() if item[:2] not in existing}
+        try:
+            with transaction.atomic():
+                created = Assessment.objects.bulk_create([
+                    Assessment(user_id=owner_id, idempotency_key=key, **scores)
+                    for owner_id, key, scores in new.values()
+                ])
+                UserAssessmentStats.record_many(created)
+        except IntegrityError:
+            if attempt:
+                raise
+            continue
+        break
+
+    if created:
+        adjust_counter('assessments', len(created))
+    for position, assessment in zip(new, created):
+        results[position] = _result(assessment.idempotency_key, 'created', assessment.id,
+                                    assessment.overall_category, assessment.total_score)
+    for position, (owner_id, key, _) in pending.items():
+        if position not in new:
+            results[position] = _result(key, 'duplicate', *existing[owner_id, key])
+    for position, original in repeats.items():
+        results[position] = {**results[original], 'status': 'duplicate'}
+    return results
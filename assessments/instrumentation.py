@@ -0,0 +1,194 @@
+"""
+Per-view request metrics
+
+Every request is counted with its duration and response size. A sampled
+fraction (settings.REQUEST_METRICS_SAMPLE_RATE) also records its query
+count, database time and template render time:
+
+- queries are timed by an execute_wrapper installed on every connection
+  (see signals.py), which does nothing unless the current request is sampled;
+- templates are timed by TimedDjangoTemplates, a drop-in for Django's
+  template backend.
+
+The request being measured is tracked in a context variable, so this works
+for sync views, async views and the sync_to_async threads they use.
+Metrics are kept per process and rendered in the Prometheus text format.
+"""
+import contextvars
+import threading
+import time
+from collections import defaultdict
+
+from django.template.backends.django import DjangoTemplates
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+current_sample = contextvars.ContextVar('current_request_sample', default=None)
+
+
+class RequestSample:
+    """Detailed timings of one sampled request"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+    def server_timing(self, total_seconds):
+        return (f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+                f'tpl;dur={self.template_seconds * 1000:.1f}, '
+                f'total;dur={total_seconds * 1000:.1f}')
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper that times queries of sampled requests"""
+    sample = current_sample.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.db_seconds += time.perf_counter() - start
+        sample.queries += 1
+
+
+class TimedTemplate:
+    """Wraps a backend template to add its render time to the current sample"""
+
+    def __init__(self, template):
+        self.template = template
+
+    @property
+    def origin(self):
+        return self.template.origin
+
+    def render(self, context=None, request=None):
+        sample = current_sample.get()
+        if sample is None:
+            return self.template.render(context, request)
+        sample.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            sample.template_depth -= 1
+            # Templates rendered while another one renders are already counted
+            if not sample.template_depth:
+                sample.template_seconds += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend that reports render time to the request metrics"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+class ViewMetrics:
+    __slots__ = ('requests', 'duration_seconds', 'buckets', 'response_bytes',
+                 'sampled', 'queries', 'db_seconds', 'template_seconds')
+
+    def __init__(self):
+        self.requests = 0
+        self.duration_seconds = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.response_bytes = 0
+        self.sampled = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+
+
+_metrics = defaultdict(ViewMetrics)
+_metrics_lock = threading.Lock()
+
+
+def record_request(view, duration, response_bytes, sample=None):
+    with _metrics_lock:
+        metrics = _metrics[view]
+        metrics.requests += 1
+        metrics.duration_seconds += duration
+        metrics.response_bytes += response_bytes
+        for position, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                metrics.buckets[position] += 1
+                break
+        if sample is not None:
+            metrics.sampled += 1
+            metrics.queries += sample.queries
+            metrics.db_seconds += sample.db_seconds
+            metrics.template_seconds += sample.template_seconds
+
+
+def view_metrics():
+    """Snapshot of the per-view metrics of this process"""
+    with _metrics_lock:
+        snapshot = {}
+        for view, metrics in _metrics.items():
+            snapshot[view] = {name: getattr(metrics, name) for name in ViewMetrics.__slots__}
+            snapshot[view]['buckets'] = list(metrics.buckets)
+        return snapshot
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(views, cache=None, queue=None):
+    """Render metrics in the Prometheus text exposition format"""
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+    def per_view(field):
+        return [({'view': view}, metrics[field]) for view, metrics in sorted(views.items())]
+
+    family('mindcare_requests_total', 'counter', 'Requests handled, by view.', per_view('requests'))
+    lines.append('# HELP mindcare_request_duration_seconds Request duration, by view.')
+    lines.append('# TYPE mindcare_request_duration_seconds histogram')
+    for view, metrics in sorted(views.items()):
+        label = f'view="{_escape(view)}"'
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, metrics['buckets']):
+            cumulative += count
+            lines.append(f'mindcare_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'mindcare_request_duration_seconds_bucket{{{label},le="+Inf"}} {metrics["requests"]}')
+        lines.append(f'mindcare_request_duration_seconds_sum{{{label}}} {metrics["duration_seconds"]}')
+        lines.append(f'mindcare_request_duration_seconds_count{{{label}}} {metrics["requests"]}')
+    family('mindcare_response_bytes_total', 'counter', 'Response body bytes, by view.', per_view('response_bytes'))
+    family('mindcare_sampled_requests_total', 'counter',
+           'Requests with query and template timings, by view.', per_view('sampled'))
+    family('mindcare_db_queries_total', 'counter', 'Queries issued by sampled requests.', per_view('queries'))
+    family('mindcare_db_seconds_total', 'counter', 'Query time of sampled requests.', per_view('db_seconds'))
+    family('mindcare_template_seconds_total', 'counter',
+           'Template render time of sampled requests.', per_view('template_seconds'))
+
+    if cache is not None:
+        family('mindcare_cache_hits_total', 'counter', 'Cache hits, by namespace.',
+               [({'namespace': name}, stats['hits']) for name, stats in sorted(cache.items())])
+        family('mindcare_cache_misses_total', 'counter', 'Cache misses, by namespace.',
+               [({'namespace': name}, stats['misses']) for name, stats in sorted(cache.items())])
+    if queue is not None:
+        family('mindcare_contact_queue_depth', 'gauge', 'Queued contact submissions.', [({}, queue['depth'])])
+        family('mindcare_contact_queue_dead', 'gauge', 'Dead-lettered contact submissions.',
+               [({}, queue['dead'])])
+        family('mindcare_contact_queue_oldest_age_seconds', 'gauge', 'Age of the oldest queued submission.',
+               [({}, queue['oldest_age_seconds'])])
+        family('mindcare_contact_queue_enqueued_total', 'counter', 'Submissions enqueued by this process.',
+               [({}, queue['enqueued_total'])])
+        family('mindcare_contact_queue_flushed_total', 'counter', 'Submissions flushed by this process.',
+               [({}, queue['flushed_total'])])
+        family('mindcare_contact_queue_last_flush_seconds', 'gauge', 'Duration of the last flush.',
+               [({}, queue['last_flush_seconds'])])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,52 @@
+"""
+Management command to export assessments for analytics
+"""
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from assessments.exports import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, export_queryset, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Streams assessments to a CSV or NDJSON file in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', default='-', help='Output file, or "-" for stdout')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--since', help='Only assessments on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--until', help='Only assessments on or before this date (YYYY-MM-DD)')
+        parser.add_argument('--category', help='Only assessments with this overall category')
+        parser.add_argument('--gzip', action='store_true', help='Gzip-compress the output')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Rows fetched from the database per round trip')
+
+    def handle(self, *args, **options):
+        try:
+            queryset = export_queryset(options['since'], options['until'], options['category'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        
+        chunks = stream_export(queryset, options['format'], options['gzip'], options['chunk_size'])
+        start = time.perf_counter()
+        written = 0
+        if options['output'] == '-':
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+            out.flush()
+            return
+        
+        try:
+            with open(options['output'], 'wb') as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+                    written += len(chunk)
+        except OSError as exc:
+            raise CommandError(str(exc))
+        
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported to {options["output"]} ({written / 1024:.0f} KiB) in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,31 @@
+"""
+Management command to export the question catalog to a JSON, YAML or CSV file
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from assessments.catalog_io import FORMATS, CatalogError, detect_format, export_entries, write_catalog
+
+
+class Command(BaseCommand):
+    help = 'Exports all questions and options to a catalog file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-',
+                            help='Output file (.json, .yaml/.yml or .csv); "-" writes JSON to stdout')
+        parser.add_argument('--format', choices=FORMATS, help='Override the format inferred from the extension')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        entries = export_entries()
+        try:
+            fmt = options['format'] or ('json' if path == '-' else detect_format(path))
+            if path == '-':
+                write_catalog(entries, sys.stdout, fmt)
+                return
+            with open(path, 'w', newline='', encoding='utf-8') as fh:
+                write_catalog(entries, fh, fmt)
+        except (OSError, CatalogError) as exc:
+            raise CommandError(str(exc))
+        
+        self.stdout.write(self.style.SUCCESS(f'Exported {len(entries)} questions to {path}'))
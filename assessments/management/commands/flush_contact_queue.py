@@ -0,0 +1,36 @@
+"""
+Management command to flush the contact form write-behind queue
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from assessments.contact_queue import flush, queue_stats, retry_dead
+
+
+class Command(BaseCommand):
+    help = 'Inserts queued contact form submissions into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep flushing until interrupted')
+        parser.add_argument('--interval', type=float, default=settings.CONTACT_QUEUE_FLUSH_INTERVAL,
+                            help='Seconds between flushes with --loop')
+        parser.add_argument('--batch-size', type=int, default=settings.CONTACT_QUEUE_BATCH_SIZE)
+        parser.add_argument('--retry-dead', action='store_true',
+                            help='Requeue dead-lettered submissions before flushing')
+
+    def handle(self, *args, **options):
+        if options['retry_dead']:
+            self.stdout.write(f'Requeued {retry_dead()} dead submissions')
+        while True:
+            saved = flush(options['batch_size'])
+            if saved or not options['loop']:
+                stats = queue_stats()
+                self.stdout.write(self.style.SUCCESS(
+                    f'Saved {saved} messages; {stats["depth"]} still queued, {stats["dead"]} dead '
+                    f'(last flush {stats["last_flush_seconds"] * 1000:.1f} ms, '
+                    f'lag {stats["last_flush_lag_seconds"]:.2f}s)'
+                ))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,53 @@
+"""
+Management command to import the question catalog from a JSON, YAML or CSV file
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from assessments.catalog_io import FORMATS, CatalogError, apply_catalog, detect_format, read_catalog
+
+
+class DryRun(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Imports questions and options from a catalog file, applying only the differences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Catalog file (.json, .yaml/.yml or .csv)')
+        parser.add_argument('--format', choices=FORMATS, help='Override the format inferred from the extension')
+        parser.add_argument('--no-update', action='store_true',
+                            help='Only create missing questions; leave existing ones untouched')
+        parser.add_argument('--prune', action='store_true',
+                            help='Delete questions that are not in the file')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would change without saving anything')
+
+    def handle(self, *args, **options):
+        try:
+            fmt = options['format'] or detect_format(options['path'])
+            with open(options['path'], newline='', encoding='utf-8') as fh:
+                entries = read_catalog(fh, fmt)
+        except (OSError, CatalogError) as exc:
+            raise CommandError(str(exc))
+        
+        self.stdout.write(f'Importing {len(entries)} questions from {options["path"]}...')
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                counts = apply_catalog(entries, update_existing=not options['no_update'],
+                                       prune=options['prune'])
+                if options['dry_run']:
+                    raise DryRun
+        except DryRun:
+            self.stdout.write(self.style.WARNING('Dry run: no changes were saved.'))
+        elapsed = time.perf_counter() - start
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {counts["created"]}, updated {counts["updated"]}, '
+            f'unchanged {counts["unchanged"]}, deleted {counts["deleted"]} questions.'
+        ))
+        rate = len(entries) / elapsed if elapsed else float('inf')
+        self.stdout.write(f'Processed {len(entries)} questions in {elapsed:.2f}s ({rate:.0f} questions/s)')
@@ -2,7 +2,8 @@
 Management command to populate initial assessment questions
 """
 from django.core.management.base import BaseCommand
-from assessments.models import Question, QuestionOption
+from assessments.catalog_io import apply_catalog, validate_entries
+from assessments.models import Question
 
 
 class Command(BaseCommand):
@@ -166,23 +167,8 @@ class Command(BaseCommand):
             },
         ]
         
-        created_count = 0
-        for q_data in questions_data:
-            question, created = Question.objects.get_or_create(
-                text=q_data['text'],
-                defaults={'category': q_data['category']}
-            )
-            
-            if created:
-                created_count += 1
-                # Create options for this question
-                for option_text, weight in q_data['options']:
-                    QuestionOption.objects.create(
-                        question=question,
-                        text=option_text,
-                        weight=weight
-                    )
-                self.stdout.write(self.style.SUCCESS(f'Created question: {question.text[:50]}...'))
+        counts = apply_catalog(validate_entries(questions_data), update_existing=False)
+        created_count = counts['created']
         
         self.stdout.write(self.style.SUCCESS(f'\nSuccessfully created {created_count} new questions!'))
         self.stdout.write(f'Total questions in database: {Question.objects.count()}')
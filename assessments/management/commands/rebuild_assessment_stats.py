@@ -0,0 +1,37 @@
+"""
+Management command to rebuild the per-user assessment rollups
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from assessments.models import Assessment, UserAssessmentStats
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds UserAssessmentStats rollups from existing assessments in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of rollup rows inserted per query')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Aggregating assessments per user...')
+        
+        aggregates = {
+            'assessment_count': Count('id'),
+            'total_score_sum': Sum('total_score'),
+            'latest_assessment_id': Max('id'),
+        }
+        for field in UserAssessmentStats.SUBSCALE_FIELDS:
+            aggregates[f'{field}_sum'] = Sum(field)
+        for category, _ in Assessment.RESULT_CATEGORIES:
+            aggregates[f'{category}_count'] = Count('id', filter=Q(overall_category=category))
+        
+        # Read and replace in one transaction so no assessment saved in between is lost
+        with transaction.atomic():
+            rows = Assessment.objects.order_by().values('user_id').annotate(**aggregates)
+            rollups = [UserAssessmentStats(**row) for row in rows.iterator()]
+            UserAssessmentStats.objects.all().delete()
+            UserAssessmentStats.objects.bulk_create(rollups, batch_size=options['batch_size'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt assessment stats for {len(rollups)} users!'))
@@ -0,0 +1,20 @@
+"""
+Management command to recompute the admin dashboard metrics snapshot
+"""
+from django.core.management.base import BaseCommand
+from assessments.aggregates import refresh_daily_aggregates
+from assessments.metrics import refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the admin dashboard metrics snapshot (run periodically, e.g. from cron)'
+
+    def handle(self, *args, **kwargs):
+        refresh_daily_aggregates()
+        snapshot = refresh_snapshot()
+        counts = snapshot['counts']
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed admin metrics at {snapshot["computed_at"]:%Y-%m-%d %H:%M:%S}: '
+            f'{counts["questions"]} questions, {counts["messages"]} messages, '
+            f'{counts["assessments"]} assessments'
+        ))
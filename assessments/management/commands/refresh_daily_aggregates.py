@@ -0,0 +1,20 @@
+"""
+Management command to bring the materialized daily assessment aggregates up to date
+"""
+from django.core.management.base import BaseCommand
+from assessments.aggregates import refresh_daily_aggregates
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the daily assessment aggregates for days touched since the last run (run e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every day instead of only touched ones')
+
+    def handle(self, *args, **options):
+        result = refresh_daily_aggregates(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Rebuilt" if result["full"] else "Refreshed"} {result["days"]} days '
+            f'({result["rows"]} aggregate rows) up to assessment {result["watermark"]} '
+            f'in {result["seconds"]:.2f}s'
+        ))
@@ -0,0 +1,135 @@
+"""
+Precomputed metrics for the admin dashboard
+
+A snapshot of the expensive aggregates (totals, assessments per day,
+category distribution, average subscale scores) is kept in the cache and
+recomputed when it is older than ADMIN_METRICS_MAX_AGE seconds, or on a
+schedule by the refresh_admin_metrics command. A short cache lock lets only
+one request recompute a stale snapshot while the others serve the old one;
+on an empty cache they wait briefly for its result instead.
+
+The assessment figures are read from the materialized daily aggregates (see
+aggregates.py) as of their last refresh; only the command brings them up to
+date, so rendering the dashboard never writes. The three headline totals are
+counted exactly at each refresh and kept as cache counters that signals
+adjust on every create/delete, so they stay current between refreshes.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .aggregates import SUM_FIELDS, aggregates_watermark, daily_aggregates
+from .cache import NamespacedCache
+from .models import Assessment, ContactMessage, Question
+
+
+COUNTER_KEY = 'count:{name}'
+COUNTED_MODELS = {
+    'questions': Question,
+    'messages': ContactMessage,
+    'assessments': Assessment,
+}
+TREND_DAYS = 30
+REFRESH_LOCK_KEY = 'refresh-lock'
+REFRESH_LOCK_TIMEOUT = 60
+REFRESH_WAIT = 2
+REFRESH_POLL_INTERVAL = 0.05
+
+metrics_cache = NamespacedCache('admin_metrics', timeout=None)
+
+
+def max_age():
+    return getattr(settings, 'ADMIN_METRICS_MAX_AGE', 300)
+
+
+def compute_snapshot():
+    """Run the aggregate queries and return a fresh snapshot"""
+    watermark = aggregates_watermark()
+    since = timezone.localdate() - timedelta(days=TREND_DAYS)
+    per_day = (daily_aggregates(since=since)
+               .values('day')
+               .annotate(count=Sum('assessment_count'))
+               .order_by('day'))
+    categories = (daily_aggregates()
+                  .order_by()
+                  .values('overall_category')
+                  .annotate(count=Sum('assessment_count')))
+    sums = daily_aggregates().aggregate(
+        count=Sum('assessment_count'), **{field: Sum(f'{field}_sum') for field in SUM_FIELDS},
+    )
+
+    category_counts = {row['overall_category']: row['count'] for row in categories}
+    # Exact counts seed the live counters; the aggregates may lag until their next refresh
+    counts = {name: model.objects.count() for name, model in COUNTED_MODELS.items()}
+    aggregated = sums['count'] or 0
+    return {
+        'computed_at': timezone.now(),
+        # None until the daily aggregates have been built
+        'aggregates_as_of': watermark.updated_at if watermark else None,
+        'counts': counts,
+        'per_day': [{'day': row['day'].isoformat(), 'count': row['count']} for row in per_day],
+        'categories': [
+            {'category': key, 'label': label, 'count': category_counts.get(key, 0)}
+            for key, label in Assessment.RESULT_CATEGORIES
+        ],
+        'averages': {
+            name.replace('_score', ''): round((sums[name] or 0) / aggregated, 1) if aggregated else 0
+            for name in SUM_FIELDS
+        },
+    }
+
+
+def refresh_snapshot():
+    """Recompute the snapshot and reseed the live counters from it"""
+    snapshot = compute_snapshot()
+    metrics_cache.set('snapshot', snapshot)
+    metrics_cache.set_many({COUNTER_KEY.format(name=name): count for name, count in snapshot['counts'].items()})
+    return snapshot
+
+
+def _wait_for_snapshot():
+    """Poll for the snapshot another request is computing, up to REFRESH_WAIT seconds"""
+    deadline = time.monotonic() + REFRESH_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(REFRESH_POLL_INTERVAL)
+        snapshot = metrics_cache.get('snapshot')
+        if snapshot is not None:
+            return snapshot
+    return None
+
+
+def get_snapshot():
+    """Return the cached snapshot (refreshing it if stale) with live counters applied"""
+    snapshot = metrics_cache.get('snapshot')
+    stale = snapshot is None or timezone.now() - snapshot['computed_at'] > timedelta(seconds=max_age())
+    if stale and metrics_cache.add(REFRESH_LOCK_KEY, True, timeout=REFRESH_LOCK_TIMEOUT):
+        try:
+            return refresh_snapshot()
+        finally:
+            metrics_cache.delete(REFRESH_LOCK_KEY)
+    if snapshot is None:
+        # Another request holds the lock on a cold cache: use its result, or
+        # compute one without caching it if it takes too long
+        snapshot = _wait_for_snapshot()
+        if snapshot is None:
+            return compute_snapshot()
+
+    keys = {COUNTER_KEY.format(name=name): name for name in COUNTED_MODELS}
+    live = metrics_cache.get_many(list(keys))
+    counts = dict(snapshot['counts'])
+    counts.update({keys[key]: value for key, value in live.items()})
+    return {**snapshot, 'counts': counts}
+
+
+def adjust_counter(name, delta):
+    """Adjust a live counter after the current transaction commits"""
+    def apply():
+        try:
+            metrics_cache.incr(COUNTER_KEY.format(name=name), delta)
+        except ValueError:
+            pass  # Not seeded yet; the next refresh will count it
+    transaction.on_commit(apply)
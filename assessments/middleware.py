@@ -0,0 +1,62 @@
+"""
+Middleware for the assessments app
+"""
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .instrumentation import RequestSample, current_sample, record_request
+
+
+class RequestMetricsMiddleware:
+    """
+    Record per-view request metrics (see instrumentation.py).
+
+    Sampled requests also get a Server-Timing header with their database,
+    template and total time when settings.REQUEST_METRICS_SERVER_TIMING is on.
+    Works in both sync and async stacks, so it does not force async views
+    back onto a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sample, token, start = self._begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        return self._finish(request, response, sample, start)
+
+    async def __acall__(self, request):
+        sample, token, start = self._begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        return self._finish(request, response, sample, start)
+
+    def _begin(self):
+        sampled = random.random() < settings.REQUEST_METRICS_SAMPLE_RATE
+        sample = RequestSample() if sampled else None
+        return sample, current_sample.set(sample), time.perf_counter()
+
+    def _finish(self, request, response, sample, start):
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        size = 0 if response.streaming else len(response.content)
+        record_request(view, duration, size, sample)
+        if sample is not None and settings.REQUEST_METRICS_SERVER_TIMING:
+            response['Server-Timing'] = sample.server_timing(duration)
+        return response
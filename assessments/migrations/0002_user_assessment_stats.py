@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('assessments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAssessmentStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assessment_count', models.PositiveIntegerField(default=0)),
+                ('total_score_sum', models.BigIntegerField(default=0)),
+                ('anxiety_score_sum', models.BigIntegerField(default=0)),
+                ('depression_score_sum', models.BigIntegerField(default=0)),
+                ('stress_score_sum', models.BigIntegerField(default=0)),
+                ('general_score_sum', models.BigIntegerField(default=0)),
+                ('low_count', models.PositiveIntegerField(default=0)),
+                ('mild_count', models.PositiveIntegerField(default=0)),
+                ('moderate_count', models.PositiveIntegerField(default=0)),
+                ('severe_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('latest_assessment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='assessments.assessment')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='assessment_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'user assessment stats',
+            },
+        ),
+    ]
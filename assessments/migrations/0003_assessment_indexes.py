@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_user_assessment_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['user', '-created_at'], name='assessment_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['overall_category', 'created_at'], name='assessment_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['-created_at'], name='assessment_created_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:40
+
+from django.db import migrations, models
+
+
+FTS_TABLE = 'assessments_contactmessage_fts'
+CONTENT_TABLE = 'assessments_contactmessage'
+
+# External-content FTS5 index kept in sync by triggers. Note that Django
+# rebuilds SQLite tables for some schema changes, which drops these
+# triggers; a later migration altering ContactMessage must recreate them.
+CREATE_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, email, message, content='{CONTENT_TABLE}', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, email, message)
+        VALUES (new.id, new.name, new.email, new.message);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, message)
+        VALUES ('delete', old.id, old.name, old.email, old.message);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, message)
+        VALUES ('delete', old.id, old.name, old.email, old.message);
+        INSERT INTO {FTS_TABLE}(rowid, name, email, message)
+        VALUES (new.id, new.name, new.email, new.message);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_STATEMENTS = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0003_assessment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at'], name='contact_created_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0004_contact_message_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='assessment',
+            constraint=models.UniqueConstraint(fields=('user', 'idempotency_key'), name='assessment_user_idempotency_key'),
+        ),
+    ]
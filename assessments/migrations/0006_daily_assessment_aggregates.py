@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0005_assessment_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AggregateWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_assessment_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyAssessmentAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('overall_category', models.CharField(choices=[('low', 'Low'), ('mild', 'Mild'), ('moderate', 'Moderate'), ('severe', 'Severe')], max_length=20)),
+                ('assessment_count', models.PositiveIntegerField(default=0)),
+                ('total_score_sum', models.BigIntegerField(default=0)),
+                ('anxiety_score_sum', models.BigIntegerField(default=0)),
+                ('depression_score_sum', models.BigIntegerField(default=0)),
+                ('stress_score_sum', models.BigIntegerField(default=0)),
+                ('general_score_sum', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['day', 'overall_category'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyassessmentaggregate',
+            constraint=models.UniqueConstraint(fields=('day', 'overall_category'), name='daily_aggregate_day_category'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:10
+
+from django.db import migrations
+from django.db.models import Count, Max, Q, Sum
+
+
+SUBSCALE_FIELDS = ['anxiety_score', 'depression_score', 'stress_score', 'general_score']
+CATEGORIES = ['low', 'mild', 'moderate', 'severe']
+
+
+def rebuild_assessment_stats(apps, schema_editor):
+    """
+    Recompute every rollup from the assessments, as rebuild_assessment_stats
+    does. Rollups created lazily since 0002 started from zero, so users with
+    older assessments would otherwise read wrong totals.
+    """
+    Assessment = apps.get_model('assessments', 'Assessment')
+    UserAssessmentStats = apps.get_model('assessments', 'UserAssessmentStats')
+
+    aggregates = {
+        'assessment_count': Count('id'),
+        'total_score_sum': Sum('total_score'),
+        'latest_assessment_id': Max('id'),
+    }
+    for field in SUBSCALE_FIELDS:
+        aggregates[f'{field}_sum'] = Sum(field)
+    for category in CATEGORIES:
+        aggregates[f'{category}_count'] = Count('id', filter=Q(overall_category=category))
+
+    rows = Assessment.objects.order_by().values('user_id').annotate(**aggregates)
+    rollups = [UserAssessmentStats(**row) for row in rows.iterator()]
+    UserAssessmentStats.objects.all().delete()
+    UserAssessmentStats.objects.bulk_create(rollups, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0006_daily_assessment_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_assessment_stats, migrations.RunPython.noop),
+    ]
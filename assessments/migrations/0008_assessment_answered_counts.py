@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0007_rebuild_assessment_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='anxiety_answered',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='depression_answered',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='general_answered',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='stress_answered',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
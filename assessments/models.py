@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -51,16 +52,154 @@ class Assessment(models.Model):
     depression_score = models.IntegerField(default=0)
     stress_score = models.IntegerField(default=0)
     general_score = models.IntegerField(default=0)
+    # Questions answered per subscale, which bound each subscale score (null before they were stored)
+    anxiety_answered = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    depression_answered = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    stress_answered = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    general_answered = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
     overall_category = models.CharField(max_length=20, choices=RESULT_CATEGORIES)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Client-chosen key that makes batch ingestion retries safe (see ingest.py)
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'idempotency_key'], name='assessment_user_idempotency_key'),
+        ]
+        indexes = [
+            # Per-user history, newest first (dashboard, result pages)
+            models.Index(fields=['user', '-created_at'], name='assessment_user_created_idx'),
+            # Admin listing filtered by category and/or date
+            models.Index(fields=['overall_category', 'created_at'], name='assessment_cat_created_idx'),
+            models.Index(fields=['-created_at'], name='assessment_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.overall_category} ({self.total_score}) - {self.created_at.strftime('%Y-%m-%d')}"
 
 
+class UserAssessmentStats(models.Model):
+    """Running per-user rollup of assessment results, read by the dashboard"""
+    SUBSCALE_FIELDS = ['anxiety_score', 'depression_score', 'stress_score', 'general_score']
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='assessment_stats')
+    assessment_count = models.PositiveIntegerField(default=0)
+    total_score_sum = models.BigIntegerField(default=0)
+    anxiety_score_sum = models.BigIntegerField(default=0)
+    depression_score_sum = models.BigIntegerField(default=0)
+    stress_score_sum = models.BigIntegerField(default=0)
+    general_score_sum = models.BigIntegerField(default=0)
+    low_count = models.PositiveIntegerField(default=0)
+    mild_count = models.PositiveIntegerField(default=0)
+    moderate_count = models.PositiveIntegerField(default=0)
+    severe_count = models.PositiveIntegerField(default=0)
+    latest_assessment = models.ForeignKey(Assessment, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'user assessment stats'
+
+    def __str__(self):
+        return f"{self.user.username} - {self.assessment_count} assessments"
+
+    @property
+    def avg_score(self):
+        if not self.assessment_count:
+            return 0
+        return self.total_score_sum / self.assessment_count
+
+    @property
+    def category_counts(self):
+        """Category distribution in the same shape as a values/annotate query"""
+        return [
+            {'overall_category': category, 'count': getattr(self, f'{category}_count')}
+            for category, _ in Assessment.RESULT_CATEGORIES
+            if getattr(self, f'{category}_count')
+        ]
+
+    @classmethod
+    def record(cls, assessment):
+        """Fold a newly saved assessment into its user's rollup"""
+        cls.record_many([assessment])
+
+    @classmethod
+    def record_many(cls, assessments):
+        """Fold newly saved assessments into their users' rollups, one update per user"""
+        by_user = {}
+        for assessment in assessments:
+            by_user.setdefault(assessment.user_id, []).append(assessment)
+
+        with transaction.atomic():
+            for user_id, batch in by_user.items():
+                updates = {
+                    'assessment_count': F('assessment_count') + len(batch),
+                    'total_score_sum': F('total_score_sum') + sum(a.total_score for a in batch),
+                    'latest_assessment': max(batch, key=lambda a: a.id),
+                    'updated_at': timezone.now(),
+                }
+                for field in cls.SUBSCALE_FIELDS:
+                    updates[f'{field}_sum'] = F(f'{field}_sum') + sum(getattr(a, field) for a in batch)
+                for category, _ in Assessment.RESULT_CATEGORIES:
+                    count = sum(1 for a in batch if a.overall_category == category)
+                    if count:
+                        updates[f'{category}_count'] = F(f'{category}_count') + count
+
+                rollup = cls.objects.filter(user_id=user_id)
+                if not rollup.update(**updates):
+                    cls.objects.get_or_create(user_id=user_id)
+                    rollup.update(**updates)
+
+    @classmethod
+    def forget(cls, assessment):
+        """Take a deleted assessment back out of its user's rollup"""
+        updates = {
+            'assessment_count': F('assessment_count') - 1,
+            'total_score_sum': F('total_score_sum') - assessment.total_score,
+            f'{assessment.overall_category}_count': F(f'{assessment.overall_category}_count') - 1,
+            # The newest remaining assessment, as record_many() and rebuild_assessment_stats pick it
+            'latest_assessment': Subquery(
+                Assessment.objects.filter(user_id=OuterRef('user_id')).exclude(id=assessment.id)
+                .order_by('-id').values('id')[:1]
+            ),
+            'updated_at': timezone.now(),
+        }
+        for field in cls.SUBSCALE_FIELDS:
+            updates[f'{field}_sum'] = F(f'{field}_sum') - getattr(assessment, field)
+        cls.objects.filter(user_id=assessment.user_id, assessment_count__gt=0).update(**updates)
+
+
+class DailyAssessmentAggregate(models.Model):
+    """Assessments per day and result category with summed scores, refreshed by aggregates.py"""
+    day = models.DateField()
+    overall_category = models.CharField(max_length=20, choices=Assessment.RESULT_CATEGORIES)
+    assessment_count = models.PositiveIntegerField(default=0)
+    total_score_sum = models.BigIntegerField(default=0)
+    anxiety_score_sum = models.BigIntegerField(default=0)
+    depression_score_sum = models.BigIntegerField(default=0)
+    stress_score_sum = models.BigIntegerField(default=0)
+    general_score_sum = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['day', 'overall_category']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'overall_category'], name='daily_aggregate_day_category'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.overall_category}: {self.assessment_count}"
+
+
+class AggregateWatermark(models.Model):
+    """Highest assessment id already folded into a materialized aggregate"""
+    name = models.CharField(max_length=50, unique=True)
+    last_assessment_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_assessment_id}"
+
+
 class ContactMessage(models.Model):
     """Messages from users via contact form"""
     name = models.CharField(max_length=100)
@@ -70,6 +209,10 @@ class ContactMessage(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Inbox, newest first; full-text search lives in an FTS5 table (see search.py)
+            models.Index(fields=['-created_at'], name='contact_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.created_at.strftime('%Y-%m-%d')}"
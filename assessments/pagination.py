@@ -0,0 +1,73 @@
+"""
+Keyset (cursor) pagination over (created_at, id)
+
+Unlike OFFSET pagination, fetching page N costs the same as page 1: each page
+is an index range scan starting right after the last row of the previous one.
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of results plus the cursor for the next (older) page"""
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(created_at, pk):
+    raw = f'{created_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (created_at, pk) for a cursor, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (TypeError, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f'Invalid cursor: {cursor!r}') from exc
+
+
+def _keyset_query(queryset, cursor, page_size):
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        # The redundant created_at__lte bound keeps the lookup an index range scan
+        queryset = queryset.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    return queryset[:page_size + 1]
+
+
+def _make_page(items, page_size):
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].pk)
+    return KeysetPage(items, next_cursor)
+
+
+def paginate(queryset, cursor=None, page_size=20):
+    """Return the page of `queryset`, newest first, that follows `cursor`"""
+    return _make_page(list(_keyset_query(queryset, cursor, page_size)), page_size)
+
+
+async def apaginate(queryset, cursor=None, page_size=20):
+    """Async variant of paginate using the async ORM"""
+    query = _keyset_query(queryset, cursor, page_size)
+    return _make_page([item async for item in query], page_size)
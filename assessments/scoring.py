@@ -0,0 +1,90 @@
+"""
+Compiled in-memory scoring engine for quiz submissions
+"""
+
+
+SUBSCALE_FIELDS = {
+    'anxiety': 'anxiety_score',
+    'depression': 'depression_score',
+    'stress': 'stress_score',
+    'general': 'general_score',
+}
+ANSWERED_FIELDS = {
+    'anxiety': 'anxiety_answered',
+    'depression': 'depression_answered',
+    'stress': 'stress_answered',
+    'general': 'general_answered',
+}
+
+
+def overall_category(total_score, answered_questions):
+    """Map a total score to a result category based on the answered questions"""
+    max_possible = answered_questions * 4
+    percentage = (total_score / max_possible) * 100
+
+    if percentage < 25:
+        return 'low'
+    elif percentage < 50:
+        return 'mild'
+    elif percentage < 75:
+        return 'moderate'
+    return 'severe'
+
+
+class ScoringEngine:
+    """Flat option id -> (question id, category, weight) lookup built from the catalog"""
+
+    def __init__(self, questions):
+        self.question_ids = []
+        self.options = {}
+        self.subscale_questions = dict.fromkeys(SUBSCALE_FIELDS, 0)
+        for question in questions:
+            self.question_ids.append(question.id)
+            subscale = question.category if question.category in SUBSCALE_FIELDS else 'general'
+            self.subscale_questions[subscale] += 1
+            for option in question.options.all():
+                self.options[option.id] = (question.id, question.category, option.weight)
+
+    def lookup(self, question_id, answer_id):
+        """Return (category, weight) for an answer, or None if it is not an option of the question"""
+        try:
+            entry = self.options.get(int(answer_id))
+        except (TypeError, ValueError):
+            return None
+        if entry is None or entry[0] != question_id:
+            return None
+        return entry[1], entry[2]
+
+    def score(self, data):
+        """
+        Score a submitted answer mapping (e.g. request.POST) in one pass.
+
+        Returns the Assessment field values, or None if no valid answers were given.
+        """
+        scores = dict.fromkeys(SUBSCALE_FIELDS.values(), 0)
+        answered = dict.fromkeys(ANSWERED_FIELDS.values(), 0)
+        total_score = 0
+        answered_questions = 0
+
+        for question_id in self.question_ids:
+            answer_id = data.get(f'question_{question_id}')
+            if not answer_id:
+                continue
+            entry = self.lookup(question_id, answer_id)
+            if entry is None:
+                continue
+            category, weight = entry
+            total_score += weight
+            subscale = category if category in SUBSCALE_FIELDS else 'general'
+            scores[SUBSCALE_FIELDS[subscale]] += weight
+            answered[ANSWERED_FIELDS[subscale]] += 1
+            answered_questions += 1
+
+        if answered_questions == 0:
+            return None
+
+        scores.update(answered)
+        scores['total_score'] = total_score
+        scores['overall_category'] = overall_category(total_score, answered_questions)
+        return scores
+
@@ -0,0 +1,118 @@
+"""
+Pluggable full-text search over contact messages
+
+The backend is chosen by the CONTACT_SEARCH_BACKEND setting (a dotted path).
+By default SQLite databases use the FTS5 index created in migration 0004 and
+other databases fall back to a substring search. A backend implements
+filter() for composing with other querysets (e.g. the Django admin) and
+matching_ids() for the paginated inbox.
+"""
+import re
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .pagination import KeysetPage
+
+
+SEARCH_FIELDS = ['name', 'email', 'message']
+FTS_TABLE = 'assessments_contactmessage_fts'
+
+
+class SearchBackend(ABC):
+    """Finds the contact messages matching a query"""
+
+    @abstractmethod
+    def filter(self, queryset, query):
+        """Restrict a ContactMessage queryset to the matching messages"""
+
+    def matching_ids(self, query, before_id=None, limit=25):
+        """Ids of matching messages below `before_id`, newest (highest id) first"""
+        from .models import ContactMessage
+
+        queryset = self.filter(ContactMessage.objects.all(), query)
+        if before_id is not None:
+            queryset = queryset.filter(id__lt=before_id)
+        return list(queryset.order_by('-id').values_list('id', flat=True)[:limit])
+
+
+class SubstringSearchBackend(SearchBackend):
+    """Portable fallback: case-insensitive substring match on every field"""
+
+    def filter(self, queryset, query):
+        condition = Q()
+        for term in query.split():
+            term_condition = Q()
+            for field in SEARCH_FIELDS:
+                term_condition |= Q(**{f'{field}__icontains': term})
+            condition &= term_condition
+        return queryset.filter(condition)
+
+
+class SQLiteFTS5SearchBackend(SearchBackend):
+    """Token prefix search against the SQLite FTS5 index"""
+
+    def to_match_expression(self, query):
+        # Quote every token so user input can never be parsed as FTS5 syntax
+        tokens = re.findall(r'\w+', query)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def filter(self, queryset, query):
+        expression = self.to_match_expression(query)
+        if not expression:
+            return queryset.none()
+        matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [expression])
+        return queryset.filter(id__in=matches)
+
+    def matching_ids(self, query, before_id=None, limit=25):
+        # Walking the index in rowid order lets FTS5 stop after `limit` hits
+        expression = self.to_match_expression(query)
+        if not expression:
+            return []
+        sql = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        params = [expression]
+        if before_id is not None:
+            sql += ' AND rowid < %s'
+            params.append(before_id)
+        sql += ' ORDER BY rowid DESC LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+
+def get_search_backend():
+    path = getattr(settings, 'CONTACT_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTS5SearchBackend()
+    return SubstringSearchBackend()
+
+
+def search_page(query, cursor=None, page_size=25):
+    """
+    One page of messages matching `query`, newest first.
+
+    Search results are paged by id rather than (created_at, id) so the
+    backend can stop scanning once a page is full; the cursor is the last id.
+    """
+    from .models import ContactMessage
+
+    before_id = int(cursor) if cursor else None
+    ids = get_search_backend().matching_ids(query, before_id, page_size + 1)
+    next_cursor = str(ids[page_size - 1]) if len(ids) > page_size else None
+    items = list(ContactMessage.objects.filter(id__in=ids[:page_size]).order_by('-id'))
+    return KeysetPage(items, next_cursor)
+
+
+def search_messages(queryset, query):
+    """Filter `queryset` to messages matching `query` using the configured backend"""
+    query = (query or '').strip()
+    if not query:
+        return queryset
+    return get_search_backend().filter(queryset, query)
@@ -0,0 +1,73 @@
+"""
+Signal handlers for the assessments app
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Assessment, ContactMessage, Question, QuestionOption, UserAssessmentStats
+from .aggregates import subtract_assessment
+from .catalog import bump_version
+from .instrumentation import record_query
+from .metrics import COUNTED_MODELS, adjust_counter
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+@receiver(post_save, sender=QuestionOption)
+@receiver(post_delete, sender=QuestionOption)
+def question_catalog_changed(sender, **kwargs):
+    """Invalidate the cached catalog whenever a question or option changes"""
+    bump_version()
+
+
+def _counter_name(sender):
+    for name, model in COUNTED_MODELS.items():
+        if sender is model:
+            return name
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=ContactMessage)
+@receiver(post_save, sender=Assessment)
+def admin_metrics_created(sender, created, **kwargs):
+    """Keep the admin dashboard totals current between snapshot refreshes"""
+    if created:
+        adjust_counter(_counter_name(sender), 1)
+
+
+@receiver(post_delete, sender=Question)
+@receiver(post_delete, sender=ContactMessage)
+@receiver(post_delete, sender=Assessment)
+def admin_metrics_deleted(sender, **kwargs):
+    adjust_counter(_counter_name(sender), -1)
+
+
+@receiver(post_delete, sender=Assessment)
+def user_stats_deleted(sender, instance, **kwargs):
+    """Keep the dashboard rollup in step when an assessment is deleted"""
+    UserAssessmentStats.forget(instance)
+
+
+@receiver(post_delete, sender=Assessment)
+def daily_aggregate_deleted(sender, instance, **kwargs):
+    """Keep the materialized daily aggregates exact when assessments are deleted"""
+    subtract_assessment(instance)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Apply the SQLITE_PRAGMAS of the active database profile"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """Time the queries of sampled requests (see instrumentation.py)"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
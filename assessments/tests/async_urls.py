@@ -0,0 +1,23 @@
+"""
+The app's URLconf with the async read views swapped in, as urls.py does
+when settings.ASYNC_VIEWS is on
+"""
+from django.urls import URLPattern
+
+from .. import async_views
+from ..urls import urlpatterns as sync_urlpatterns
+
+
+ASYNC_VIEWS = {
+    'dashboard': async_views.dashboard,
+    'result': async_views.result_view,
+    'api_history': async_views.api_history,
+    'api_trend': async_views.api_trend,
+    'guidance': async_views.guidance_view,
+    'api_chatbot': async_views.api_chatbot,
+}
+
+urlpatterns = [
+    URLPattern(pattern.pattern, ASYNC_VIEWS.get(pattern.name, pattern.callback), pattern.default_args, pattern.name)
+    for pattern in sync_urlpatterns
+]
@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..aggregates import daily_aggregates, refresh_daily_aggregates
+from ..models import AggregateWatermark, Assessment, DailyAssessmentAggregate
+from .utils import create_user
+
+
+class DailyAggregateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('alice')
+
+    def create(self, category, total_score, days_ago=0):
+        assessment = Assessment.objects.create(user=self.user, total_score=total_score,
+                                               anxiety_score=total_score, overall_category=category)
+        if days_ago:
+            Assessment.objects.filter(id=assessment.id).update(
+                created_at=timezone.now() - timedelta(days=days_ago))
+            assessment.refresh_from_db()
+        return assessment
+
+    def aggregate(self, category, day=None):
+        return DailyAssessmentAggregate.objects.get(day=day or timezone.localdate(), overall_category=category)
+
+    def test_full_then_incremental_refresh(self):
+        self.create('mild', 10, days_ago=3)
+        self.create('mild', 12)
+        result = refresh_daily_aggregates()
+        self.assertTrue(result['full'])
+        self.assertEqual(result['days'], 2)
+
+        self.create('mild', 14)
+        latest = self.create('severe', 40)
+        result = refresh_daily_aggregates()
+        self.assertFalse(result['full'])
+        self.assertEqual(result['days'], 1)
+        self.assertEqual(result['watermark'], latest.id)
+        today = self.aggregate('mild')
+        self.assertEqual(today.assessment_count, 2)
+        self.assertEqual(today.total_score_sum, 26)
+        self.assertEqual(self.aggregate('severe').assessment_count, 1)
+
+    def test_refresh_without_new_rows_writes_nothing(self):
+        self.create('low', 1)
+        refresh_daily_aggregates()
+        with self.assertNumQueries(2):
+            result = refresh_daily_aggregates()
+        self.assertEqual(result['days'], 0)
+
+    def test_deleting_a_folded_assessment_subtracts_it(self):
+        kept = self.create('moderate', 20)
+        deleted = self.create('moderate', 30)
+        refresh_daily_aggregates()
+        deleted.delete()
+
+        aggregate = self.aggregate('moderate')
+        self.assertEqual(aggregate.assessment_count, 1)
+        self.assertEqual(aggregate.total_score_sum, 20)
+        self.assertEqual(aggregate.anxiety_score_sum, 20)
+
+        kept.delete()
+        self.assertFalse(daily_aggregates(category='moderate').exists())
+
+    def test_deleting_an_unfolded_assessment(self):
+        self.create('mild', 10)
+        refresh_daily_aggregates()
+        self.create('mild', 12).delete()
+        self.assertEqual(self.aggregate('mild').assessment_count, 1)
+        self.assertEqual(refresh_daily_aggregates()['days'], 0)
+        self.assertEqual(self.aggregate('mild').total_score_sum, 10)
+
+    def test_unknown_category(self):
+        with self.assertRaises(ValueError):
+            daily_aggregates(category='unknown')
+
+
+class DailyAggregateViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('alice')
+        cls.staff = create_user('staff', is_staff=True)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def create(self, category='mild', total_score=10):
+        return Assessment.objects.create(user=self.user, total_score=total_score, overall_category=category)
+
+    def get(self, **params):
+        return self.client.get(reverse('admin_daily_aggregates'), params)
+
+    def test_reads_without_refreshing(self):
+        self.create()
+        response = self.get()
+        self.assertEqual(response.json(), {'as_of': None, 'watermark': None, 'results': []})
+        self.assertFalse(AggregateWatermark.objects.exists())
+
+        first = self.create()
+        refresh_daily_aggregates()
+        self.create()
+        payload = self.get().json()
+        self.assertEqual(payload['watermark'], first.id)
+        self.assertEqual(payload['as_of'], AggregateWatermark.objects.get().updated_at.isoformat())
+        self.assertEqual([row['count'] for row in payload['results']], [2])
+
+    def test_csv_reports_the_watermark(self):
+        latest = self.create()
+        refresh_daily_aggregates()
+        response = self.get(format='csv')
+        self.assertEqual(response['X-Aggregates-Watermark'], str(latest.id))
+        self.assertIn('X-Aggregates-As-Of', response)
+        self.assertEqual(len(response.content.decode().splitlines()), 2)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.get(format='xml').status_code, 400)
+        self.assertEqual(self.get(category='unknown').status_code, 400)
+        self.assertEqual(self.get(since='yesterday').status_code, 400)
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, TestCase
+
+from ..analytics import PERCENTILES, _percentiles, cohort_report, np, reset_columns
+from .utils import create_assessment, create_user
+
+
+@skipUnless(np is not None, 'NumPy is not installed')
+class PercentileTests(SimpleTestCase):
+    def test_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        for size in (1, 2, 7, 1000):
+            values = rng.integers(0, 40, size)
+            np.testing.assert_allclose(_percentiles(np.bincount(values)), np.percentile(values, PERCENTILES))
+
+    def test_empty(self):
+        self.assertEqual(_percentiles(np.zeros(3, np.int64)).tolist(), [0.0] * len(PERCENTILES))
+
+
+@skipUnless(np is not None, 'NumPy is not installed')
+class CohortTests(TestCase):
+    def setUp(self):
+        reset_columns()
+        self.addCleanup(reset_columns)
+
+    def create_member(self, username, joined):
+        user = create_user(username, date_joined=joined)
+        create_assessment(user)
+
+    def cohort_months(self):
+        reset_columns()
+        return [(cohort['month'], cohort['users']) for cohort in cohort_report()['cohorts']]
+
+    def test_signup_month_is_local(self):
+        # 2024-03-01 03:00 UTC is the evening of 29 February in New York and
+        # 2024-01-31 16:00 UTC is the early morning of 1 February in Tokyo
+        self.create_member('late', datetime(2024, 3, 1, 3, tzinfo=timezone.utc))
+        self.create_member('early', datetime(2024, 1, 31, 16, tzinfo=timezone.utc))
+
+        with self.settings(TIME_ZONE='UTC'):
+            self.assertEqual(self.cohort_months(), [('2024-01', 1), ('2024-03', 1)])
+        with self.settings(TIME_ZONE='America/New_York'):
+            self.assertEqual(self.cohort_months(), [('2024-01', 1), ('2024-02', 1)])
+        with self.settings(TIME_ZONE='Asia/Tokyo'):
+            self.assertEqual(self.cohort_months(), [('2024-02', 1), ('2024-03', 1)])
+
+    def test_daylight_saving_offset(self):
+        # 04:30 UTC is 00:30 in New York under daylight saving time (UTC-4)
+        # but still 23:30 the previous day in winter (UTC-5)
+        self.create_member('summer', datetime(2024, 7, 1, 4, 30, tzinfo=timezone.utc))
+        self.create_member('winter', datetime(2024, 12, 1, 4, 30, tzinfo=timezone.utc))
+        with self.settings(TIME_ZONE='America/New_York'):
+            self.assertEqual(self.cohort_months(), [('2024-07', 1), ('2024-11', 1)])
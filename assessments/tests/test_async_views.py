@@ -0,0 +1,78 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from ..cache import page_cache
+from ..content import CRISIS_RESPONSE
+from .utils import create_assessment, create_user
+
+
+@override_settings(ROOT_URLCONF='assessments.tests.async_urls')
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('alice')
+        cls.assessments = [create_assessment(cls.user, total_score=score, anxiety_score=score) for score in range(3)]
+        cls.other = create_assessment(create_user('bob'))
+
+    def setUp(self):
+        page_cache.bump()
+        self.async_client = AsyncClient()
+
+    async def login(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+
+    def test_urlconf_serves_async_views(self):
+        for name in ('dashboard', 'api_history', 'guidance', 'api_chatbot'):
+            self.assertTrue(asyncio.iscoroutinefunction(resolve(reverse(name)).func), name)
+
+    async def test_login_required(self):
+        for name in ('dashboard', 'api_history', 'api_trend'):
+            response = await self.async_client.get(reverse(name))
+            self.assertEqual(response.status_code, 302, name)
+            self.assertTrue(response['Location'].startswith(reverse('login')))
+
+    async def test_dashboard(self):
+        await self.login()
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['assessments']), 3)
+
+    async def test_result_view_is_limited_to_own_assessments(self):
+        await self.login()
+        response = await self.async_client.get(reverse('result', args=[self.assessments[0].id]))
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get(reverse('result', args=[self.other.id]))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+    async def test_api_history(self):
+        await self.login()
+        url = reverse('api_history')
+        first = (await self.async_client.get(url, {'limit': 2})).json()
+        second = (await self.async_client.get(url, {'limit': 2, 'cursor': first['next_cursor']})).json()
+        ids = [row['id'] for row in first['results'] + second['results']]
+        self.assertEqual(ids, [assessment.id for assessment in reversed(self.assessments)])
+        self.assertEqual((await self.async_client.get(url, {'cursor': 'garbage'})).status_code, 400)
+
+    async def test_api_trend(self):
+        await self.login()
+        url = reverse('api_trend')
+        response = await self.async_client.get(url, {'bucket': 'day'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(response.json()['counts']), 3)
+        self.assertEqual((await self.async_client.get(url, {'points': 1})).status_code, 400)
+
+    async def test_guidance_is_page_cached(self):
+        response = await self.async_client.get(reverse('guidance'))
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get(reverse('guidance'), headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_api_chatbot(self):
+        response = await self.async_client.post(reverse('api_chatbot'), {'message': 'I want to die'},
+                                                content_type='application/json')
+        self.assertEqual(response.json()['response'], CRISIS_RESPONSE)
+        self.assertTrue(response.json()['crisis'])
+        self.assertEqual((await self.async_client.get(reverse('api_chatbot'))).status_code, 405)
@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase
+
+from ..cache import NamespacedCache
+
+
+class NamespacedCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = NamespacedCache('tests')
+        self.cache.bump()
+
+    def test_bump_invalidates_the_namespace(self):
+        self.cache.set('a', 1)
+        version = self.cache.version()
+        self.assertEqual(self.cache.version(), version)
+        self.cache.bump()
+        self.assertNotEqual(self.cache.version(), version)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('a', version=version), 1)
+
+    def test_add_only_sets_missing_keys(self):
+        self.assertTrue(self.cache.add('lock', 1))
+        self.assertFalse(self.cache.add('lock', 2))
+        self.assertEqual(self.cache.get('lock'), 1)
+
+    def test_counts_hits_and_misses(self):
+        before = self.cache.stats()
+        self.cache.set_many({'a': 1, 'b': 2})
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2})
+        self.cache.get('c')
+        after = self.cache.stats()
+        self.assertEqual(after['hits'] - before['hits'], 2)
+        self.assertEqual(after['misses'] - before['misses'], 2)
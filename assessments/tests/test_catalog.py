@@ -0,0 +1,63 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from .. import catalog
+from ..catalog import Catalog, current_version, get_catalog
+from .utils import create_question
+
+
+class CatalogTests(TestCase):
+    def setUp(self):
+        catalog._bump()
+
+    def test_reused_while_the_version_is_unchanged(self):
+        create_question('How often do you worry?', 'anxiety')
+        catalog._bump()
+        first = get_catalog()
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog(), first)
+
+    def test_question_changes_bump_the_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            question = create_question('How often do you worry?', 'anxiety')
+        first = get_catalog()
+        self.assertEqual([item.text for item in first.questions], [question.text])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            question.options.filter(weight=4).delete()
+        second = get_catalog()
+        self.assertNotEqual(second.version, first.version)
+        self.assertEqual(len(second.engine.options), 4)
+
+    def test_version_only_changes_after_commit(self):
+        version = current_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            create_question('How often do you worry?', 'anxiety')
+            self.assertEqual(current_version(), version)
+        self.assertTrue(callbacks)
+
+
+class QuizFragmentTests(TestCase):
+    def setUp(self):
+        catalog._bump()
+        create_question('How often do you worry?', 'anxiety')
+        catalog._bump()
+
+    def test_rendered_once_per_version(self):
+        version = current_version()
+        questions = get_catalog().questions
+        with mock.patch.object(catalog, 'render_to_string', wraps=catalog.render_to_string) as render:
+            html = Catalog(version, questions).questions_html
+            # A second process with the same version reads the shared cache
+            self.assertEqual(Catalog(version, questions).questions_html, html)
+        self.assertEqual(render.call_count, 1)
+        self.assertIn('How often do you worry?', html)
+
+    def test_new_version_renders_again(self):
+        before = get_catalog().questions_html
+        with self.captureOnCommitCallbacks(execute=True):
+            create_question('How often do you panic?', 'anxiety')
+        after = get_catalog().questions_html
+        self.assertNotIn('How often do you panic?', before)
+        self.assertIn('How often do you panic?', after)
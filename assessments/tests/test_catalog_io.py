@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import tempfile
+from unittest import skipUnless
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from ..catalog_io import (
+    CatalogError, apply_catalog, export_entries, read_catalog, validate_entries, write_catalog, yaml,
+)
+from ..metrics import COUNTER_KEY, metrics_cache
+from ..models import Question, QuestionOption
+
+ENTRIES = [
+    {'text': 'How often do you worry?', 'category': 'anxiety', 'options': [('Never', 0), ('Often', 3)]},
+    {'text': 'How often do you feel low?', 'category': 'depression',
+     'options': [('Never', 0), ('Sometimes', 1), ('Always', 4)]},
+]
+
+
+class CatalogImportTests(TestCase):
+    def round_trip(self, fmt):
+        fh = io.StringIO()
+        write_catalog(ENTRIES, fh, fmt)
+        fh.seek(0)
+        return read_catalog(fh, fmt)
+
+    def test_round_trip(self):
+        self.assertEqual(self.round_trip('json'), validate_entries(ENTRIES))
+        self.assertEqual(self.round_trip('csv'), validate_entries(ENTRIES))
+
+    @skipUnless(yaml is not None, 'PyYAML is not installed')
+    def test_yaml_round_trip(self):
+        self.assertEqual(self.round_trip('yaml'), validate_entries(ENTRIES))
+
+    def test_apply_only_changes_differences(self):
+        self.assertEqual(apply_catalog(validate_entries(ENTRIES))['created'], 2)
+        self.assertEqual(apply_catalog(validate_entries(ENTRIES)),
+                         {'created': 0, 'updated': 0, 'unchanged': 2, 'deleted': 0})
+
+        changed = validate_entries([{**ENTRIES[0], 'options': [('Never', 0), ('Often', 4)]}])
+        counts = apply_catalog(changed, prune=True)
+        self.assertEqual((counts['updated'], counts['deleted']), (1, 1))
+        self.assertEqual(export_entries(), changed)
+        self.assertEqual(QuestionOption.objects.count(), 2)
+
+    def test_created_questions_update_the_admin_counter(self):
+        key = COUNTER_KEY.format(name='questions')
+        metrics_cache.set(key, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_catalog(validate_entries(ENTRIES))
+        self.assertEqual(metrics_cache.get(key), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_catalog(validate_entries(ENTRIES[:1]), prune=True)
+        self.assertEqual(metrics_cache.get(key), Question.objects.count())
+
+    def test_invalid_entries(self):
+        for entries in ({}, [{'text': 'x', 'options': [('a', 0)]}],
+                        [{'text': 'x', 'category': 'unknown', 'options': [('a', 0), ('b', 1)]}],
+                        [{'text': 'x', 'options': [('a', 0), ('b', 9)]}],
+                        [{'text': 'x', 'options': [('a', 0), ('b', 1)]}] * 2):
+            with self.assertRaises(CatalogError):
+                validate_entries(entries)
+
+    def test_unparseable_files(self):
+        for fmt, content in (('json', '{"a": '), ('csv', 'text,category\nx,anxiety\n')):
+            with self.assertRaises(CatalogError):
+                read_catalog(io.StringIO(content), fmt)
+        if yaml is not None:
+            with self.assertRaises(CatalogError):
+                read_catalog(io.StringIO('a: [1, 2\n'), 'yaml')
+
+
+class ImportCommandTests(TestCase):
+    def write(self, name, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, name)
+        with open(path, 'w') as fh:
+            fh.write(content)
+        return path
+
+    def test_import_and_dry_run(self):
+        path = self.write('catalog.json', json.dumps(ENTRIES))
+        call_command('import_catalog', path, '--dry-run', stdout=io.StringIO())
+        self.assertFalse(Question.objects.exists())
+        call_command('import_catalog', path, stdout=io.StringIO())
+        self.assertEqual(Question.objects.count(), 2)
+
+    def test_malformed_files_raise_command_error(self):
+        for name, content in (('bad.json', '{"a": '), ('bad.csv', 'text\nx\n'), ('catalog.txt', '')):
+            with self.assertRaises(CommandError):
+                call_command('import_catalog', self.write(name, content), stdout=io.StringIO())
@@ -0,0 +1,64 @@
+import json
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from ..chatbot import MAX_MESSAGE_LENGTH, Chatbot
+from ..content import CHATBOT_DEFAULT_RESPONSE, CRISIS_RESPONSE
+
+
+class ChatbotTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.chatbot = Chatbot()
+
+    def test_crisis_phrases_win(self):
+        for message in ('I want to die', 'I feel anxious and want to end my life', 'I don’t want to live',
+                        'thinking about SELF-HARM'):
+            reply = self.chatbot.reply(message)
+            self.assertTrue(reply.crisis, message)
+            self.assertEqual(reply.response, CRISIS_RESPONSE)
+
+    def test_crisis_phrases_match_whole_words(self):
+        self.assertFalse(self.chatbot.is_crisis('my suicidesque playlist'))
+
+    def test_intents(self):
+        for message, intent in (
+            ('I have anxiety', 'anxiety'),
+            ("I'm so anxious", 'anxiety'),
+            ('I have depression', 'sadness'),
+            ('so much stress at school', 'stress'),
+            ('insomnia', 'sleep'),
+            ("I can't sleep at night", 'sleep'),
+            ('I feel lonely', 'loneliness'),
+        ):
+            self.assertEqual(self.chatbot.reply(message).intent, intent, message)
+
+    def test_weak_matches_get_the_default_reply(self):
+        for message in ("I don't feel anything", 'I feel', 'blue cheese'):
+            reply = self.chatbot.reply(message)
+            self.assertIsNone(reply.intent, message)
+            self.assertEqual(reply.response, CHATBOT_DEFAULT_RESPONSE)
+            self.assertFalse(reply.crisis)
+
+
+class ChatbotApiTests(SimpleTestCase):
+    def post(self, body, content_type='application/json'):
+        return self.client.post(reverse('api_chatbot'), body, content_type=content_type)
+
+    def test_crisis_message(self):
+        response = self.post({'message': 'I want to kill myself'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'response': CRISIS_RESPONSE, 'intent': 'crisis', 'crisis': True})
+
+    def test_form_encoded_message(self):
+        response = self.client.post(reverse('api_chatbot'), {'message': 'I have anxiety'})
+        self.assertEqual(response.json()['intent'], 'anxiety')
+        self.assertFalse(response.json()['crisis'])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.post('not json').status_code, 400)
+        self.assertEqual(self.post(json.dumps({'message': '  '})).status_code, 400)
+        self.assertEqual(self.post({'message': 'a' * (MAX_MESSAGE_LENGTH + 1)}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('api_chatbot')).status_code, 405)
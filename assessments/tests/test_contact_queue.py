@@ -0,0 +1,101 @@
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+
+from .. import contact_queue
+from ..models import ContactMessage
+
+
+class ContactQueueTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'queue.sqlite3'
+        override = override_settings(CONTACT_WRITE_BEHIND=True, CONTACT_QUEUE_PATH=self.path,
+                                     CONTACT_QUEUE_MAX_ATTEMPTS=2)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(contact_queue.close_connection)
+        # Flushing is driven by the tests, not the background thread
+        patcher = mock.patch.object(contact_queue, 'ensure_worker')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def enqueue(self, name='Ann'):
+        contact_queue.enqueue({'name': name, 'email': 'ann@example.com', 'message': 'Hello'})
+
+    def flush(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return contact_queue.flush()
+
+    def queue_rows(self):
+        return contact_queue._connection().execute(
+            'SELECT id, attempts, dead, claimed_until FROM contact_queue ORDER BY id'
+        ).fetchall()
+
+    def test_flush_keeps_submission_time(self):
+        self.enqueue()
+        enqueued_at = time.time() - 3600
+        contact_queue._connection().execute('UPDATE contact_queue SET enqueued_at = ?', (enqueued_at,))
+        self.assertEqual(self.flush(), 1)
+        message = ContactMessage.objects.get()
+        self.assertEqual(message.name, 'Ann')
+        self.assertAlmostEqual(message.created_at.timestamp(), enqueued_at, places=3)
+        self.assertEqual(self.queue_rows(), [])
+
+    def test_queue_is_writable_during_insert(self):
+        self.enqueue()
+        insert = contact_queue._insert
+
+        def enqueue_from_another_connection(rows):
+            other = sqlite3.connect(str(self.path), timeout=0, isolation_level=None)
+            try:
+                other.execute("INSERT INTO contact_queue (payload, enqueued_at) VALUES ('{}', 0)")
+            finally:
+                other.close()
+            insert(rows)
+
+        with mock.patch.object(contact_queue, '_insert', side_effect=enqueue_from_another_connection):
+            self.assertEqual(self.flush(), 1)
+
+    def test_bad_entry_is_dead_lettered(self):
+        self.enqueue('Ann')
+        contact_queue._connection().execute(
+            "INSERT INTO contact_queue (payload, enqueued_at) VALUES ('not json', ?)", (time.time(),)
+        )
+        self.enqueue('Bob')
+        with self.assertLogs('assessments.contact_queue', 'ERROR'):
+            self.assertEqual(self.flush(), 2)
+        self.assertEqual(sorted(ContactMessage.objects.values_list('name', flat=True)), ['Ann', 'Bob'])
+        (_, attempts, dead, claimed_until), = self.queue_rows()
+        self.assertEqual((attempts, dead, claimed_until), (1, 0, None))
+
+        with self.assertLogs('assessments.contact_queue', 'ERROR'):
+            self.assertEqual(self.flush(), 0)
+        self.assertEqual(len(contact_queue.dead_entries()), 1)
+        self.assertEqual(contact_queue.queue_stats()['depth'], 0)
+
+        self.assertEqual(contact_queue.retry_dead(), 1)
+        self.assertEqual(contact_queue.queue_stats()['depth'], 1)
+
+    def test_locked_database_does_not_count_an_attempt(self):
+        self.enqueue()
+        with mock.patch.object(contact_queue, '_insert', side_effect=OperationalError('database is locked')):
+            with self.assertRaises(OperationalError):
+                contact_queue.flush()
+        (_, attempts, dead, claimed_until), = self.queue_rows()
+        self.assertEqual((attempts, dead, claimed_until), (0, 0, None))
+        self.assertEqual(self.flush(), 1)
+
+    def test_claimed_entries_are_skipped_until_the_claim_expires(self):
+        self.enqueue()
+        conn = contact_queue._connection()
+        conn.execute('UPDATE contact_queue SET claimed_until = ?', (time.time() + 60,))
+        self.assertEqual(self.flush(), 0)
+        conn.execute('UPDATE contact_queue SET claimed_until = ?', (time.time() - 1,))
+        self.assertEqual(self.flush(), 1)
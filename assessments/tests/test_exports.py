@@ -0,0 +1,71 @@
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..exports import EXPORT_FIELDS, export_queryset, stream_export
+from ..models import Assessment
+from .utils import create_assessment, create_user
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = create_user('counselor', is_staff=True)
+        user = create_user('alice')
+        for score in range(5):
+            create_assessment(user, 'severe' if score == 4 else 'low', score)
+        old = create_assessment(user, 'mild', 10)
+        Assessment.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=30))
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def get(self, **params):
+        response = self.client.get(reverse('admin_export_assessments'), params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_csv(self):
+        rows = list(csv.reader(io.StringIO(self.get().decode())))
+        self.assertEqual(rows[0], [name for name, _ in EXPORT_FIELDS])
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[1][2], 'alice')
+
+    def test_ndjson_with_filters(self):
+        since = (timezone.localdate() - timedelta(days=1)).isoformat()
+        records = [json.loads(line) for line in self.get(format='ndjson', since=since).splitlines()]
+        self.assertEqual(len(records), 5)
+        records = [json.loads(line) for line in self.get(format='ndjson', category='severe').splitlines()]
+        self.assertEqual([record['total_score'] for record in records], [4])
+
+    def test_gzip(self):
+        self.assertEqual(gzip.decompress(self.get(gzip='1')), self.get())
+
+    def test_chunks_are_batched(self):
+        chunks = list(stream_export(export_queryset(), 'csv', chunk_size=2))
+        self.assertEqual(len(chunks), 1)
+
+    def test_bad_parameters(self):
+        url = reverse('admin_export_assessments')
+        self.assertEqual(self.client.get(url, {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'category': 'unknown'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'since': 'yesterday'}).status_code, 400)
+
+    def test_staff_only(self):
+        self.client.force_login(create_user('bob'))
+        self.assertEqual(self.client.get(reverse('admin_export_assessments')).status_code, 302)
+
+    async def test_streams_asynchronously_under_asgi(self):
+        client = AsyncClient()
+        await sync_to_async(client.force_login)(self.staff)
+        response = await client.get(reverse('admin_export_assessments'))
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), 7)
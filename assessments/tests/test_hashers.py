@@ -0,0 +1,77 @@
+import threading
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..hashers import HashingBusy, hashing_slot
+from .utils import create_user
+
+
+PBKDF2 = 'assessments.hashers.BoundedPBKDF2PasswordHasher'
+SCRYPT = 'assessments.hashers.BoundedScryptPasswordHasher'
+FAST_SCRYPT = {'work_factor': 2 ** 10, 'block_size': 8, 'parallelism': 1}
+
+
+def hashers(*first):
+    return [*first, *(hasher for hasher in settings.PASSWORD_HASHERS if hasher not in first)]
+
+
+@override_settings(PASSWORD_SCRYPT=FAST_SCRYPT)
+class RehashTests(TestCase):
+    def login(self):
+        return self.client.post(reverse('login'), {'username': 'alice', 'password': 'pass'})
+
+    def test_changed_iterations_rehash_on_login(self):
+        with self.settings(PASSWORD_HASHERS=hashers(PBKDF2), PASSWORD_PBKDF2_ITERATIONS=1000):
+            user = create_user('alice')
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+        with self.settings(PASSWORD_HASHERS=hashers(PBKDF2), PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertRedirects(self.login(), reverse('dashboard'), fetch_redirect_response=False)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_switched_profile_rehashes_on_login(self):
+        with self.settings(PASSWORD_HASHERS=hashers(PBKDF2), PASSWORD_PBKDF2_ITERATIONS=1000):
+            user = create_user('alice')
+        with self.settings(PASSWORD_HASHERS=hashers(SCRYPT)):
+            self.assertRedirects(self.login(), reverse('dashboard'), fetch_redirect_response=False)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith(f'scrypt${FAST_SCRYPT["work_factor"]}$'))
+
+
+@override_settings(PASSWORD_HASHING_CONCURRENCY=1, PASSWORD_HASHING_TIMEOUT=0,
+                   PASSWORD_HASHERS=hashers(PBKDF2), PASSWORD_PBKDF2_ITERATIONS=1000)
+class HashingSlotTests(TestCase):
+    def hold_slot(self):
+        """Occupy the only hashing slot from another thread until the test ends"""
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            with hashing_slot():
+                held.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        held.wait()
+
+    def test_busy_when_no_slot_frees_up(self):
+        self.hold_slot()
+        with self.assertRaises(HashingBusy):
+            make_password('pass')
+
+    def test_slot_is_reentrant(self):
+        with hashing_slot():
+            self.assertTrue(make_password('pass').startswith('pbkdf2_sha256$1000$'))
+
+    def test_login_answers_503_when_busy(self):
+        create_user('alice')
+        self.hold_slot()
+        response = self.client.post(reverse('login'), {'username': 'alice', 'password': 'pass'})
+        self.assertEqual(response.status_code, 503)
+        self.assertNotIn('_auth_user_id', self.client.session)
@@ -0,0 +1,91 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from ..ingest import IngestError, ingest_batch
+from ..models import Assessment, UserAssessmentStats
+from .utils import CatalogMixin, create_user, option_id
+
+
+class IngestTests(CatalogMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = create_user('kiosk')
+        cls.other = create_user('visitor')
+        cls.staff = create_user('counselor', is_staff=True)
+
+    def entry(self, key, weight=2, **extra):
+        return {'idempotency_key': key, 'answers': {str(self.worry.id): option_id(self.worry, weight)}, **extra}
+
+    def test_creates_and_updates_rollup(self):
+        results = ingest_batch(self.user, [self.entry('k1', 4), self.entry('k2', 0)], self.engine())
+        self.assertEqual([result['status'] for result in results], ['created', 'created'])
+        stats = UserAssessmentStats.objects.get(user=self.user)
+        self.assertEqual(stats.assessment_count, 2)
+        self.assertEqual(stats.total_score_sum, 4)
+        self.assertEqual(stats.latest_assessment_id, results[1]['id'])
+
+    def test_resent_batch_is_reported_as_duplicate(self):
+        engine = self.engine()
+        first = ingest_batch(self.user, [self.entry('k1'), self.entry('k2')], engine)
+        retry = ingest_batch(self.user, [self.entry('k1'), self.entry('k2'), self.entry('k3')], engine)
+        self.assertEqual([result['status'] for result in retry], ['duplicate', 'duplicate', 'created'])
+        self.assertEqual(retry[0]['id'], first[0]['id'])
+        self.assertEqual(Assessment.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(UserAssessmentStats.objects.get(user=self.user).assessment_count, 3)
+
+    def test_repeated_key_within_a_batch(self):
+        results = ingest_batch(self.user, [self.entry('k1'), self.entry('k1')], self.engine())
+        self.assertEqual([result['status'] for result in results], ['created', 'duplicate'])
+        self.assertEqual(results[0]['id'], results[1]['id'])
+
+    def test_same_key_for_different_users(self):
+        engine = self.engine()
+        ingest_batch(self.user, [self.entry('k1')], engine)
+        results = ingest_batch(self.other, [self.entry('k1')], engine)
+        self.assertEqual(results[0]['status'], 'created')
+
+    def test_invalid_entries(self):
+        results = ingest_batch(self.user, [
+            'not an object',
+            {'idempotency_key': 'k1', 'answers': {}},
+            {'idempotency_key': 'k2', 'answers': [1, 2]},
+            {'idempotency_key': '', 'answers': {str(self.worry.id): option_id(self.worry, 1)}},
+            self.entry('k3'),
+        ], self.engine())
+        self.assertEqual([result['status'] for result in results],
+                         ['invalid', 'invalid', 'invalid', 'invalid', 'created'])
+        self.assertEqual(results[1]['error'], 'No valid answers.')
+        self.assertEqual(Assessment.objects.count(), 1)
+
+    def test_only_staff_submit_for_other_users(self):
+        engine = self.engine()
+        results = ingest_batch(self.user, [self.entry('k1', username='visitor')], engine)
+        self.assertEqual(results[0]['error'], 'Only staff may submit assessments for other users.')
+
+        results = ingest_batch(self.staff, [self.entry('k1', username='visitor'),
+                                            self.entry('k2', username='nobody')], engine)
+        self.assertEqual([result['status'] for result in results], ['created', 'invalid'])
+        self.assertEqual(Assessment.objects.get(id=results[0]['id']).user, self.other)
+        self.assertEqual(results[1]['error'], 'Unknown user "nobody".')
+
+    def test_rejects_malformed_batches(self):
+        with self.assertRaises(IngestError):
+            ingest_batch(self.user, {'idempotency_key': 'k1'}, self.engine())
+        with self.settings(ASSESSMENT_INGEST_MAX_BATCH=1):
+            with self.assertRaises(IngestError):
+                ingest_batch(self.user, [self.entry('k1'), self.entry('k2')], self.engine())
+
+    def test_api(self):
+        self.client.force_login(self.user)
+        url = reverse('api_ingest_assessments')
+        response = self.client.post(url, json.dumps({'assessments': [self.entry('k1'), {}]}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual(response.json()['invalid'], 1)
+
+        response = self.client.post(url, json.dumps([self.entry('k1')]), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,71 @@
+import re
+
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from ..cache import page_cache
+from ..instrumentation import ViewMetrics, render_prometheus, view_metrics
+from .utils import create_assessment, create_user
+
+
+def metrics_for(view):
+    return view_metrics().get(view, {name: 0 for name in ViewMetrics.__slots__})
+
+
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('alice')
+        create_assessment(cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1)
+    def test_sampled_request_gets_server_timing(self):
+        before = metrics_for('dashboard')
+        response = self.client.get(reverse('dashboard'))
+        queries = int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+        self.assertGreater(queries, 0)
+        self.assertIn('tpl;dur=', response['Server-Timing'])
+
+        after = metrics_for('dashboard')
+        self.assertEqual(after['requests'] - before['requests'], 1)
+        self.assertEqual(after['sampled'] - before['sampled'], 1)
+        self.assertEqual(after['queries'] - before['queries'], queries)
+        self.assertEqual(after['response_bytes'] - before['response_bytes'], len(response.content))
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_unsampled_request_is_only_counted(self):
+        before = metrics_for('dashboard')
+        response = self.client.get(reverse('dashboard'))
+        self.assertNotIn('Server-Timing', response)
+        after = metrics_for('dashboard')
+        self.assertEqual(after['requests'] - before['requests'], 1)
+        self.assertEqual(after['sampled'], before['sampled'])
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1, REQUEST_METRICS_SERVER_TIMING=False)
+    def test_server_timing_can_be_turned_off(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1)
+    async def test_async_stack(self):
+        page_cache.bump()
+        response = await AsyncClient().get(reverse('guidance'))
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    def test_prometheus_endpoint(self):
+        self.client.get(reverse('dashboard'))
+        self.client.force_login(create_user('staff', is_staff=True))
+        response = self.client.get(reverse('admin_metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('mindcare_requests_total{view="dashboard"}', response.content.decode())
+
+    def test_render_prometheus(self):
+        views = {'home': {name: 0 for name in ViewMetrics.__slots__}}
+        views['home'].update(requests=2, buckets=[1, 1, 0, 0, 0, 0, 0, 0, 0, 0])
+        body = render_prometheus(views, cache={'pages': {'hits': 3, 'misses': 1}})
+        self.assertIn('mindcare_request_duration_seconds_bucket{view="home",le="0.01"} 2', body)
+        self.assertIn('mindcare_request_duration_seconds_count{view="home"} 2', body)
+        self.assertIn('mindcare_cache_hits_total{namespace="pages"} 3', body)
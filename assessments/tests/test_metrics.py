@@ -0,0 +1,92 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import metrics
+from ..metrics import REFRESH_LOCK_KEY, get_snapshot, metrics_cache, refresh_snapshot
+from ..models import ContactMessage
+from ..aggregates import refresh_daily_aggregates
+from .utils import create_assessment, create_question, create_user
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        metrics_cache.bump()
+
+    def create_message(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ContactMessage.objects.create(name='Ann', email='ann@example.com', message='Hello')
+
+    def test_cached_between_refreshes(self):
+        create_question('How often do you worry?', 'anxiety')
+        snapshot = get_snapshot()
+        self.assertEqual(snapshot['counts']['questions'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_snapshot()['computed_at'], snapshot['computed_at'])
+
+    def test_live_counters_between_refreshes(self):
+        get_snapshot()
+        self.create_message()
+        self.assertEqual(get_snapshot()['counts']['messages'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            ContactMessage.objects.get().delete()
+        self.assertEqual(get_snapshot()['counts']['messages'], 0)
+
+    def test_lagging_aggregates_do_not_reset_the_assessment_count(self):
+        user = create_user('alice')
+        with self.captureOnCommitCallbacks(execute=True):
+            create_assessment(user, total_score=4)
+        refresh_daily_aggregates()
+        get_snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_assessment(user)
+        self.assertEqual(get_snapshot()['counts']['assessments'], 2)
+
+        # Recomputing before the aggregates catch up keeps the exact count
+        snapshot = refresh_snapshot()
+        self.assertEqual(snapshot['counts']['assessments'], 2)
+        self.assertEqual(snapshot['averages']['total'], 4)
+        self.assertEqual(get_snapshot()['counts']['assessments'], 2)
+
+    def test_stale_snapshot_is_recomputed(self):
+        snapshot = refresh_snapshot()
+        with self.settings(ADMIN_METRICS_MAX_AGE=0):
+            self.assertGreater(get_snapshot()['computed_at'], snapshot['computed_at'])
+        self.assertIsNone(metrics_cache.get(REFRESH_LOCK_KEY))
+
+    def test_stale_snapshot_is_served_while_another_request_refreshes(self):
+        snapshot = refresh_snapshot()
+        metrics_cache.add(REFRESH_LOCK_KEY, True)
+        with self.settings(ADMIN_METRICS_MAX_AGE=0), \
+                mock.patch.object(metrics, 'compute_snapshot', side_effect=AssertionError('recomputed')):
+            self.assertEqual(get_snapshot()['computed_at'], snapshot['computed_at'])
+
+    def test_cold_cache_waits_for_the_lock_holder(self):
+        metrics_cache.add(REFRESH_LOCK_KEY, True)
+        snapshot = metrics.compute_snapshot()
+
+        def finish_refresh(seconds):
+            metrics_cache.set('snapshot', snapshot)
+
+        with mock.patch.object(metrics.time, 'sleep', side_effect=finish_refresh), \
+                mock.patch.object(metrics, 'compute_snapshot', side_effect=AssertionError('recomputed')):
+            self.assertEqual(get_snapshot()['computed_at'], snapshot['computed_at'])
+
+    def test_cold_cache_computes_without_caching_after_waiting(self):
+        metrics_cache.add(REFRESH_LOCK_KEY, True)
+        with mock.patch.object(metrics, 'REFRESH_WAIT', 0):
+            self.assertIn('counts', get_snapshot())
+        self.assertIsNone(metrics_cache.get('snapshot'))
+
+    def test_refresh_command(self):
+        call_command('refresh_admin_metrics', stdout=StringIO())
+        self.assertIsNotNone(metrics_cache.get('snapshot'))
+
+    def test_dashboard(self):
+        self.client.force_login(create_user('counselor', is_staff=True))
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_messages'], 0)
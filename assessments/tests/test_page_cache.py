@@ -0,0 +1,48 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from ..cache import cache_anonymous_page, page_cache
+from .utils import create_user
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        page_cache.bump()
+
+    def test_revalidation_gets_304(self):
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        etag = response['ETag']
+
+        response = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(reverse('home'), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get(reverse('home'), HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_unlisted_query_parameters_share_an_entry(self):
+        calls = []
+
+        @cache_anonymous_page(query_params=('page',))
+        def view(request):
+            calls.append(request.GET.get('page'))
+            return HttpResponse(f'page {request.GET.get("page")}')
+
+        factory = RequestFactory()
+        view(factory.get('/listing/', {'page': '1'}))
+        view(factory.get('/listing/', {'page': '1', 'utm_source': 'mail'}))
+        response = view(factory.get('/listing/', {'page': '2'}))
+        self.assertEqual(calls, ['1', '2'])
+        self.assertEqual(response.content, b'page 2')
+
+    def test_session_cookie_bypasses_the_cache(self):
+        self.client.force_login(create_user('alice'))
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
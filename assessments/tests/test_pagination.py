@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Assessment
+from ..pagination import decode_cursor, encode_cursor, paginate
+from .utils import create_assessment, create_user
+
+
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('alice')
+        for score in range(7):
+            create_assessment(cls.user, total_score=score)
+        # Rows sharing a timestamp are ordered by id
+        Assessment.objects.filter(total_score__in=(2, 3, 4)).update(created_at=timezone.now() - timedelta(days=1))
+        cls.expected = list(Assessment.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def test_pages_cover_every_row_once(self):
+        seen, cursor = [], None
+        while True:
+            page = paginate(Assessment.objects.all(), cursor, page_size=2)
+            seen.extend(assessment.id for assessment in page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.expected)
+
+    def test_last_page_has_no_cursor(self):
+        page = paginate(Assessment.objects.all(), page_size=7)
+        self.assertEqual(len(page), 7)
+        self.assertIsNone(page.next_cursor)
+
+    def test_cursor_round_trip(self):
+        moment = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(moment, 42)), (moment, 42))
+
+    def test_invalid_cursor(self):
+        for cursor in ('', 'not-a-cursor', encode_cursor(timezone.now(), 1)[:-3]):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+    def test_api_history(self):
+        self.client.force_login(self.user)
+        url = reverse('api_history')
+        first = self.client.get(url, {'limit': 4}).json()
+        second = self.client.get(url, {'limit': 4, 'cursor': first['next_cursor']}).json()
+        self.assertEqual([row['id'] for row in first['results'] + second['results']], self.expected)
+        self.assertIsNone(second['next_cursor'])
+
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'limit': 0}).status_code, 400)
+
+    def test_history_page_only_shows_own_assessments(self):
+        create_assessment(create_user('bob'))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('history'))
+        self.assertEqual([assessment.id for assessment in response.context['page']], self.expected)
@@ -0,0 +1,66 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import UserAssessmentStats
+from .utils import create_assessment, create_user
+
+
+class UserAssessmentStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('alice')
+
+    def stats(self):
+        return UserAssessmentStats.objects.get(user=self.user)
+
+    def test_record_many(self):
+        first = create_assessment(self.user, 'low', 2, anxiety_score=1)
+        second = create_assessment(self.user, 'severe', 40, anxiety_score=12)
+        UserAssessmentStats.record_many([first, second])
+        stats = self.stats()
+        self.assertEqual(stats.assessment_count, 2)
+        self.assertEqual(stats.total_score_sum, 42)
+        self.assertEqual(stats.anxiety_score_sum, 13)
+        self.assertEqual((stats.low_count, stats.severe_count), (1, 1))
+        self.assertEqual(stats.latest_assessment, second)
+        self.assertEqual(stats.avg_score, 21)
+
+    def test_deleting_updates_the_rollup(self):
+        first = create_assessment(self.user, 'low', 2)
+        second = create_assessment(self.user, 'severe', 40)
+        UserAssessmentStats.record_many([first, second])
+        second.delete()
+        stats = self.stats()
+        self.assertEqual(stats.assessment_count, 1)
+        self.assertEqual(stats.total_score_sum, 2)
+        self.assertEqual(stats.severe_count, 0)
+        self.assertEqual(stats.latest_assessment, first)
+
+        first.delete()
+        stats = self.stats()
+        self.assertEqual(stats.assessment_count, 0)
+        self.assertIsNone(stats.latest_assessment)
+
+    def test_rebuild_command(self):
+        other = create_user('bob')
+        create_assessment(self.user, 'mild', 10)
+        latest = create_assessment(self.user, 'moderate', 20)
+        create_assessment(other, 'low', 1)
+        call_command('rebuild_assessment_stats', stdout=StringIO())
+
+        stats = self.stats()
+        self.assertEqual(stats.assessment_count, 2)
+        self.assertEqual(stats.total_score_sum, 30)
+        self.assertEqual((stats.mild_count, stats.moderate_count), (1, 1))
+        self.assertEqual(stats.latest_assessment, latest)
+        self.assertEqual(UserAssessmentStats.objects.get(user=other).assessment_count, 1)
+
+    def test_dashboard_reads_the_rollup(self):
+        UserAssessmentStats.record(create_assessment(self.user, 'mild', 10))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_assessments'], 1)
@@ -0,0 +1,74 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from ..content import subscale_advice
+from ..models import Assessment
+from ..scoring import overall_category
+from .utils import CatalogMixin, create_user, option_id
+
+
+class ScoringEngineTests(CatalogMixin, TestCase):
+    def test_scores_every_answer(self):
+        scores = self.engine().score({
+            f'question_{self.worry.id}': option_id(self.worry, 4),
+            f'question_{self.panic.id}': option_id(self.panic, 2),
+            f'question_{self.pressure.id}': option_id(self.pressure, 0),
+        })
+        self.assertEqual(scores['total_score'], 6)
+        self.assertEqual(scores['anxiety_score'], 6)
+        self.assertEqual(scores['stress_score'], 0)
+        self.assertEqual(scores['anxiety_answered'], 2)
+        self.assertEqual(scores['stress_answered'], 1)
+        self.assertEqual(scores['overall_category'], 'moderate')
+
+    def test_skips_options_of_other_questions(self):
+        scores = self.engine().score({
+            f'question_{self.worry.id}': option_id(self.panic, 4),
+            f'question_{self.pressure.id}': option_id(self.pressure, 4),
+        })
+        self.assertEqual(scores['total_score'], 4)
+        self.assertEqual(scores['anxiety_answered'], 0)
+        self.assertEqual(scores['overall_category'], 'severe')
+
+    def test_no_valid_answers(self):
+        engine = self.engine()
+        self.assertIsNone(engine.score({}))
+        self.assertIsNone(engine.score({f'question_{self.worry.id}': 'not-a-number'}))
+
+    def test_overall_category_thresholds(self):
+        self.assertEqual(overall_category(0, 5), 'low')
+        self.assertEqual(overall_category(5, 5), 'mild')
+        self.assertEqual(overall_category(10, 5), 'moderate')
+        self.assertEqual(overall_category(15, 5), 'severe')
+
+    def test_subscale_advice_uses_answered_questions(self):
+        engine = self.engine()
+        scores = engine.score({f'question_{self.worry.id}': option_id(self.worry, 4)})
+        assessment = Assessment(**scores)
+        advice = subscale_advice(assessment, engine.subscale_questions)
+        self.assertEqual([(item.subscale, item.severity) for item in advice], [('anxiety', 'severe')])
+
+        # Assessments stored before the answered counts fall back to the catalog
+        assessment.anxiety_answered = None
+        advice = subscale_advice(assessment, engine.subscale_questions)
+        self.assertEqual([(item.subscale, item.severity) for item in advice], [('anxiety', 'moderate')])
+
+
+class QuizViewTests(CatalogMixin, TestCase):
+    def test_submission_is_scored_and_saved(self):
+        user = create_user('alice')
+        self.client.force_login(user)
+        response = self.client.post(reverse('quiz'), {
+            f'question_{self.worry.id}': option_id(self.worry, 3),
+            f'question_{self.pressure.id}': option_id(self.pressure, 1),
+        })
+        assessment = Assessment.objects.get(user=user)
+        self.assertRedirects(response, reverse('result', args=[assessment.id]), fetch_redirect_response=False)
+        self.assertEqual(assessment.total_score, 4)
+        self.assertEqual(assessment.anxiety_score, 3)
+        self.assertEqual(assessment.overall_category, 'moderate')
+
+    def test_empty_submission_saves_nothing(self):
+        self.client.force_login(create_user('alice'))
+        self.client.post(reverse('quiz'), {})
+        self.assertFalse(Assessment.objects.exists())
@@ -0,0 +1,91 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import ContactMessage
+from ..search import SearchBackend, SQLiteFTS5SearchBackend, SubstringSearchBackend, search_messages, search_page
+from .utils import create_user
+
+MESSAGES = [
+    ('Ann', 'ann@example.com', 'I would like to book a counseling session'),
+    ('Ben', 'ben@example.com', 'Question about anxiety resources'),
+    ('Cat', 'cat@example.com', 'Can I book an appointment for my son?'),
+    ('Dan', 'dan@example.com', 'Thanks for the sleep tips'),
+]
+
+
+class SearchTestsMixin:
+    backend = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.messages = [ContactMessage.objects.create(name=name, email=email, message=message)
+                        for name, email, message in MESSAGES]
+
+    def names(self, queryset):
+        return sorted(message.name for message in queryset)
+
+    def test_matches_every_term(self):
+        queryset = self.backend.filter(ContactMessage.objects.all(), 'book session')
+        self.assertEqual(self.names(queryset), ['Ann'])
+
+    def test_prefix_and_field_matches(self):
+        self.assertEqual(self.names(self.backend.filter(ContactMessage.objects.all(), 'book')), ['Ann', 'Cat'])
+        self.assertEqual(self.names(self.backend.filter(ContactMessage.objects.all(), 'ben')), ['Ben'])
+
+    def test_matching_ids_newest_first(self):
+        ann, _, cat, _ = self.messages
+        self.assertEqual(self.backend.matching_ids('book'), [cat.id, ann.id])
+        self.assertEqual(self.backend.matching_ids('book', before_id=cat.id), [ann.id])
+        self.assertEqual(self.backend.matching_ids('book', limit=1), [cat.id])
+
+
+class SubstringSearchTests(SearchTestsMixin, TestCase):
+    backend = SubstringSearchBackend()
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 needs SQLite')
+class FTS5SearchTests(SearchTestsMixin, TestCase):
+    backend = SQLiteFTS5SearchBackend()
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.backend.to_match_expression('book OR "x* NEAR('), '"book"* "OR"* "x"* "NEAR"*')
+        self.assertFalse(self.backend.filter(ContactMessage.objects.all(), '*** ()').exists())
+
+    def test_index_follows_updates_and_deletes(self):
+        ann = self.messages[0]
+        ann.message = 'Never mind'
+        ann.save()
+        self.messages[2].delete()
+        self.assertFalse(self.backend.filter(ContactMessage.objects.all(), 'book').exists())
+
+
+class SearchPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(5):
+            ContactMessage.objects.create(name=f'User {number}', email='user@example.com', message='Need help')
+
+    def test_pages(self):
+        first = search_page('help', page_size=3)
+        second = search_page('help', first.next_cursor, page_size=3)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertIsNone(second.next_cursor)
+        self.assertGreater(first.items[-1].id, second.items[0].id)
+
+    def test_blank_query_keeps_the_queryset(self):
+        self.assertEqual(search_messages(ContactMessage.objects.all(), '  ').count(), 5)
+
+    def test_backend_must_implement_filter(self):
+        with self.assertRaises(TypeError):
+            SearchBackend()
+
+    def test_inbox(self):
+        self.client.force_login(create_user('counselor', is_staff=True))
+        response = self.client.get(reverse('admin_contact_messages'), {'q': 'help'})
+        self.assertEqual(len(response.context['messages_list']), 5)
+        response = self.client.get(reverse('admin_contact_messages'), {'q': 'help', 'cursor': 'x'})
+        self.assertRedirects(response, reverse('admin_contact_messages'))
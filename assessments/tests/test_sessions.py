@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+
+class PurgeSessionsTests(TestCase):
+    def create_sessions(self, count, expire_date):
+        Session.objects.bulk_create(
+            Session(session_key=f'{expire_date.timestamp()}-{n}', session_data='', expire_date=expire_date)
+            for n in range(count)
+        )
+
+    def test_deletes_expired_sessions_in_batches(self):
+        now = timezone.now()
+        self.create_sessions(5, now - timedelta(days=1))
+        self.create_sessions(2, now + timedelta(days=1))
+        out = StringIO()
+        call_command('purge_sessions', batch_size=2, stdout=out)
+        self.assertIn('Deleted 5 expired sessions in 3 batches', out.getvalue())
+        self.assertEqual(Session.objects.count(), 2)
+        self.assertFalse(Session.objects.filter(expire_date__lt=now).exists())
+
+    def test_signed_cookie_profile_has_nothing_to_purge(self):
+        self.create_sessions(1, timezone.now() - timedelta(days=1))
+        out = StringIO()
+        with self.settings(SESSION_PROFILE='signed_cookies'):
+            call_command('purge_sessions', stdout=out)
+        self.assertIn('nothing to purge', out.getvalue())
+        self.assertEqual(Session.objects.count(), 1)
+
+
+class SessionProfileTests(SimpleTestCase):
+    def import_settings(self, **environ):
+        return subprocess.run(
+            [sys.executable, '-c', 'import mindcare.settings'],
+            cwd=settings.BASE_DIR, env={**os.environ, **environ}, capture_output=True, text=True,
+        )
+
+    def test_cached_db_needs_a_shared_cache(self):
+        result = self.import_settings(MINDCARE_SESSION_PROFILE='cached_db', MINDCARE_CACHE_PROFILE='locmem')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('ImproperlyConfigured', result.stderr)
+
+        result = self.import_settings(MINDCARE_SESSION_PROFILE='cached_db', MINDCARE_CACHE_PROFILE='file')
+        self.assertEqual(result.returncode, 0, result.stderr)
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Assessment
+from ..trend import build_trend, lttb
+from .utils import create_assessment, create_user
+
+
+class LttbTests(SimpleTestCase):
+    def test_short_series_is_kept(self):
+        self.assertEqual(lttb([0, 1, 2], [5, 6, 7], 10), [0, 1, 2])
+
+    def test_keeps_endpoints_and_spikes(self):
+        xs = list(range(100))
+        ys = [0] * 100
+        ys[37] = 50
+        kept = lttb(xs, ys, 10)
+        self.assertEqual(len(kept), 10)
+        self.assertEqual((kept[0], kept[-1]), (0, 99))
+        self.assertIn(37, kept)
+        self.assertEqual(kept, sorted(kept))
+
+
+class TrendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('alice')
+        now = timezone.now()
+        for day in range(60):
+            assessment = create_assessment(cls.user, total_score=day, anxiety_score=day % 5)
+            Assessment.objects.filter(id=assessment.id).update(created_at=now - timedelta(days=day))
+
+    def test_raw_points_when_few_rows(self):
+        trend = build_trend(Assessment.objects.all(), points=100)
+        self.assertEqual(trend['bucket'], 'none')
+        self.assertEqual(len(trend['labels']), 60)
+        self.assertEqual(trend['series']['total'][-1], 0)
+
+    def test_downsampled_to_the_requested_points(self):
+        trend = build_trend(Assessment.objects.all(), bucket='day', points=10)
+        self.assertEqual(len(trend['labels']), 10)
+        self.assertEqual(trend['labels'], sorted(trend['labels']))
+        self.assertLessEqual(sum(trend['counts']), 60)
+
+    def test_weekly_buckets_average_scores(self):
+        trend = build_trend(Assessment.objects.all(), bucket='week', points=100)
+        self.assertEqual(sum(trend['counts']), 60)
+        self.assertLess(len(trend['labels']), 11)
+
+    def test_api(self):
+        self.client.force_login(self.user)
+        url = reverse('api_trend')
+        response = self.client.get(url, {'points': 5, 'bucket': 'day'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['labels']), 5)
+        self.assertEqual(self.client.get(url, {'points': 1}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2024-13-01'}).status_code, 400)
@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the assessments tests
+"""
+from django.contrib.auth.models import User
+
+from ..catalog import load_questions
+from ..models import Assessment, Question, QuestionOption
+from ..scoring import ScoringEngine
+
+
+def create_question(text, category, weights=(0, 1, 2, 3, 4)):
+    question = Question.objects.create(text=text, category=category)
+    for weight in weights:
+        QuestionOption.objects.create(question=question, text=f'Option {weight}', weight=weight)
+    return question
+
+
+def option_id(question, weight):
+    return question.options.get(weight=weight).id
+
+
+def create_assessment(user, category='low', total_score=0, **scores):
+    return Assessment.objects.create(user=user, total_score=total_score, overall_category=category, **scores)
+
+
+def create_user(username, **extra):
+    return User.objects.create_user(username, password='pass', **extra)
+
+
+class CatalogMixin:
+    """Two anxiety questions and one stress question"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.worry = create_question('How often do you worry?', 'anxiety')
+        cls.panic = create_question('How often do you panic?', 'anxiety')
+        cls.pressure = create_question('How often do you feel under pressure?', 'stress')
+
+    def engine(self):
+        return ScoringEngine(load_questions())
@@ -0,0 +1,145 @@
+"""
+Per-subscale score trends with server-side bucketing and downsampling
+
+Long histories are first averaged into day/week/month buckets in the
+database, then reduced with largest-triangle-three-buckets (LTTB) so the
+payload never exceeds the requested number of points.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+
+SERIES_FIELDS = {
+    'anxiety': 'anxiety_score',
+    'depression': 'depression_score',
+    'stress': 'stress_score',
+    'general': 'general_score',
+    'total': 'total_score',
+}
+
+BUCKETS = {
+    'day': (TruncDay, 1),
+    'week': (TruncWeek, 7),
+    'month': (TruncMonth, 30),
+}
+
+# Buckets may outnumber the target points by this factor; LTTB trims the rest
+BUCKET_OVERSAMPLE = 4
+
+DEFAULT_POINTS = 100
+MIN_POINTS = 3
+MAX_POINTS = 1000
+
+
+def parse_date(value, end_of_day=False):
+    """Parse a YYYY-MM-DD query parameter into an aware datetime, or None"""
+    if not value:
+        return None
+    day = datetime.strptime(value, '%Y-%m-%d').date()
+    moment = datetime.combine(day, time.max if end_of_day else time.min)
+    return timezone.make_aware(moment)
+
+
+def lttb(xs, ys, threshold):
+    """Return the indices of the points kept by largest-triangle-three-buckets"""
+    length = len(xs)
+    if threshold >= length or threshold < 3:
+        return list(range(length))
+
+    kept = [0]
+    bucket_size = (length - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third vertex of the triangle
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, length)
+        span = max(next_end - next_start, 1)
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(length - 1)
+    return kept
+
+
+def _bucket_for(bounds, points):
+    if bounds['count'] <= points:
+        return 'none'
+    span_days = (bounds['last'] - bounds['first']) / timedelta(days=1)
+    for name, (_, days) in BUCKETS.items():
+        if span_days / days <= points * BUCKET_OVERSAMPLE:
+            return name
+    return 'month'
+
+
+def _bounds():
+    return dict(count=Count('id'), first=Min('created_at'), last=Max('created_at'))
+
+
+def choose_bucket(queryset, points):
+    """Pick the finest bucket that keeps the series within reach of the target point count"""
+    return _bucket_for(queryset.aggregate(**_bounds()), points)
+
+
+async def achoose_bucket(queryset, points):
+    return _bucket_for(await queryset.aaggregate(**_bounds()), points)
+
+
+def _rows_query(queryset, bucket):
+    """Values query yielding (created_at or period, count, *series) rows"""
+    if bucket == 'none':
+        return queryset.order_by('created_at', 'id').values_list('created_at', *SERIES_FIELDS.values())
+    trunc, _ = BUCKETS[bucket]
+    averages = {name: Avg(field) for name, field in SERIES_FIELDS.items()}
+    return (queryset.annotate(period=trunc('created_at'))
+            .values('period')
+            .annotate(n=Count('id'), **averages)
+            .order_by('period')
+            .values_list('period', 'n', *SERIES_FIELDS))
+
+
+def _payload(rows, bucket, points):
+    if bucket == 'none':
+        rows = [(created_at, 1, *scores) for created_at, *scores in rows]
+    if len(rows) > points:
+        xs = [row[0].timestamp() for row in rows]
+        ys = [row[-1] for row in rows]
+        rows = [rows[i] for i in lttb(xs, ys, points)]
+
+    series = {name: [] for name in SERIES_FIELDS}
+    for row in rows:
+        for name, value in zip(SERIES_FIELDS, row[2:]):
+            series[name].append(round(value, 2))
+    return {
+        'bucket': bucket,
+        'labels': [row[0].isoformat() for row in rows],
+        'counts': [row[1] for row in rows],
+        'series': series,
+    }
+
+
+def build_trend(queryset, bucket='auto', points=DEFAULT_POINTS):
+    """Return the chart payload for a queryset of assessments"""
+    queryset = queryset.order_by()
+    if bucket == 'auto':
+        bucket = choose_bucket(queryset, points)
+    return _payload(list(_rows_query(queryset, bucket)), bucket, points)
+
+
+async def abuild_trend(queryset, bucket='auto', points=DEFAULT_POINTS):
+    """Async variant of build_trend using the async ORM"""
+    queryset = queryset.order_by()
+    if bucket == 'auto':
+        bucket = await achoose_bucket(queryset, points)
+    return _payload([row async for row in _rows_query(queryset, bucket)], bucket, points)
@@ -1,24 +1,42 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth import views as auth_views
 from . import views
 
+# Under ASGI the read-heavy endpoints use their async variants
+if settings.ASYNC_VIEWS:
+    from . import async_views as read_views
+else:
+    read_views = views
+
 urlpatterns = [
     path('', views.home, name='home'),
     path('signup/', views.signup_view, name='signup'),
     path('login/', views.login_view, name='login'),
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', read_views.dashboard, name='dashboard'),
     path('quiz/', views.quiz_view, name='quiz'),
-    path('result/<int:assessment_id>/', views.result_view, name='result'),
-    path('guidance/', views.guidance_view, name='guidance'),
+    path('result/<int:assessment_id>/', read_views.result_view, name='result'),
+    path('history/', views.history_view, name='history'),
+    path('api/history/', read_views.api_history, name='api_history'),
+    path('api/trend/', read_views.api_trend, name='api_trend'),
+    path('api/assessments/batch/', views.api_ingest_assessments, name='api_ingest_assessments'),
+    path('guidance/', read_views.guidance_view, name='guidance'),
     path('contact/', views.contact_view, name='contact'),
+    path('api/chatbot/', read_views.api_chatbot, name='api_chatbot'),
     # Admin URLs
     path('admin-panel/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin-panel/analytics/', views.admin_analytics, name='admin_analytics'),
+    path('admin-panel/assessments/export/', views.admin_export_assessments, name='admin_export_assessments'),
+    path('admin-panel/assessments/daily/', views.admin_daily_aggregates, name='admin_daily_aggregates'),
+    path('admin-panel/metrics/', views.admin_metrics, name='admin_metrics'),
+    path('admin-panel/metrics/cache/', views.admin_cache_stats, name='admin_cache_stats'),
     path('admin-panel/questions/', views.admin_questions, name='admin_questions'),
     path('admin-panel/questions/add/', views.admin_add_question, name='admin_add_question'),
     path('admin-panel/questions/<int:question_id>/edit/', views.admin_edit_question, name='admin_edit_question'),
     path('admin-panel/questions/<int:question_id>/delete/', views.admin_delete_question, name='admin_delete_question'),
     path('admin-panel/messages/', views.admin_contact_messages, name='admin_contact_messages'),
+    path('admin-panel/messages/queue/', views.admin_contact_queue_stats, name='admin_contact_queue_stats'),
     path('admin-panel/messages/<int:message_id>/', views.admin_view_message, name='admin_view_message'),
     path('admin-panel/messages/<int:message_id>/delete/', views.admin_delete_message, name='admin_delete_message'),
 ]
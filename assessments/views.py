@@ -1,26 +1,56 @@
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth import login, authenticate
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
 from django.contrib import messages
-from django.db.models import Count, Avg
-from django.views.decorators.csrf import csrf_protect
+from django.db import transaction
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_POST
 from datetime import datetime, timedelta
-from .models import Question, QuestionOption, Assessment, ContactMessage
+import csv
+import json
+from .models import Question, Assessment, ContactMessage, UserAssessmentStats
 from .forms import SignUpForm, ContactForm, QuestionForm, QuestionOptionFormSet
-
-
+from . import contact_queue
+from .aggregates import aggregates_watermark, average_rows, daily_aggregates
+from .analytics import AnalyticsUnavailable, cohort_report
+from .cache import cache_anonymous_page, cache_stats
+from .catalog import get_catalog
+from .chatbot import MAX_MESSAGE_LENGTH, get_chatbot
+from .content import HELPLINES, RESOURCES, WELLNESS_TIPS, get_recommendations, subscale_advice
+from .exports import CONTENT_TYPES, EXPORT_FORMATS, aiter_chunks, export_filename, export_queryset, stream_export
+from .hashers import HashingBusy
+from .ingest import IngestError, ingest_batch
+from .instrumentation import render_prometheus, view_metrics
+from .metrics import get_snapshot
+from .pagination import paginate
+from .search import search_page
+from .trend import BUCKETS, DEFAULT_POINTS, MAX_POINTS, MIN_POINTS, build_trend, parse_date
+
+
+@cache_anonymous_page
 def home(request):
     """Landing page"""
     return render(request, 'assessments/home.html')
 
 
+HASHING_BUSY_MESSAGE = 'We are handling a lot of sign-ins right now. Please try again in a moment.'
+
+
 @csrf_protect
 def signup_view(request):
     """User registration"""
     if request.method == 'POST':
         form = SignUpForm(request.POST)
         if form.is_valid():
-            user = form.save()
+            try:
+                user = form.save()
+            except HashingBusy:
+                messages.error(request, HASHING_BUSY_MESSAGE)
+                return render(request, 'assessments/signup.html', {'form': form}, status=503)
             username = form.cleaned_data.get('username')
             messages.success(request, f'Account created for {username}! You can now log in.')
             return redirect('login')
@@ -35,7 +65,11 @@ def login_view(request):
     if request.method == 'POST':
         username = request.POST['username']
         password = request.POST['password']
-        user = authenticate(request, username=username, password=password)
+        try:
+            user = authenticate(request, username=username, password=password)
+        except HashingBusy:
+            messages.error(request, HASHING_BUSY_MESSAGE)
+            return render(request, 'assessments/login.html', status=503)
         if user is not None:
             login(request, user)
             return redirect('dashboard')
@@ -47,93 +81,165 @@ def login_view(request):
 @login_required
 def dashboard(request):
     """User dashboard with assessment history"""
-    user_assessments = Assessment.objects.filter(user=request.user)[:10]
+    history = paginate(Assessment.objects.filter(user=request.user), page_size=10)
     
-    # Calculate statistics
-    total_assessments = user_assessments.count()
-    if total_assessments > 0:
-        avg_score = user_assessments.aggregate(Avg('total_score'))['total_score__avg']
-        latest_assessment = user_assessments.first()
-    else:
-        avg_score = 0
-        latest_assessment = None
-    
-    # Get category distribution for chart
-    category_counts = user_assessments.values('overall_category').annotate(count=Count('id'))
+    # Statistics come from the per-user rollup maintained by quiz_view
+    stats = (UserAssessmentStats.objects
+             .select_related('latest_assessment')
+             .filter(user=request.user)
+             .first())
+    return render(request, 'assessments/dashboard.html', dashboard_context(request.user, history, stats))
+
+
+def dashboard_context(user, history, stats):
+    """Template context for the dashboard from a history page and the user's rollup"""
+    if stats is None:
+        stats = UserAssessmentStats(user=user)
+    return {
+        'assessments': history.items,
+        'history_cursor': history.next_cursor,
+        'total_assessments': stats.assessment_count,
+        'avg_score': round(stats.avg_score, 1),
+        'latest_assessment': stats.latest_assessment,
+        'category_counts': stats.category_counts,
+    }
+
+
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE_SIZE = 100
+
+
+def assessment_to_dict(assessment):
+    """JSON-serializable representation of an assessment"""
+    return {
+        'id': assessment.id,
+        'created_at': assessment.created_at.isoformat(),
+        'total_score': assessment.total_score,
+        'anxiety_score': assessment.anxiety_score,
+        'depression_score': assessment.depression_score,
+        'stress_score': assessment.stress_score,
+        'general_score': assessment.general_score,
+        'overall_category': assessment.overall_category,
+        'url': reverse('result', args=[assessment.id]),
+    }
+
+
+@login_required
+def history_view(request):
+    """Full assessment history, paginated by keyset cursor"""
+    cursor = request.GET.get('cursor')
+    user_assessments = Assessment.objects.filter(user=request.user)
+    try:
+        page = paginate(user_assessments, cursor, page_size=HISTORY_PAGE_SIZE)
+    except ValueError:
+        messages.error(request, 'That history page is no longer available.')
+        return redirect('history')
     
     context = {
-        'assessments': user_assessments,
-        'total_assessments': total_assessments,
-        'avg_score': round(avg_score, 1) if avg_score else 0,
-        'latest_assessment': latest_assessment,
-        'category_counts': list(category_counts),
+        'page': page,
+        'is_first_page': not cursor,
+    }
+    return render(request, 'assessments/history.html', context)
+
+
+def history_limit(request):
+    """The api_history page size; raises ValueError if it is not a positive integer"""
+    limit = min(int(request.GET.get('limit', HISTORY_PAGE_SIZE)), HISTORY_MAX_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError(limit)
+    return limit
+
+
+def history_payload(page):
+    return {
+        'results': [assessment_to_dict(assessment) for assessment in page],
+        'next_cursor': page.next_cursor,
     }
+
+
+@login_required
+def api_history(request):
+    """JSON assessment history, paginated by keyset cursor"""
+    try:
+        page = paginate(Assessment.objects.filter(user=request.user),
+                        request.GET.get('cursor'), page_size=history_limit(request))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor or limit.'}, status=400)
     
-    return render(request, 'assessments/dashboard.html', context)
+    return JsonResponse(history_payload(page))
+
+
+def trend_query(request):
+    """
+    Validate the api_trend parameters.
+
+    Returns (queryset, bucket, points); raises ValueError with a message for the client.
+    """
+    bucket = request.GET.get('bucket', 'auto')
+    try:
+        start = parse_date(request.GET.get('start'))
+        end = parse_date(request.GET.get('end'), end_of_day=True)
+        points = int(request.GET.get('points', DEFAULT_POINTS))
+    except ValueError:
+        raise ValueError('Dates must be YYYY-MM-DD and points an integer.')
+    if bucket not in ('auto', 'none', *BUCKETS) or not MIN_POINTS <= points <= MAX_POINTS:
+        raise ValueError('Invalid bucket or points.')
+    
+    user_assessments = Assessment.objects.filter(user=request.user)
+    if start:
+        user_assessments = user_assessments.filter(created_at__gte=start)
+    if end:
+        user_assessments = user_assessments.filter(created_at__lte=end)
+    return user_assessments, bucket, points
+
+
+@login_required
+def api_trend(request):
+    """JSON per-subscale score trend for the dashboard chart"""
+    try:
+        user_assessments, bucket, points = trend_query(request)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    
+    return JsonResponse(build_trend(user_assessments, bucket, points))
+
+
+@login_required
+@csrf_protect
+@require_POST
+def api_ingest_assessments(request):
+    """Score and store a JSON batch of assessments from an offline client"""
+    try:
+        entries = json.loads(request.body)['assessments']
+    except (KeyError, TypeError, ValueError):
+        return JsonResponse({'error': 'Expected a JSON object with an "assessments" list.'}, status=400)
+    
+    try:
+        results = ingest_batch(request.user, entries, get_catalog().engine)
+    except IngestError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    
+    summary = {status: 0 for status in ('created', 'duplicate', 'invalid')}
+    for result in results:
+        summary[result['status']] += 1
+    return JsonResponse({**summary, 'results': results})
 
 
 @login_required
 @csrf_protect
 def quiz_view(request):
     """Mental health assessment quiz"""
-    questions = Question.objects.prefetch_related('options').all()
+    catalog = get_catalog()
     
     if request.method == 'POST':
-        # Calculate scores
-        total_score = 0
-        anxiety_score = 0
-        depression_score = 0
-        stress_score = 0
-        general_score = 0
-        
-        answered_questions = 0
+        # Score the whole submission against the compiled catalog
+        scores = catalog.engine.score(request.POST)
         
-        for question in questions:
-            answer_id = request.POST.get(f'question_{question.id}')
-            if answer_id:
-                try:
-                    option = QuestionOption.objects.get(id=answer_id)
-                    weight = option.weight
-                    total_score += weight
-                    
-                    # Add to category-specific scores
-                    if question.category == 'anxiety':
-                        anxiety_score += weight
-                    elif question.category == 'depression':
-                        depression_score += weight
-                    elif question.category == 'stress':
-                        stress_score += weight
-                    else:
-                        general_score += weight
-                    
-                    answered_questions += 1
-                except QuestionOption.DoesNotExist:
-                    pass
-        
-        if answered_questions > 0:
-            # Determine overall category
-            max_possible = answered_questions * 4
-            percentage = (total_score / max_possible) * 100
-            
-            if percentage < 25:
-                category = 'low'
-            elif percentage < 50:
-                category = 'mild'
-            elif percentage < 75:
-                category = 'moderate'
-            else:
-                category = 'severe'
-            
-            # Save assessment
-            assessment = Assessment.objects.create(
-                user=request.user,
-                total_score=total_score,
-                anxiety_score=anxiety_score,
-                depression_score=depression_score,
-                stress_score=stress_score,
-                general_score=general_score,
-                overall_category=category
-            )
+        if scores is not None:
+            # Save assessment and fold it into the user's rollup
+            with transaction.atomic():
+                assessment = Assessment.objects.create(user=request.user, **scores)
+                UserAssessmentStats.record(assessment)
             
             messages.success(request, 'Assessment completed successfully!')
             return redirect('result', assessment_id=assessment.id)
@@ -141,7 +247,7 @@ def quiz_view(request):
             messages.error(request, 'Please answer at least one question.')
     
     context = {
-        'questions': questions,
+        'questions_html': catalog.questions_html,
     }
     return render(request, 'assessments/quiz.html', context)
 
@@ -151,127 +257,60 @@ def result_view(request, assessment_id):
     """Display assessment result"""
     try:
         assessment = Assessment.objects.get(id=assessment_id, user=request.user)
-        
-        # Get recommendations based on category
-        recommendations = get_recommendations(assessment.overall_category)
-        
-        context = {
-            'assessment': assessment,
-            'recommendations': recommendations,
-        }
-        return render(request, 'assessments/result.html', context)
+        return render(request, 'assessments/result.html', result_context(assessment, get_catalog()))
     except Assessment.DoesNotExist:
         messages.error(request, 'Assessment not found.')
         return redirect('dashboard')
 
 
-def get_recommendations(category):
-    """Get personalized recommendations based on assessment category"""
-    recommendations = {
-        'low': [
-            "You're doing great! Continue maintaining healthy habits.",
-            "Regular exercise and good sleep are helping you stay balanced.",
-            "Keep engaging in activities you enjoy.",
-            "Consider helping others - it can boost your own well-being."
-        ],
-        'mild': [
-            "Take some time for self-care activities.",
-            "Practice mindfulness or meditation for 10 minutes daily.",
-            "Maintain a regular sleep schedule.",
-            "Stay connected with friends and family.",
-            "Consider talking to a counselor or therapist."
-        ],
-        'moderate': [
-            "It's important to prioritize your mental health.",
-            "Seek support from a mental health professional.",
-            "Practice stress-reduction techniques like deep breathing.",
-            "Engage in regular physical activity.",
-            "Consider joining a support group.",
-            "Remember: seeking help is a sign of strength, not weakness."
-        ],
-        'severe': [
-            "Your well-being is our priority. Please seek professional help immediately.",
-            "Contact a mental health professional or crisis helpline.",
-            "Speak with your doctor about your concerns.",
-            "Reach out to trusted friends or family members.",
-            "Remember: you are not alone, and help is available.",
-            "In crisis? Call 988 (Suicide & Crisis Lifeline) or your local emergency services."
-        ]
+def result_context(assessment, catalog):
+    """Overall recommendations plus focused advice for elevated subscales"""
+    return {
+        'assessment': assessment,
+        'recommendations': get_recommendations(assessment.overall_category),
+        'focus_areas': subscale_advice(assessment, catalog.engine.subscale_questions),
     }
-    return recommendations.get(category, recommendations['mild'])
 
 
+GUIDANCE_CONTEXT = {
+    'helplines': HELPLINES,
+    'resources': RESOURCES,
+    'tips': WELLNESS_TIPS,
+}
+
+
+@cache_anonymous_page
 def guidance_view(request):
     """Guidance and support resources page"""
-    helplines = [
-        {
-            'name': '988 Suicide & Crisis Lifeline',
-            'number': '988',
-            'description': 'Free, confidential support 24/7 for people in distress'
-        },
-        {
-            'name': 'Crisis Text Line',
-            'number': 'Text HOME to 741741',
-            'description': 'Free, 24/7 crisis support via text message'
-        },
-        {
-            'name': 'National Alliance on Mental Illness (NAMI)',
-            'number': '1-800-950-NAMI',
-            'description': 'Information, referrals, and support for mental health conditions'
-        },
-        {
-            'name': 'SAMHSA National Helpline',
-            'number': '1-800-662-4357',
-            'description': 'Free, confidential treatment referral and information service'
-        },
-    ]
-    
-    resources = [
-        {
-            'title': 'BetterHelp',
-            'description': 'Online counseling platform with licensed therapists',
-            'link': 'https://www.betterhelp.com/',
-            'type': 'Online Counseling'
-        },
-        {
-            'title': 'Talkspace',
-            'description': 'Therapy via text, audio, and video messaging',
-            'link': 'https://www.talkspace.com/',
-            'type': 'Online Counseling'
-        },
-        {
-            'title': 'Mindfulness Apps',
-            'description': 'Headspace, Calm, or Insight Timer for meditation',
-            'link': 'https://www.headspace.com/',
-            'type': 'Self-Help'
-        },
-        {
-            'title': 'Psychology Today',
-            'description': 'Find local therapists and mental health professionals',
-            'link': 'https://www.psychologytoday.com/',
-            'type': 'Therapist Directory'
-        },
-    ]
+    return render(request, 'assessments/guidance.html', GUIDANCE_CONTEXT)
+
+
+# The guidance page is served from the anonymous page cache without a CSRF
+# token, and answering a message changes no state
+@csrf_exempt
+@require_POST
+def api_chatbot(request):
+    """Answer a free-text chatbot message"""
+    return chatbot_response(request)
+
+
+def chatbot_response(request):
+    """Validate a chatbot message and return the JSON reply"""
+    if request.content_type == 'application/json':
+        try:
+            message = json.loads(request.body).get('message', '')
+        except (AttributeError, ValueError):
+            return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    else:
+        message = request.POST.get('message', '')
     
-    tips = [
-        "Practice deep breathing exercises for 5-10 minutes daily",
-        "Maintain a regular sleep schedule (7-9 hours per night)",
-        "Stay physically active - even a 15-minute walk helps",
-        "Connect with others - social support is crucial",
-        "Limit alcohol and avoid recreational drugs",
-        "Eat a balanced diet rich in fruits and vegetables",
-        "Take breaks from screens and social media",
-        "Practice gratitude by writing down 3 things you're thankful for each day",
-        "Set realistic goals and celebrate small achievements",
-        "Don't hesitate to seek professional help when needed"
-    ]
+    if not isinstance(message, str) or not message.strip():
+        return JsonResponse({'error': 'A message is required.'}, status=400)
+    if len(message) > MAX_MESSAGE_LENGTH:
+        return JsonResponse({'error': f'Messages are limited to {MAX_MESSAGE_LENGTH} characters.'}, status=400)
     
-    context = {
-        'helplines': helplines,
-        'resources': resources,
-        'tips': tips,
-    }
-    return render(request, 'assessments/guidance.html', context)
+    reply = get_chatbot().reply(message)
+    return JsonResponse({'response': reply.response, 'intent': reply.intent, 'crisis': reply.crisis})
 
 
 @csrf_protect
@@ -280,7 +319,10 @@ def contact_view(request):
     if request.method == 'POST':
         form = ContactForm(request.POST)
         if form.is_valid():
-            form.save()
+            if contact_queue.is_enabled():
+                contact_queue.enqueue(form.cleaned_data)
+            else:
+                form.save()
             messages.success(request, 'Thank you for your message! We will get back to you soon.')
             return redirect('contact')
     else:
@@ -299,27 +341,83 @@ def is_staff_user(user):
 @user_passes_test(is_staff_user)
 def admin_dashboard(request):
     """Admin dashboard"""
-    total_questions = Question.objects.count()
-    total_messages = ContactMessage.objects.count()
-    total_assessments = Assessment.objects.count()
+    snapshot = get_snapshot()
     recent_messages = ContactMessage.objects.all()[:5]
     
     context = {
-        'total_questions': total_questions,
-        'total_messages': total_messages,
-        'total_assessments': total_assessments,
+        'total_questions': snapshot['counts']['questions'],
+        'total_messages': snapshot['counts']['messages'],
+        'total_assessments': snapshot['counts']['assessments'],
         'recent_messages': recent_messages,
+        'metrics': snapshot,
     }
     return render(request, 'assessments/admin/dashboard.html', context)
 
 
+@login_required
+@user_passes_test(is_staff_user)
+def admin_export_assessments(request):
+    """Stream all assessments matching the filters as CSV or NDJSON"""
+    fmt = request.GET.get('format', 'csv')
+    gzip = request.GET.get('gzip') in ('1', 'true')
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('Unknown export format.')
+    try:
+        queryset = export_queryset(request.GET.get('since'), request.GET.get('until'),
+                                   request.GET.get('category'))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    
+    content_type = 'application/gzip' if gzip else CONTENT_TYPES[fmt]
+    chunks = stream_export(queryset, fmt, gzip)
+    if isinstance(request, ASGIRequest):
+        chunks = aiter_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(fmt, gzip)}"'
+    return response
+
+
+@login_required
+@user_passes_test(is_staff_user)
+def admin_daily_aggregates(request):
+    """Per-day, per-category assessment counts and average scores as JSON or CSV"""
+    fmt = request.GET.get('format', 'json')
+    if fmt not in ('json', 'csv'):
+        return HttpResponseBadRequest('Unknown format.')
+    try:
+        since = parse_date(request.GET.get('since'))
+        until = parse_date(request.GET.get('until'))
+        rows = daily_aggregates(since and since.date(), until and until.date(), request.GET.get('category'))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    # Only reads; refresh_daily_aggregates (run from cron) folds in new assessments
+    watermark = aggregates_watermark()
+    as_of = watermark.updated_at.isoformat() if watermark else None
+    
+    names, records = average_rows(rows)
+    if fmt == 'json':
+        return JsonResponse({
+            'as_of': as_of,
+            'watermark': watermark.last_assessment_id if watermark else None,
+            'results': [dict(zip(names, record)) for record in records],
+        })
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="daily_assessments.csv"'
+    if watermark:
+        response['X-Aggregates-As-Of'] = as_of
+        response['X-Aggregates-Watermark'] = watermark.last_assessment_id
+    writer = csv.writer(response)
+    writer.writerow(names)
+    writer.writerows(records)
+    return response
+
+
 @login_required
 @user_passes_test(is_staff_user)
 def admin_questions(request):
     """List all questions"""
-    questions = Question.objects.prefetch_related('options').all()
     context = {
-        'questions': questions,
+        'questions': get_catalog().questions,
     }
     return render(request, 'assessments/admin/questions.html', context)
 
@@ -396,13 +494,75 @@ def admin_delete_question(request, question_id):
     return render(request, 'assessments/admin/delete_question.html', context)
 
 
+@login_required
+@user_passes_test(is_staff_user)
+def admin_contact_queue_stats(request):
+    """Depth and flush latency of the contact form write-behind queue"""
+    return JsonResponse({'enabled': contact_queue.is_enabled(), **contact_queue.queue_stats()})
+
+
+@login_required
+@user_passes_test(is_staff_user)
+def admin_cache_stats(request):
+    """Hit/miss counters of each cache namespace in this process"""
+    return JsonResponse({'profile': settings.CACHE_PROFILE, 'namespaces': cache_stats()})
+
+
+@login_required
+@user_passes_test(is_staff_user)
+def admin_metrics(request):
+    """Request, cache and queue metrics of this process in Prometheus text format"""
+    queue = contact_queue.queue_stats() if contact_queue.is_enabled() else None
+    body = render_prometheus(view_metrics(), cache=cache_stats(), queue=queue)
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@login_required
+@user_passes_test(is_staff_user)
+def admin_analytics(request):
+    """Score distributions, signup-month cohorts and category transitions"""
+    filters = {'since': request.GET.get('since', ''), 'until': request.GET.get('until', '')}
+    try:
+        since = parse_date(filters['since'])
+        until = parse_date(filters['until'], end_of_day=True)
+    except ValueError:
+        messages.error(request, 'Dates must be YYYY-MM-DD.')
+        since = until = None
+    
+    try:
+        report = cohort_report(since, until)
+    except AnalyticsUnavailable as exc:
+        if request.GET.get('format') == 'json':
+            return JsonResponse({'error': str(exc)}, status=503)
+        return render(request, 'assessments/admin/analytics.html', {'filters': filters, 'unavailable': str(exc)})
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse(report)
+    return render(request, 'assessments/admin/analytics.html', {'filters': filters, 'report': report})
+
+
+INBOX_PAGE_SIZE = 25
+
+
 @login_required
 @user_passes_test(is_staff_user)
 def admin_contact_messages(request):
-    """View all contact messages"""
-    messages_list = ContactMessage.objects.all()
+    """View contact messages, newest first, with full-text search"""
+    query = request.GET.get('q', '').strip()
+    cursor = request.GET.get('cursor')
+    try:
+        if query:
+            page = search_page(query, cursor, page_size=INBOX_PAGE_SIZE)
+        else:
+            page = paginate(ContactMessage.objects.all(), cursor, page_size=INBOX_PAGE_SIZE)
+    except ValueError:
+        return redirect('admin_contact_messages')
+    
     context = {
-        'messages_list': messages_list,
+        'messages_list': page.items,
+        'page': page,
+        'query': query,
+        'is_first_page': not cursor,
     }
     return render(request, 'assessments/admin/contact_messages.html', context)
 
@@ -0,0 +1,9 @@
+"""
+Benchmarks for MindCare
+
+Each module is runnable from the project root, e.g.
+
+    python -m benchmarks.assessment_indexes --rows 2000000
+
+and works against a throwaway SQLite database, never db.sqlite3.
+"""
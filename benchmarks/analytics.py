@@ -0,0 +1,109 @@
+"""
+Cohort analytics: NumPy columns against per-group ORM queries and Python loops.
+
+Measures the cold column load, an incremental extend after new rows arrive,
+and the full cohort report, then computes the same cohorts and transition
+matrix the pre-NumPy way for comparison.
+
+    python -m benchmarks.analytics --users 20000 --assessments 1000000
+"""
+import argparse
+import json
+import time
+from datetime import timedelta
+
+from benchmarks.utils import cleanup_database, measure, seed_assessments, seed_users, setup_django
+
+
+def spread_signups(user_ids, months):
+    """Give the seeded users signup dates across the last `months` months"""
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    now = timezone.now()
+    for month in range(months):
+        User.objects.filter(id__in=user_ids[month::months]).update(date_joined=now - timedelta(days=30 * month))
+
+
+def orm_report():
+    """Cohort means by per-month queries and transitions by a Python loop"""
+    from django.contrib.auth.models import User
+    from django.db.models import Avg, Count
+    from django.db.models.functions import TruncMonth
+    from assessments.models import Assessment
+
+    months = (User.objects.annotate(month=TruncMonth('date_joined'))
+              .values_list('month', flat=True).distinct())
+    cohorts = {}
+    for month in months:
+        cohorts[month] = (Assessment.objects
+                          .filter(user__date_joined__gte=month,
+                                  user__date_joined__lt=(month + timedelta(days=32)).replace(day=1))
+                          .aggregate(n=Count('id'), total=Avg('total_score'), anxiety=Avg('anxiety_score'),
+                                     depression=Avg('depression_score'), stress=Avg('stress_score'),
+                                     general=Avg('general_score')))
+    transitions = {}
+    previous_user = previous_category = None
+    rows = Assessment.objects.order_by('user_id', 'created_at', 'id').values_list('user_id', 'overall_category')
+    for user_id, category in rows.iterator(chunk_size=10000):
+        if user_id == previous_user:
+            key = (previous_category, category)
+            transitions[key] = transitions.get(key, 0) + 1
+        previous_user, previous_category = user_id, category
+    return cohorts, transitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--assessments', type=int, default=1000000)
+    parser.add_argument('--months', type=int, default=24, help='signup months to spread users over')
+    parser.add_argument('--new', type=int, default=1000, help='rows added before the incremental extend')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--skip-orm', action='store_true', help='skip the slow ORM/Python comparison')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    database = setup_django()
+    try:
+        from django.conf import settings
+        from assessments import analytics
+
+        start = time.perf_counter()
+        user_ids = seed_users(args.users)
+        spread_signups(user_ids, args.months)
+        seed_assessments(user_ids, args.assessments)
+        print(f'Seeded {args.users} users and {args.assessments} assessments in {time.perf_counter() - start:.1f}s')
+
+        settings.ANALYTICS_REFRESH_SECONDS = 0
+        results = {}
+        start = time.perf_counter()
+        analytics.get_columns()
+        results['cold_load_ms'] = (time.perf_counter() - start) * 1000
+
+        seed_assessments(user_ids, args.new, days=1, seed=1)
+        start = time.perf_counter()
+        columns = analytics.get_columns()
+        results['incremental_extend_ms'] = (time.perf_counter() - start) * 1000
+        assert len(columns) == args.assessments + args.new
+
+        settings.ANALYTICS_REFRESH_SECONDS = 3600
+        results['numpy_report'] = measure(analytics.cohort_report, repeat=args.repeat)
+        if not args.skip_orm:
+            results['orm_report'] = measure(orm_report, repeat=1, warmup=0)
+
+        print(f'cold load           {results["cold_load_ms"]:10.1f} ms')
+        print(f'extend (+{args.new} rows) {results["incremental_extend_ms"]:8.1f} ms')
+        for name in ('numpy_report', 'orm_report'):
+            if name in results:
+                print(f'{name:18s}  p50 {results[name]["p50_ms"]:10.1f} ms  max {results[name]["max_ms"]:10.1f} ms')
+
+        if args.json:
+            with open(args.json, 'w') as fh:
+                json.dump(results, fh, indent=2)
+    finally:
+        cleanup_database(database)
+
+
+if __name__ == '__main__':
+    main()
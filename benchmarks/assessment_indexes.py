@@ -0,0 +1,104 @@
+"""
+Query plans and timings for the Assessment access paths, with and without
+the composite indexes added in migration 0003.
+
+    python -m benchmarks.assessment_indexes --rows 2000000 --users 50000
+"""
+import argparse
+import json
+import time
+
+from benchmarks.utils import cleanup_database, measure, seed_assessments, seed_users, setup_django
+
+
+def access_paths(user_id, assessment_id):
+    """The queries issued by the dashboard, result page and admin listing"""
+    from datetime import timedelta
+    from django.db.models import Count
+    from django.utils import timezone
+    from assessments.models import Assessment
+
+    since = timezone.now() - timedelta(days=30)
+    return {
+        'dashboard history': lambda: Assessment.objects.filter(user_id=user_id)[:10],
+        'result by (id, user)': lambda: Assessment.objects.filter(id=assessment_id, user_id=user_id),
+        'admin list by category': lambda: Assessment.objects.filter(overall_category='severe')[:100],
+        'admin list by category and date': lambda: Assessment.objects.filter(
+            overall_category='severe', created_at__gte=since)[:100],
+        'admin list, newest first': lambda: Assessment.objects.all()[:100],
+        'category counts last 30 days': lambda: Assessment.objects.filter(
+            created_at__gte=since).order_by().values('overall_category').annotate(count=Count('id')),
+    }
+
+
+def set_indexes(enabled):
+    from django.db import connection
+    from assessments.models import Assessment
+
+    with connection.schema_editor() as editor:
+        for index in Assessment._meta.indexes:
+            if enabled:
+                editor.add_index(Assessment, index)
+            else:
+                editor.remove_index(Assessment, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def run_phase(name, paths, repeat):
+    print(f'\n== {name} ==')
+    results = {}
+    for label, build in paths.items():
+        plan = build().explain()
+        timing = measure(lambda: list(build()), repeat=repeat)
+        results[label] = {'plan': plan, **timing}
+        print(f'{label:34s} p50 {timing["p50_ms"]:9.3f} ms  p95 {timing["p95_ms"]:9.3f} ms')
+        for line in plan.splitlines():
+            print(f'    {line}')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='synthetic assessments to create')
+    parser.add_argument('--users', type=int, default=20000, help='synthetic users to create')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per query')
+    parser.add_argument('--database', help='SQLite file to use (default: a temporary file)')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    database = setup_django(args.database)
+    try:
+        from assessments.models import Assessment
+
+        start = time.perf_counter()
+        user_ids = seed_users(args.users)
+        seed_assessments(user_ids, args.rows)
+        print(f'Seeded {args.rows} assessments for {len(user_ids)} users '
+              f'in {time.perf_counter() - start:.1f}s')
+
+        sample = Assessment.objects.order_by('?').values('id', 'user_id').first()
+        paths = access_paths(sample['user_id'], sample['id'])
+
+        set_indexes(False)
+        results = {'rows': args.rows, 'users': args.users,
+                   'without_indexes': run_phase('without composite indexes', paths, args.repeat)}
+        set_indexes(True)
+        results['with_indexes'] = run_phase('with composite indexes', paths, args.repeat)
+
+        print('\n== speedup (p50) ==')
+        for label in paths:
+            before = results['without_indexes'][label]['p50_ms']
+            after = results['with_indexes'][label]['p50_ms']
+            print(f'{label:34s} {before / after if after else float("inf"):8.1f}x')
+
+        if args.json:
+            with open(args.json, 'w') as fh:
+                json.dump(results, fh, indent=2)
+    finally:
+        if not args.database:
+            cleanup_database(database)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Chatbot reply latency and throughput, in-process and through the view.
+
+    python -m benchmarks.chatbot --queries 20000
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.utils import cleanup_database, setup_django, summarize
+
+
+MESSAGES = [
+    'I feel anxious',
+    'I have been feeling really overwhelmed with work and school lately',
+    'i cant sleep and i am tired all the time',
+    'nobody understands me and I feel so alone',
+    'where can I find a therapist near me',
+    'I keep thinking I would be better off dead',
+    'hello',
+    'what is the weather like tomorrow',
+]
+
+
+def run(reply, messages):
+    samples = []
+    start = time.perf_counter()
+    for message in messages:
+        began = time.perf_counter()
+        reply(message)
+        samples.append((time.perf_counter() - began) * 1000)
+    elapsed = time.perf_counter() - start
+    return {**summarize(samples), 'qps': len(messages) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    database = setup_django(migrate=False)
+    try:
+        from django.conf import settings
+        from django.test import Client
+        from assessments.chatbot import get_chatbot
+
+        settings.ALLOWED_HOSTS = ['*']
+        rng = random.Random(0)
+        messages = [rng.choice(MESSAGES) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        chatbot = get_chatbot()
+        print(f'Built intent index in {(time.perf_counter() - start) * 1000:.2f} ms')
+
+        client = Client()
+        post = lambda message: client.post('/api/chatbot/', json.dumps({'message': message}),
+                                           content_type='application/json')
+        results = {
+            'engine': run(chatbot.reply, messages),
+            'view': run(post, messages[:max(1, args.queries // 10)]),
+        }
+        for name, timing in results.items():
+            print(f'{name:7s} p50 {timing["p50_ms"]:.3f} ms  p99 {timing["p99_ms"]:.3f} ms  '
+                  f'{timing["qps"]:,.0f} queries/s')
+
+        if args.json:
+            with open(args.json, 'w') as fh:
+                json.dump(results, fh, indent=2)
+    finally:
+        cleanup_database(database)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Contact message search latency: FTS5 index vs. substring scans.
+
+    python -m benchmarks.contact_search --messages 1000000
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.utils import cleanup_database, measure, setup_django
+
+
+WORDS = ('anxious sleep work stress family therapy appointment counselor help exam '
+         'panic lonely tired insurance session schedule weekend support group '
+         'medication doctor worried future relationship school').split()
+QUERIES = ['insurance', 'panic attack', 'counsel', 'rarewordzz', 'john.doe']
+
+
+def seed_messages(count, batch_size=5000, seed=0):
+    from django.db import transaction
+    from assessments.models import ContactMessage
+
+    rng = random.Random(seed)
+    with transaction.atomic():
+        for start in range(0, count, batch_size):
+            ContactMessage.objects.bulk_create(
+                ContactMessage(
+                    name=f'Person {i}',
+                    email=f'person{i}@example.com',
+                    message=' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 40))),
+                )
+                for i in range(start, min(start + batch_size, count))
+            )
+        ContactMessage.objects.create(name='John Doe', email='john.doe@example.com',
+                                      message='Rarewordzz question about a panic attack')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--database', help='SQLite file to use (default: a temporary file)')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    database = setup_django(args.database)
+    try:
+        from assessments.models import ContactMessage
+        from assessments.search import SQLiteFTS5SearchBackend, SubstringSearchBackend
+
+        start = time.perf_counter()
+        seed_messages(args.messages)
+        print(f'Seeded {args.messages} messages in {time.perf_counter() - start:.1f}s')
+
+        results = {}
+        for name, backend in (('fts5', SQLiteFTS5SearchBackend()), ('substring', SubstringSearchBackend())):
+            print(f'\n== {name} ==')
+            for query in QUERIES:
+                first_page = lambda: list(ContactMessage.objects.filter(
+                    id__in=backend.matching_ids(query, limit=25)))
+                timing = measure(first_page, repeat=args.repeat, warmup=1)
+                hits = len(first_page())
+                results.setdefault(name, {})[query] = timing
+                print(f'{query!r:14s} {hits:3d} hits on first page  p50 {timing["p50_ms"]:9.2f} ms  '
+                      f'p95 {timing["p95_ms"]:9.2f} ms')
+
+        if args.json:
+            with open(args.json, 'w') as fh:
+                json.dump({'messages': args.messages, **results}, fh, indent=2)
+    finally:
+        if not args.database:
+            cleanup_database(database)
+
+
+if __name__ == '__main__':
+    main()
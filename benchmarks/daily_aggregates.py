@@ -0,0 +1,78 @@
+"""
+Daily aggregate refresh cost and time-series queries against a full scan.
+
+Measures the first (full) build, an incremental refresh after new rows
+arrive, and the question "severe results per day over the last quarter"
+answered from Assessment and from DailyAssessmentAggregate.
+
+    python -m benchmarks.daily_aggregates --users 20000 --assessments 1000000
+"""
+import argparse
+import json
+import time
+from datetime import timedelta
+
+from benchmarks.utils import cleanup_database, measure, seed_assessments, seed_users, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--assessments', type=int, default=1000000)
+    parser.add_argument('--new', type=int, default=1000, help='rows added before the incremental refresh')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    database = setup_django()
+    try:
+        from django.db.models import Count, Sum
+        from django.db.models.functions import TruncDate
+        from django.utils import timezone
+        from assessments.aggregates import daily_aggregates, refresh_daily_aggregates
+        from assessments.metrics import compute_snapshot
+        from assessments.models import Assessment
+
+        start = time.perf_counter()
+        user_ids = seed_users(args.users)
+        seed_assessments(user_ids, args.assessments)
+        print(f'Seeded {args.users} users and {args.assessments} assessments in {time.perf_counter() - start:.1f}s')
+
+        results = {'full_build': refresh_daily_aggregates()}
+        seed_assessments(user_ids, args.new, days=2, seed=1)
+        results['incremental'] = refresh_daily_aggregates()
+
+        since = timezone.localdate() - timedelta(days=90)
+
+        def from_assessments():
+            return list(Assessment.objects
+                        .filter(overall_category='severe', created_at__gte=timezone.now() - timedelta(days=90))
+                        .annotate(day=TruncDate('created_at'))
+                        .order_by()
+                        .values('day')
+                        .annotate(count=Count('id')))
+
+        def from_aggregates():
+            return list(daily_aggregates(since=since, category='severe')
+                        .values('day')
+                        .annotate(count=Sum('assessment_count')))
+
+        results['quarter_scan'] = measure(from_assessments, repeat=args.repeat)
+        results['quarter_aggregates'] = measure(from_aggregates, repeat=args.repeat)
+        results['admin_snapshot'] = measure(compute_snapshot, repeat=args.repeat)
+
+        for name in ('full_build', 'incremental'):
+            result = results[name]
+            print(f'{name:20s} {result["seconds"] * 1000:9.1f} ms  ({result["days"]} days, {result["rows"]} rows)')
+        for name in ('quarter_scan', 'quarter_aggregates', 'admin_snapshot'):
+            print(f'{name:20s} p50 {results[name]["p50_ms"]:9.2f} ms  p99 {results[name]["p99_ms"]:9.2f} ms')
+
+        if args.json:
+            with open(args.json, 'w') as fh:
+                json.dump(results, fh, indent=2)
+    finally:
+        cleanup_database(database)
+
+
+if __name__ == '__main__':
+    main()
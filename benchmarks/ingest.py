@@ -0,0 +1,91 @@
+"""
+Backlog flush time for kiosk clients: one quiz form POST per assessment
+against the batch ingestion API, including a full retry of every batch.
+
+    python -m benchmarks.ingest --assessments 5000 --batch-size 500
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.utils import cleanup_database, seed_questions, seed_users, setup_django
+
+
+def answer_sets(count, seed=0):
+    """Random {question id: option id} answer sets over the current catalog"""
+    from assessments.catalog import load_questions
+
+    rng = random.Random(seed)
+    choices = [(question.id, [option.id for option in question.options.all()]) for question in load_questions()]
+    return [{str(question_id): rng.choice(options) for question_id, options in choices} for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assessments', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--questions', type=int, default=20)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    database = setup_django()
+    try:
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        from django.test import Client
+        from assessments.models import Assessment
+
+        settings.ALLOWED_HOSTS = ['*']
+        settings.ASSESSMENT_INGEST_MAX_BATCH = max(settings.ASSESSMENT_INGEST_MAX_BATCH, args.batch_size)
+        seed_questions(args.questions)
+        user_ids = seed_users(2)
+        sets = answer_sets(args.assessments)
+
+        form_client = Client()
+        form_client.force_login(User.objects.get(id=user_ids[0]))
+        start = time.perf_counter()
+        for answers in sets:
+            form_client.post('/quiz/', {f'question_{key}': value for key, value in answers.items()})
+        form_seconds = time.perf_counter() - start
+
+        batch_client = Client()
+        batch_client.force_login(User.objects.get(id=user_ids[1]))
+        entries = [{'idempotency_key': f'kiosk-1:{i}', 'answers': answers} for i, answers in enumerate(sets)]
+        batches = [entries[i:i + args.batch_size] for i in range(0, len(entries), args.batch_size)]
+
+        def flush():
+            counts = {'created': 0, 'duplicate': 0, 'invalid': 0}
+            for batch in batches:
+                response = batch_client.post('/api/assessments/batch/', json.dumps({'assessments': batch}),
+                                             content_type='application/json')
+                for status in counts:
+                    counts[status] += response.json()[status]
+            return counts
+
+        start = time.perf_counter()
+        first = flush()
+        batch_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        retry = flush()
+        retry_seconds = time.perf_counter() - start
+
+        assert Assessment.objects.filter(user_id=user_ids[1]).count() == args.assessments
+
+        results = {
+            'form_posts': {'seconds': form_seconds, 'per_s': args.assessments / form_seconds},
+            'batch': {'seconds': batch_seconds, 'per_s': args.assessments / batch_seconds, **first},
+            'batch_retry': {'seconds': retry_seconds, 'per_s': args.assessments / retry_seconds, **retry},
+        }
+        for name, result in results.items():
+            print(f'{name:12s} {result["seconds"]:7.2f}s  {result["per_s"]:9,.0f} assessments/s')
+
+        if args.json:
+            with open(args.json, 'w') as fh:
+                json.dump(results, fh, indent=2)
+    finally:
+        cleanup_database(database)
+
+
+if __name__ == '__main__':
+    main()
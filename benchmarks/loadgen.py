@@ -0,0 +1,186 @@
+"""
+Minimal closed-loop HTTP/1.1 load generator.
+
+Each of --concurrency workers keeps one keep-alive connection open and
+sends its next request as soon as the previous response has been read, for
+--duration seconds; --processes splits the workers across client processes.
+Reports throughput, latency percentiles and status codes.
+
+    python -m benchmarks.loadgen http://127.0.0.1:8000/guidance/ --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from benchmarks.utils import summarize
+
+
+class LoadResult:
+    def __init__(self):
+        self.samples = []
+        self.statuses = Counter()
+        self.errors = 0
+        self.bytes = 0
+
+
+async def _read_response(reader):
+    """Read one response and return (status, body length, lower-cased headers)"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if status in (204, 304) or 100 <= status < 200:
+        return status, 0, headers
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        length = 0
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            length += size
+            if size == 0:
+                return status, length, headers
+    if 'content-length' in headers:
+        length = int(headers['content-length'])
+        await reader.readexactly(length)
+        return status, length, headers
+    body = await reader.read()
+    headers['connection'] = 'close'
+    return status, len(body), headers
+
+
+async def _worker(host, port, request, deadline, result):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, length, headers = await _read_response(reader)
+            result.samples.append((time.perf_counter() - start) * 1000)
+            result.statuses[status] += 1
+            result.bytes += length
+            if headers.get('connection', '').lower() == 'close':
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            result.errors += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.01)
+    if writer is not None:
+        writer.close()
+
+
+def build_request(url, cookies=None, headers=None):
+    parts = urlsplit(url)
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+    lines = [f'GET {target} HTTP/1.1', f'Host: {parts.netloc}', 'Connection: keep-alive']
+    if cookies:
+        lines.append('Cookie: ' + '; '.join(f'{name}={value}' for name, value in cookies.items()))
+    for name, value in (headers or {}).items():
+        lines.append(f'{name}: {value}')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+async def _drive(url, concurrency, duration, cookies, headers):
+    parts = urlsplit(url)
+    request = build_request(url, cookies, headers)
+    result = LoadResult()
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        _worker(parts.hostname, parts.port or 80, request, deadline, result)
+        for _ in range(concurrency)
+    ))
+    return result
+
+
+def _drive_in_process(url, concurrency, duration, cookies, headers):
+    started = time.perf_counter()
+    result = asyncio.run(_drive(url, concurrency, duration, cookies, headers))
+    return result.samples, result.statuses, result.errors, result.bytes, time.perf_counter() - started
+
+
+def run_load(url, concurrency=32, duration=10.0, cookies=None, headers=None, processes=1):
+    """
+    Drive `url` with `concurrency` keep-alive connections for `duration` seconds.
+
+    With processes > 1 the connections are split across that many client
+    processes, so the load generator itself is not limited to one core.
+    """
+    if processes <= 1:
+        parts = [_drive_in_process(url, concurrency, duration, cookies, headers)]
+    else:
+        shares = [concurrency // processes + (i < concurrency % processes) for i in range(processes)]
+        with multiprocessing.get_context('spawn').Pool(processes) as pool:
+            parts = pool.starmap(_drive_in_process, [
+                (url, share, duration, cookies, headers) for share in shares if share
+            ])
+    # Client processes start at slightly different times; time the slowest one
+    elapsed = max(part[-1] for part in parts)
+
+    result = LoadResult()
+    for samples, statuses, errors, length, _ in parts:
+        result.samples.extend(samples)
+        result.statuses.update(statuses)
+        result.errors += errors
+        result.bytes += length
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'processes': max(processes, 1),
+        'duration_s': round(elapsed, 3),
+        'requests': len(result.samples),
+        'rps': len(result.samples) / elapsed,
+        'errors': result.errors,
+        'statuses': dict(result.statuses),
+        'bytes': result.bytes,
+        **summarize(result.samples),
+    }
+
+
+def format_result(result):
+    return (f'{result["concurrency"]:5d} conns  {result["rps"]:9.1f} req/s  '
+            f'p50 {result["p50_ms"]:8.2f} ms  p99 {result["p99_ms"]:8.2f} ms  '
+            f'max {result["max_ms"]:8.2f} ms  errors {result["errors"]}  {result["statuses"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('url')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[32])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--processes', type=int, default=1, help='client processes to split connections across')
+    parser.add_argument('--cookie', action='append', default=[], help='name=value, may be repeated')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    cookies = dict(cookie.split('=', 1) for cookie in args.cookie)
+    results = []
+    for concurrency in args.concurrency:
+        result = run_load(args.url, concurrency, args.duration, cookies, processes=args.processes)
+        print(format_result(result))
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
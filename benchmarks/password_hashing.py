@@ -0,0 +1,140 @@
+"""
+Login throughput per password hashing profile.
+
+For each profile a fresh process authenticates a user through Django's
+ModelBackend, first on a single thread (logins per second per core) and
+then from --threads threads at once, where the bounded hashing pool
+(PASSWORD_HASHING_CONCURRENCY) keeps latency from growing without limit.
+
+    python -m benchmarks.password_hashing --logins 50 --threads 16
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+from benchmarks.utils import cleanup_database, setup_django, summarize
+
+PROFILES = ('default', 'scrypt', 'argon2')
+PASSWORD = 'bench-Passw0rd!'
+
+
+def run_profile(profile, database, logins, threads, concurrency, results):
+    os.environ['MINDCARE_PASSWORD_PROFILE'] = profile
+    if concurrency:
+        os.environ['MINDCARE_PASSWORD_HASHING_CONCURRENCY'] = str(concurrency)
+    setup_django(database, migrate=False)
+
+    from django.conf import settings
+    from django.contrib.auth import authenticate
+    from django.contrib.auth.models import User
+    from assessments.hashers import HashingBusy
+
+    try:
+        user = User.objects.create(username=f'login-{profile}')
+        user.set_password(PASSWORD)
+        user.save()
+    except ValueError as exc:  # e.g. argon2-cffi is not installed
+        results.put({'profile': profile, 'skipped': str(exc)})
+        return
+
+    def login():
+        if authenticate(username=user.username, password=PASSWORD) is None:
+            raise RuntimeError('login failed')
+
+    login()
+    single = []
+    for _ in range(logins):
+        start = time.perf_counter()
+        login()
+        single.append((time.perf_counter() - start) * 1000)
+
+    latencies, busy = [], [0]
+    lock = threading.Lock()
+
+    def worker():
+        from django.db import connection
+        for _ in range(logins):
+            start = time.perf_counter()
+            try:
+                login()
+            except HashingBusy:
+                with lock:
+                    busy[0] += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+        connection.close()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    results.put({
+        'profile': profile,
+        'hash': User.objects.get(id=user.id).password.split('$', 1)[0],
+        'logins_per_s_per_core': 1000 / (sum(single) / len(single)),
+        'single_thread': summarize(single),
+        'threads': threads,
+        'hashing_concurrency': settings.PASSWORD_HASHING_CONCURRENCY,
+        'threaded_logins_per_s': len(latencies) / elapsed,
+        'threaded_busy': busy[0],
+        'threaded': summarize(latencies),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--logins', type=int, default=50, help='logins per thread')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--concurrency', type=int, help='PASSWORD_HASHING_CONCURRENCY (default: CPU count)')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context('spawn')
+    database = ctx.Manager().dict()
+    prep = ctx.Process(target=_prepare, args=(database,))
+    prep.start()
+    prep.join()
+    name = database['name']
+
+    collected = []
+    try:
+        for profile in args.profiles:
+            results = ctx.Queue()
+            process = ctx.Process(target=run_profile,
+                                  args=(profile, name, args.logins, args.threads, args.concurrency, results))
+            process.start()
+            result = results.get()
+            process.join()
+            collected.append(result)
+            if 'skipped' in result:
+                print(f'{profile:8s} skipped: {result["skipped"]}')
+                continue
+            print(f'{profile:8s} {result["logins_per_s_per_core"]:7.1f} logins/s/core '
+                  f'(p50 {result["single_thread"]["p50_ms"]:.1f} ms)  |  '
+                  f'{result["threads"]} threads, {result["hashing_concurrency"]} slots: '
+                  f'{result["threaded_logins_per_s"]:7.1f} logins/s  '
+                  f'p50 {result["threaded"]["p50_ms"]:.1f} ms  p99 {result["threaded"]["p99_ms"]:.1f} ms  '
+                  f'busy {result["threaded_busy"]}')
+    finally:
+        cleanup_database(name)
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump(collected, fh, indent=2)
+
+
+def _prepare(shared):
+    shared['name'] = setup_django()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+"""
+Full request-path benchmark over the real URL routes.
+
+Seeds a synthetic dataset with bulk_create, then drives every route in
+assessments/urls.py worth measuring (signup, login, quiz GET/POST, result,
+dashboard, history and JSON APIs, guidance, contact, admin pages) through the
+Django test client, recording latency percentiles and queries per request.
+With --http the GET routes are also driven over a real WSGI/ASGI server by
+the multi-process load generator. Results are written as JSON and can be
+compared against an earlier run.
+
+    python -m benchmarks.request_path --users 1000 --assessments 100000 --json before.json
+    python -m benchmarks.request_path --http --server asgi --concurrency 64 --compare before.json
+"""
+import argparse
+import io
+import itertools
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from benchmarks.utils import (
+    cleanup_database, seed_assessments, seed_questions, seed_users, setup_django, summarize,
+)
+
+
+PASSWORD = 'bench-Passw0rd!'
+STAFF_USERNAME = 'bench-staff'
+
+
+def seed(args):
+    """Create the synthetic dataset and return the ids the scenarios need"""
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db.models import Count
+    from assessments.models import Assessment, ContactMessage
+
+    start = time.perf_counter()
+    user_ids = seed_users(args.users, password=PASSWORD)
+    seed_questions(args.questions)
+    seed_assessments(user_ids, args.assessments)
+    ContactMessage.objects.bulk_create(
+        ContactMessage(name=f'Person {i}', email=f'person{i}@example.com',
+                       message=f'Benchmark message {i} about stress and sleep')
+        for i in range(args.messages)
+    )
+    User.objects.create_superuser(STAFF_USERNAME, 'staff@example.com', PASSWORD)
+    call_command('rebuild_assessment_stats', stdout=io.StringIO())
+    print(f'Seeded {args.users} users, {args.questions} questions, {args.assessments} assessments '
+          f'and {args.messages} messages in {time.perf_counter() - start:.1f}s')
+
+    # The user with the longest history is the worst case for per-user pages
+    user_id = (Assessment.objects.values('user_id')
+               .annotate(n=Count('id'))
+               .order_by('-n').values_list('user_id', flat=True).first())
+    return {
+        'user': User.objects.get(id=user_id),
+        'staff': User.objects.get(username=STAFF_USERNAME),
+        'assessment_id': Assessment.objects.filter(user_id=user_id).values_list('id', flat=True).first(),
+        'message_id': ContactMessage.objects.values_list('id', flat=True).first(),
+    }
+
+
+def quiz_answers():
+    """One valid answer per catalog question, as quiz_view expects them"""
+    from assessments.catalog import load_questions
+
+    rng = random.Random(0)
+    return {
+        f'question_{question.id}': str(rng.choice(list(question.options.all())).id)
+        for question in load_questions()
+    }
+
+
+def scenarios(ids):
+    """(name, client role, method, path, data factory) for every measured route"""
+    counter = itertools.count()
+
+    def signup_data():
+        n = next(counter)
+        return {'username': f'signup{n}', 'email': f'signup{n}@example.com',
+                'password1': PASSWORD, 'password2': PASSWORD}
+
+    answers = quiz_answers()
+    return [
+        ('home', 'anonymous', 'get', '/', None),
+        ('guidance', 'anonymous', 'get', '/guidance/', None),
+        ('signup GET', 'anonymous', 'get', '/signup/', None),
+        ('signup POST', 'anonymous', 'post', '/signup/', signup_data),
+        ('login GET', 'anonymous', 'get', '/login/', None),
+        ('login POST', 'anonymous', 'post', '/login/',
+         lambda: {'username': ids['user'].username, 'password': PASSWORD}),
+        ('contact GET', 'anonymous', 'get', '/contact/', None),
+        ('contact POST', 'anonymous', 'post', '/contact/',
+         lambda: {'name': 'Bench', 'email': 'bench@example.com', 'message': 'Benchmark contact message'}),
+        ('chatbot', 'anonymous', 'post', '/api/chatbot/', lambda: {'message': 'I feel anxious about exams'}),
+        ('dashboard', 'user', 'get', '/dashboard/', None),
+        ('quiz GET', 'user', 'get', '/quiz/', None),
+        ('quiz POST', 'user', 'post', '/quiz/', lambda: answers),
+        ('result', 'user', 'get', f'/result/{ids["assessment_id"]}/', None),
+        ('history', 'user', 'get', '/history/', None),
+        ('api_history', 'user', 'get', '/api/history/?limit=20', None),
+        ('api_trend', 'user', 'get', '/api/trend/', None),
+        ('admin dashboard', 'staff', 'get', '/admin-panel/', None),
+        ('admin questions', 'staff', 'get', '/admin-panel/questions/', None),
+        ('admin messages', 'staff', 'get', '/admin-panel/messages/', None),
+        ('admin message search', 'staff', 'get', '/admin-panel/messages/?q=sleep', None),
+        ('admin message', 'staff', 'get', f'/admin-panel/messages/{ids["message_id"]}/', None),
+    ]
+
+
+def run_test_client(ids, repeat, warmup):
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    clients = {'anonymous': Client(), 'user': Client(), 'staff': Client()}
+    clients['user'].force_login(ids['user'])
+    clients['staff'].force_login(ids['staff'])
+
+    results = {}
+    for name, role, method, path, data in scenarios(ids):
+        client = clients[role]
+
+        def request():
+            kwargs = {'data': data()} if data else {}
+            response = getattr(client, method)(path, **kwargs)
+            # The anonymous client must stay anonymous for the next scenario
+            if role == 'anonymous':
+                client.cookies.clear()
+            return response
+
+        for _ in range(warmup):
+            request()
+        samples, queries, statuses = [], [], set()
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = request()
+                samples.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            statuses.add(response.status_code)
+
+        results[name] = {
+            **summarize(samples),
+            'rps': 1000 / (sum(samples) / len(samples)),
+            'queries_per_request': sum(queries) / len(queries),
+            'statuses': sorted(statuses),
+        }
+        print(f'{name:22s} p50 {results[name]["p50_ms"]:8.2f} ms  p95 {results[name]["p95_ms"]:8.2f} ms  '
+              f'p99 {results[name]["p99_ms"]:8.2f} ms  {results[name]["queries_per_request"]:5.1f} queries  '
+              f'{results[name]["statuses"]}')
+    return results
+
+
+def run_http(ids, database, args):
+    from django.conf import settings
+    from django.db import connections
+    from django.test import Client
+    from benchmarks.loadgen import format_result, run_load
+    from benchmarks.servers import run_server
+
+    cookies = {}
+    for role in ('user', 'staff'):
+        client = Client()
+        client.force_login(ids[role])
+        cookies[role] = {settings.SESSION_COOKIE_NAME: client.cookies[settings.SESSION_COOKIE_NAME].value}
+    connections.close_all()
+
+    results = {}
+    with run_server(args.server, database, args.workers, args.threads) as base_url:
+        for name, role, method, path, _ in scenarios(ids):
+            if method != 'get':
+                continue
+            print(f'\n== {args.server} {name} ==')
+            for concurrency in args.concurrency:
+                result = run_load(base_url + path, concurrency, args.duration, cookies.get(role),
+                                  processes=args.processes)
+                print(format_result(result))
+                results.setdefault(name, []).append(result)
+    return results
+
+
+def compare(current, baseline_path):
+    """Print p50/p99 and queries-per-request changes against an earlier result file"""
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+    print(f'\n== compared with {baseline_path} ({baseline["meta"].get("commit", "?")[:10]}) ==')
+    for name, now in current['test_client'].items():
+        before = baseline.get('test_client', {}).get(name)
+        if not before:
+            continue
+        change = (now['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+        print(f'{name:22s} p50 {before["p50_ms"]:8.2f} -> {now["p50_ms"]:8.2f} ms ({change:+6.1f}%)  '
+              f'p99 {before["p99_ms"]:8.2f} -> {now["p99_ms"]:8.2f} ms  '
+              f'queries {before["queries_per_request"]:.1f} -> {now["queries_per_request"]:.1f}')
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--questions', type=int, default=20)
+    parser.add_argument('--assessments', type=int, default=100000)
+    parser.add_argument('--messages', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=50, help='test client requests per route')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--http', action='store_true', help='also load-test the GET routes over HTTP')
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi')
+    parser.add_argument('--workers', type=int, default=2, help='server worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker')
+    parser.add_argument('--processes', type=int, default=2, help='load generator processes')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[16, 64])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--database', help='SQLite file to use (default: a temporary file)')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--compare', help='earlier --json result to compare against')
+    args = parser.parse_args()
+
+    database = setup_django(args.database)
+    try:
+        from django.conf import settings
+        from django.test.utils import setup_test_environment
+
+        setup_test_environment()
+        settings.ALLOWED_HOSTS = ['*']
+        ids = seed(args)
+
+        print('\n== test client ==')
+        results = {
+            'meta': {
+                'commit': git_commit(),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'db_profile': settings.DB_PROFILE,
+                'cache_profile': settings.CACHE_PROFILE,
+                'session_profile': settings.SESSION_PROFILE,
+                'args': vars(args),
+            },
+            'test_client': run_test_client(ids, args.repeat, args.warmup),
+        }
+        if args.http:
+            results['http'] = run_http(ids, database, args)
+
+        if args.json:
+            with open(args.json, 'w') as fh:
+                json.dump(results, fh, indent=2)
+        if args.compare:
+            compare(results, args.compare)
+    finally:
+        if not args.database:
+            cleanup_database(database)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Start the project under a real WSGI or ASGI server for HTTP benchmarks.
+
+WSGI runs under gunicorn (threaded workers), ASGI under uvicorn; both must
+be installed separately (pip install gunicorn uvicorn).
+"""
+import contextlib
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+SETTINGS_TEMPLATE = '''from mindcare.settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+DATABASES['default']['NAME'] = {database!r}
+'''
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(kind, port, workers, threads):
+    if kind == 'wsgi':
+        return ['gunicorn', 'mindcare.wsgi:application', '--workers', str(workers),
+                '--threads', str(threads), '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    if kind == 'asgi':
+        return ['uvicorn', 'mindcare.asgi:application', '--workers', str(workers),
+                '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning', '--no-access-log']
+    raise ValueError(f'Unknown server kind {kind!r}')
+
+
+def _wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with status {process.returncode}')
+        with contextlib.suppress(OSError), socket.create_connection(('127.0.0.1', port), timeout=0.5):
+            return
+        time.sleep(0.1)
+    raise RuntimeError(f'Server did not start listening on port {port}')
+
+
+@contextlib.contextmanager
+def run_server(kind, database, workers=1, threads=8, async_views=None, env=None):
+    """
+    Serve the project against `database` and yield its base URL.
+
+    async_views overrides MINDCARE_ASYNC_VIEWS (asgi.py enables it by default).
+    """
+    command = server_command(kind, 0, workers, threads)
+    if shutil.which(command[0]) is None:
+        raise SystemExit(f'{command[0]} is not installed (pip install gunicorn uvicorn).')
+
+    settings_dir = tempfile.mkdtemp(prefix='mindcare-server-')
+    with open(os.path.join(settings_dir, 'bench_server_settings.py'), 'w') as fh:
+        fh.write(SETTINGS_TEMPLATE.format(database=database))
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server_env = {
+        **os.environ,
+        **(env or {}),
+        'DJANGO_SETTINGS_MODULE': 'bench_server_settings',
+        'PYTHONPATH': os.pathsep.join([settings_dir, project_dir, os.environ.get('PYTHONPATH', '')]),
+    }
+    if async_views is not None:
+        server_env['MINDCARE_ASYNC_VIEWS'] = '1' if async_views else '0'
+
+    port = free_port()
+    process = subprocess.Popen(server_command(kind, port, workers, threads), cwd=project_dir,
+                               env=server_env, stdout=subprocess.DEVNULL, stderr=sys.stderr)
+    try:
+        _wait_for_port(port, process)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(settings_dir, ignore_errors=True)
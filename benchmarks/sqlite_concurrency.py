@@ -0,0 +1,111 @@
+"""
+Concurrent write throughput on SQLite under each database profile.
+
+Every worker process saves assessments the way quiz_view does (insert plus
+rollup update in one transaction) as fast as it can.
+
+    python -m benchmarks.sqlite_concurrency --workers 8 --writes 500
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+from benchmarks.utils import cleanup_database, setup_django, summarize
+
+PROFILES = ('default', 'tuned')
+
+
+def worker(profile, database, user_id, writes, results):
+    os.environ['MINDCARE_DB_PROFILE'] = profile
+    setup_django(database, migrate=False)
+
+    from django.db import OperationalError, close_old_connections, transaction
+    from assessments.models import Assessment, UserAssessmentStats
+
+    latencies, errors = [], 0
+    for i in range(writes):
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                assessment = Assessment.objects.create(
+                    user_id=user_id, total_score=i % 40, anxiety_score=i % 10,
+                    overall_category='mild',
+                )
+                UserAssessmentStats.record(assessment)
+        except OperationalError:
+            errors += 1
+            continue
+        finally:
+            # Mimic request boundaries, where CONN_MAX_AGE decides on reuse
+            close_old_connections()
+        latencies.append((time.perf_counter() - start) * 1000)
+    results.put((latencies, errors))
+
+
+def run_profile(profile, workers, writes):
+    os.environ['MINDCARE_DB_PROFILE'] = profile
+    # Prepare the schema in a throwaway child so the parent never opens Django
+    ctx = multiprocessing.get_context('spawn')
+    database = ctx.Manager().dict()
+    prep = ctx.Process(target=_prepare, args=(profile, workers, database))
+    prep.start()
+    prep.join()
+    name, user_ids = database['name'], database['user_ids']
+
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(profile, name, user_ids[i], writes, results))
+                 for i in range(workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    cleanup_database(name)
+
+    latencies = [value for chunk, _ in collected for value in chunk]
+    errors = sum(errors for _, errors in collected)
+    return {
+        'profile': profile,
+        'workers': workers,
+        'writes_ok': len(latencies),
+        'lock_errors': errors,
+        'elapsed_s': elapsed,
+        'writes_per_s': len(latencies) / elapsed,
+        **summarize(latencies),
+    }
+
+
+def _prepare(profile, workers, shared):
+    os.environ['MINDCARE_DB_PROFILE'] = profile
+    name = setup_django()
+    from benchmarks.utils import seed_users
+    shared['name'] = name
+    shared['user_ids'] = seed_users(workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=500, help='writes per worker')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    results = []
+    for profile in PROFILES:
+        result = run_profile(profile, args.workers, args.writes)
+        results.append(result)
+        print(f'{profile:8s} {result["writes_per_s"]:8.0f} writes/s  '
+              f'{result["lock_errors"]:5d} "database is locked" errors  '
+              f'p50 {result["p50_ms"]:7.2f} ms  p99 {result["p99_ms"]:8.2f} ms')
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
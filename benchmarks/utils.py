@@ -0,0 +1,156 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+import contextlib
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+
+import django
+
+
+def setup_django(database_name=None, migrate=True):
+    """Configure Django against a scratch SQLite database and migrate it"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mindcare.settings')
+    from django.conf import settings
+
+    if database_name is None:
+        database_name = os.path.join(tempfile.mkdtemp(prefix='mindcare-bench-'), 'bench.sqlite3')
+    settings.DATABASES['default']['NAME'] = database_name
+    django.setup()
+
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+    return database_name
+
+
+def cleanup_database(database_name):
+    """Remove a scratch database created by setup_django"""
+    directory = os.path.dirname(database_name)
+    if os.path.basename(directory).startswith('mindcare-bench-'):
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def backdated_created_at(*models):
+    """Let bulk_create keep explicit created_at values instead of auto_now_add"""
+    fields = [model._meta.get_field('created_at') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def seed_users(count, batch_size=5000, password=None):
+    """Create synthetic users with bulk_create and return their ids"""
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+
+    start = User.objects.count()
+    encoded = make_password(password) if password else '!'
+    users = (
+        User(username=f'bench{start + i}', email=f'bench{start + i}@example.com', password=encoded)
+        for i in range(count)
+    )
+    _bulk_create(User, users, batch_size)
+    return list(User.objects.filter(username__startswith='bench').values_list('id', flat=True))
+
+
+def seed_questions(count, options_per_question=4):
+    """Create a synthetic question catalog"""
+    from assessments.models import Question, QuestionOption
+
+    categories = [key for key, _ in Question.CATEGORY_CHOICES]
+    questions = Question.objects.bulk_create(
+        Question(text=f'Benchmark question {i}', category=categories[i % len(categories)])
+        for i in range(count)
+    )
+    QuestionOption.objects.bulk_create(
+        QuestionOption(question=question, text=f'Option {weight}', weight=weight)
+        for question in questions
+        for weight in range(options_per_question)
+    )
+    return questions
+
+
+def seed_assessments(user_ids, count, days=730, batch_size=5000, seed=0):
+    """Create synthetic assessments spread over the last `days` days"""
+    from django.utils import timezone
+    from assessments.models import Assessment
+    from assessments.scoring import overall_category
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    span = days * 24 * 3600
+
+    def generate():
+        for _ in range(count):
+            subscales = [rng.randint(0, 12) for _ in range(4)]
+            total = sum(subscales)
+            yield Assessment(
+                user_id=rng.choice(user_ids),
+                total_score=total,
+                anxiety_score=subscales[0],
+                depression_score=subscales[1],
+                stress_score=subscales[2],
+                general_score=subscales[3],
+                overall_category=overall_category(total, 12),
+                created_at=now - timedelta(seconds=rng.randrange(span)),
+            )
+
+    with backdated_created_at(Assessment):
+        _bulk_create(Assessment, generate(), batch_size)
+
+
+def _bulk_create(model, objects, batch_size):
+    from django.db import transaction
+
+    batch = []
+    with transaction.atomic():
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                model.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+
+
+def measure(func, repeat=20, warmup=2):
+    """Run func repeatedly and return timing statistics in milliseconds"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    """Summarize latency samples (milliseconds) into mean and tail percentiles"""
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'mean_ms': statistics.fmean(ordered) if ordered else 0.0,
+        'p50_ms': percentile(ordered, 0.50),
+        'p95_ms': percentile(ordered, 0.95),
+        'p99_ms': percentile(ordered, 0.99),
+        'max_ms': ordered[-1] if ordered else 0.0,
+    }
@@ -0,0 +1,92 @@
+"""
+Throughput and tail latency of the read-heavy endpoints under WSGI and ASGI.
+
+Configurations:
+    wsgi       gunicorn, threaded workers, sync views
+    asgi       uvicorn, async views (assessments.async_views)
+    asgi-sync  uvicorn, sync views run through sync_to_async
+
+    python -m benchmarks.wsgi_vs_asgi --concurrency 16 64 256 --duration 10
+
+Requires gunicorn and uvicorn (pip install gunicorn uvicorn).
+"""
+import argparse
+import json
+
+from benchmarks.loadgen import format_result, run_load
+from benchmarks.servers import run_server
+from benchmarks.utils import cleanup_database, seed_assessments, seed_questions, seed_users, setup_django
+
+
+CONFIGURATIONS = {
+    'wsgi': ('wsgi', None),
+    'asgi': ('asgi', True),
+    'asgi-sync': ('asgi', False),
+}
+
+ENDPOINTS = [
+    ('guidance', '/guidance/', False),
+    ('dashboard', '/dashboard/', True),
+    ('api_history', '/api/history/?limit=20', True),
+    ('api_trend', '/api/trend/?points=100', True),
+]
+
+
+def prepare(assessments):
+    """Seed one user with a long history and return a logged-in session cookie"""
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.db import connections
+    from django.test import Client
+
+    settings.ALLOWED_HOSTS = ['*']
+    user_ids = seed_users(1)
+    seed_questions(20)
+    seed_assessments(user_ids, assessments)
+
+    from assessments.models import Assessment, UserAssessmentStats
+    for assessment in Assessment.objects.order_by('created_at'):
+        UserAssessmentStats.record(assessment)
+
+    client = Client()
+    client.force_login(User.objects.get(id=user_ids[0]))
+    cookies = {settings.SESSION_COOKIE_NAME: client.cookies[settings.SESSION_COOKIE_NAME].value}
+    connections.close_all()
+    return cookies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--configurations', nargs='+', choices=CONFIGURATIONS, default=list(CONFIGURATIONS))
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=1, help='server worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker')
+    parser.add_argument('--assessments', type=int, default=2000)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    database = setup_django()
+    try:
+        cookies = prepare(args.assessments)
+        results = {}
+        for name in args.configurations:
+            kind, async_views = CONFIGURATIONS[name]
+            with run_server(kind, database, args.workers, args.threads, async_views) as base_url:
+                for endpoint, path, authenticated in ENDPOINTS:
+                    print(f'\n== {name} {endpoint} ==')
+                    for concurrency in args.concurrency:
+                        result = run_load(base_url + path, concurrency, args.duration,
+                                          cookies if authenticated else None)
+                        print(format_result(result))
+                        results.setdefault(name, {}).setdefault(endpoint, []).append(result)
+
+        if args.json:
+            with open(args.json, 'w') as fh:
+                json.dump({'workers': args.workers, 'threads': args.threads, **results}, fh, indent=2)
+    finally:
+        cleanup_database(database)
+
+
+if __name__ == '__main__':
+    main()
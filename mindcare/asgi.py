@@ -7,6 +7,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mindcare.settings')
+os.environ.setdefault('MINDCARE_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
 
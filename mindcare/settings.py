@@ -5,6 +5,8 @@ Django settings for mindcare project.
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -34,6 +36,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'assessments.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -47,7 +50,8 @@ ROOT_URLCONF = 'mindcare.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates plus render timing for the request metrics
+        'BACKEND': 'assessments.instrumentation.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -74,6 +78,82 @@ DATABASES = {
     }
 }
 
+# Database performance profile, selected with MINDCARE_DB_PROFILE:
+#   'default' - Django's stock SQLite settings
+#   'tuned'   - WAL journal, relaxed fsync, busy timeout, larger page cache and
+#               mmap, and persistent connections (not with ASYNC_VIEWS, below),
+#               for concurrent writers
+DB_PROFILE = os.environ.get('MINDCARE_DB_PROFILE', 'default')
+
+# PRAGMAs applied to every new SQLite connection (see assessments.signals)
+SQLITE_PRAGMAS = {}
+
+if DB_PROFILE == 'tuned':
+    DATABASES['default'].update({
+        'OPTIONS': {'timeout': 20},
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    })
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 20000,
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    }
+
+
+# Cache profile, selected with MINDCARE_CACHE_PROFILE:
+#   'locmem'   - per-process memory, for development
+#   'file'     - file-based cache shared by all workers on one host
+#   'database' - cache table in the default database (run createcachetable)
+CACHE_PROFILE = os.environ.get('MINDCARE_CACHE_PROFILE', 'locmem')
+
+CACHE_PROFILES = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'mindcare',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('MINDCARE_CACHE_DIR', BASE_DIR / '.cache'),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    'database': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'mindcare_cache',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+CACHES = {
+    'default': {
+        **CACHE_PROFILES[CACHE_PROFILE],
+        'KEY_PREFIX': 'mindcare',
+        'TIMEOUT': 300,
+    },
+}
+
+# Lifetime in seconds of cached anonymous pages (see assessments.cache)
+PAGE_CACHE_TIMEOUT = 600
+
+# Route the read-heavy endpoints to their native async variants
+# (assessments.async_views). asgi.py enables this; under WSGI every async
+# view would need its own event loop, so it stays off there.
+ASYNC_VIEWS = os.environ.get('MINDCARE_ASYNC_VIEWS', '0') == '1'
+if ASYNC_VIEWS:
+    # Under ASGI the ORM runs in per-request worker threads, so persistent
+    # connections pile up instead of being reused; Django advises disabling them
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Fraction of requests whose queries and template renders are timed (see
+# assessments.instrumentation); every request is counted regardless
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get('MINDCARE_REQUEST_METRICS_SAMPLE_RATE', '0.1'))
+# Send sampled timings to the client in a Server-Timing header
+REQUEST_METRICS_SERVER_TIMING = os.environ.get('MINDCARE_SERVER_TIMING', '1') == '1'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -93,6 +173,44 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing profile, selected with MINDCARE_PASSWORD_PROFILE:
+#   'default' - PBKDF2-SHA256 (Django's default algorithm)
+#   'scrypt'  - scrypt, memory-hard and much cheaper per login at similar strength
+#   'argon2'  - Argon2id (requires argon2-cffi)
+# Every profile's hasher stays enabled so existing hashes still verify; they
+# are re-hashed with the active profile and parameters on the next login.
+PASSWORD_PROFILE = os.environ.get('MINDCARE_PASSWORD_PROFILE', 'default')
+
+PASSWORD_PROFILES = {
+    'default': 'assessments.hashers.BoundedPBKDF2PasswordHasher',
+    'scrypt': 'assessments.hashers.BoundedScryptPasswordHasher',
+    'argon2': 'assessments.hashers.BoundedArgon2PasswordHasher',
+}
+
+PASSWORD_HASHERS = [
+    PASSWORD_PROFILES[PASSWORD_PROFILE],
+    *(hasher for profile, hasher in PASSWORD_PROFILES.items() if profile != PASSWORD_PROFILE),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('MINDCARE_PBKDF2_ITERATIONS', 600000))
+PASSWORD_SCRYPT = {
+    'work_factor': int(os.environ.get('MINDCARE_SCRYPT_WORK_FACTOR', 2 ** 14)),
+    'block_size': int(os.environ.get('MINDCARE_SCRYPT_BLOCK_SIZE', 8)),
+    'parallelism': int(os.environ.get('MINDCARE_SCRYPT_PARALLELISM', 1)),
+}
+PASSWORD_ARGON2 = {
+    'time_cost': int(os.environ.get('MINDCARE_ARGON2_TIME_COST', 2)),
+    'memory_cost': int(os.environ.get('MINDCARE_ARGON2_MEMORY_COST', 19456)),
+    'parallelism': int(os.environ.get('MINDCARE_ARGON2_PARALLELISM', 1)),
+}
+
+# Concurrent password hashes per process, and how long a login may wait for
+# a free slot before it is turned away (see assessments.hashers)
+PASSWORD_HASHING_CONCURRENCY = int(os.environ.get('MINDCARE_PASSWORD_HASHING_CONCURRENCY', os.cpu_count() or 1))
+PASSWORD_HASHING_TIMEOUT = float(os.environ.get('MINDCARE_PASSWORD_HASHING_TIMEOUT', 5.0))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -130,3 +248,52 @@ CSRF_COOKIE_HTTPONLY = False
 SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
 SESSION_COOKIE_SAMESITE = 'Lax'
 
+# Session profile, selected with MINDCARE_SESSION_PROFILE:
+#   'database'       - Django's default; every authenticated request reads
+#                      django_session and every session change writes it
+#   'cached_db'      - reads come from the cache profile above, writes go
+#                      through to the database so sessions survive a cache flush;
+#                      needs the 'file' or 'database' cache profile, since with
+#                      'locmem' each worker would keep serving its own stale copy
+#                      of a session after another worker changed or ended it
+#   'signed_cookies' - the session lives in a signed cookie and the table is
+#                      not used at all; logging out cannot revoke a copied cookie
+SESSION_PROFILE = os.environ.get('MINDCARE_SESSION_PROFILE', 'database')
+
+SESSION_PROFILES = {
+    'database': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_PROFILES[SESSION_PROFILE]
+if SESSION_PROFILE == 'cached_db' and CACHE_PROFILE == 'locmem':
+    raise ImproperlyConfigured(
+        "MINDCARE_SESSION_PROFILE=cached_db needs a cache shared by all workers; "
+        "set MINDCARE_CACHE_PROFILE to 'file' or 'database'."
+    )
+
+# Expired rows deleted per transaction by the purge_sessions command
+SESSION_PURGE_BATCH_SIZE = 1000
+
+
+# Admin dashboard metrics snapshot lifetime in seconds (see assessments.metrics)
+ADMIN_METRICS_MAX_AGE = 300
+
+# Seconds the per-process analytics columns are reused before new rows are loaded
+# (see assessments.analytics)
+ANALYTICS_REFRESH_SECONDS = 60
+
+# Most answer sets accepted per request by the batch ingestion API (see assessments.ingest)
+ASSESSMENT_INGEST_MAX_BATCH = 500
+
+# Contact form write-behind queue (see assessments.contact_queue). When enabled,
+# submissions are queued in CONTACT_QUEUE_PATH and batch-inserted by a worker.
+CONTACT_WRITE_BEHIND = os.environ.get('MINDCARE_CONTACT_WRITE_BEHIND') == '1'
+CONTACT_QUEUE_PATH = BASE_DIR / 'contact_queue.sqlite3'
+CONTACT_QUEUE_BATCH_SIZE = 100
+CONTACT_QUEUE_FLUSH_INTERVAL = 1.0
+# Failed flushes after which a queued submission is dead-lettered
+CONTACT_QUEUE_MAX_ATTEMPTS = 5
+# Seconds before a batch claimed by a flush that never finished can be claimed again
+CONTACT_QUEUE_CLAIM_TIMEOUT = 300